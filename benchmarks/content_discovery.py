@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Content discovery benchmark for PyAutoEnum: requests/sec.
+
+A keep-alive HTTP stand-in server runs in its own process and answers
+404 except for a few paths. The same wordlist is tried with the built-in
+engine (pipelined asyncio connections), with threads sending requests
+through the pooled http_client, and with wfuzz as the wfuzz_web_files
+module ran it, if wfuzz is installed.
+
+Usage:
+    python benchmarks/content_discovery.py [--words N] [--concurrency N]
+"""
+
+import argparse
+import asyncio
+import http.server
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from pyautoenum.utils.content_discovery import ContentDiscovery, read_words  # noqa: E402
+from pyautoenum.utils.network import HttpClient  # noqa: E402
+
+EXISTING = {"/admin", "/backup", "/config", "/uploads"}
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        status, body = (200, b"found") if self.path in EXISTING else (404, b"not found")
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(port_queue) -> None:
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.request_queue_size = 256
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def run_engine(url: str, wordlist: str, concurrency: int) -> int:
+    engine = ContentDiscovery(url, read_words(wordlist), concurrency=concurrency, calibrate=False)
+    return len(asyncio.run(engine.run()))
+
+
+def run_threads(url: str, wordlist: str, concurrency: int) -> int:
+    client = HttpClient(pool_maxsize=concurrency)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        statuses = executor.map(lambda word: client.get(url + word).status_code, read_words(wordlist))
+        hits = sum(status != 404 for status in statuses)
+    client.close()
+    return hits
+
+
+def run_wfuzz(url: str, wordlist: str, concurrency: int) -> int:
+    result = subprocess.run(
+        ["wfuzz", "-c", "-t", str(concurrency), "-z", f"file,{wordlist}", "--hc", "404", url + "FUZZ"],
+        capture_output=True, text=True,
+    )
+    return sum(" 200 " in line for line in result.stdout.splitlines())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=20000, help="Wordlist size")
+    parser.add_argument("--concurrency", type=int, default=64, help="Connections / threads")
+    args = parser.parse_args()
+
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(port_queue,), daemon=True)
+    server.start()
+    url = f"http://127.0.0.1:{port_queue.get()}/"
+
+    runners = [("built-in engine", run_engine), ("pooled threads", run_threads)]
+    if shutil.which("wfuzz"):
+        runners.append(("wfuzz subprocess", run_wfuzz))
+
+    with tempfile.NamedTemporaryFile("w", suffix=".txt") as wordlist:
+        words = [f"word{i}" for i in range(args.words - len(EXISTING))] + [path[1:] for path in EXISTING]
+        wordlist.write("\n".join(words) + "\n")
+        wordlist.flush()
+
+        print(f"Content discovery ({args.words} paths, concurrency {args.concurrency})")
+        rates = []
+        for label, runner in runners:
+            start = time.perf_counter()
+            hits = runner(url, wordlist.name, args.concurrency)
+            rate = args.words / (time.perf_counter() - start)
+            rates.append(rate)
+            print(f"  {label + ':':20}{rate:10.0f} req/s  ({hits} hits)")
+        if not shutil.which("wfuzz"):
+            print("  wfuzz subprocess:   not installed")
+        print(f"  {'speedup:':20}{rates[0] / max(rates[1:]):10.1f}x")
+
+    server.terminate()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
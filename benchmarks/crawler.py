@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Website crawler benchmark for PyAutoEnum: pages/sec and memory.
+
+A keep-alive HTTP stand-in site on loopback serves generated pages; each
+page has some text and links to further pages, a few external sites and
+itself. The crawler walks it with create_wordlist_from_website's
+settings, and the page rate and the peak of traced Python memory are
+reported (in a second, traced crawl). The tokenizer is also compared with BeautifulSoup's get_text()
+on the same page.
+
+Usage:
+    python benchmarks/crawler.py [--pages N] [--concurrency N] [--depth N]
+"""
+
+import argparse
+import collections
+import http.server
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from pyautoenum.utils.crawler import Crawler, _Tokenizer  # noqa: E402
+from pyautoenum.utils.network import HttpClient  # noqa: E402
+
+WORDS = ("admin backup config login portal upload report invoice staging "
+         "customer archive private gateway console monitor").split()
+
+# Pages link to page*FANOUT+1 .. page*FANOUT+FANOUT
+FANOUT = 8
+
+
+def render(page: int) -> bytes:
+    """HTML of a generated page."""
+    paragraphs = []
+    for i in range(40):
+        words = " ".join(WORDS[(page + i + j) % len(WORDS)] for j in range(12))
+        paragraphs.append(f"<p>{words} item{page}x{i}</p>")
+    links = [f'<a href="/page/{page * FANOUT + i}">next {i}</a>' for i in range(1, FANOUT + 1)]
+    links += ['<a href="http://external.test/">out</a>', f'<a href="/page/{page}#top">self</a>']
+    return (
+        f"<html><head><title>Page {page}</title><script>var x = 'ignored';</script></head>"
+        f"<body>{''.join(paragraphs)}{''.join(links)}</body></html>"
+    ).encode()
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this, delayed ACKs stall each response
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        try:
+            page = int(self.path.rsplit("/", 1)[-1] or 0)
+        except ValueError:
+            page = 0
+        body = render(page)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=1000, help="Page budget of the crawl")
+    parser.add_argument("--concurrency", type=int, default=16, help="Pages fetched at once")
+    parser.add_argument("--depth", type=int, default=4, help="Links followed from the start page")
+    args = parser.parse_args()
+
+    server = StandInServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/page/0"
+
+    client = HttpClient(pool_maxsize=args.concurrency)
+
+    def crawl():
+        return Crawler(url, max_depth=args.depth, max_pages=args.pages, concurrency=args.concurrency, client=client)
+
+    crawler = crawl()
+    start = time.perf_counter()
+    words = crawler.crawl()
+    seconds = time.perf_counter() - start
+    # Tracing slows everything down, so memory is measured in a second crawl
+    tracemalloc.start()
+    crawl().crawl()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    client.close()
+    server.shutdown()
+    stats = crawler.get_stats()
+
+    page = render(1).decode()
+    rounds = 200
+    start = time.perf_counter()
+    for _ in range(rounds):
+        tokenizer = _Tokenizer(collections.Counter())
+        tokenizer.feed(page)
+        tokenizer.close()
+    streaming = (time.perf_counter() - start) / rounds
+    from bs4 import BeautifulSoup
+    start = time.perf_counter()
+    for _ in range(rounds):
+        BeautifulSoup(page, "html.parser").get_text()
+    soup = (time.perf_counter() - start) / rounds
+
+    print(f"Crawl (budget {args.pages} pages, depth {args.depth}, concurrency {args.concurrency})")
+    print(f"  pages fetched:        {stats['pages']} ({stats['errors']} errors)")
+    print(f"  pages/sec:            {stats['pages'] / seconds:.1f}")
+    print(f"  distinct words:       {len(words)} (top: {', '.join(words[:5])})")
+    print(f"  peak traced memory:   {peak / 1024 / 1024:.1f} MiB")
+    print(f"Tokenizing one page ({len(page)} characters)")
+    print(f"  streaming tokenizer:  {streaming * 1000:.2f} ms")
+    print(f"  BeautifulSoup text:   {soup * 1000:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
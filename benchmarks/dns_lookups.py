@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+DNS brute force benchmark for PyAutoEnum: lookups per second.
+
+A stand-in DNS server on loopback answers every query after a fixed
+delay (simulating the round trip to a real resolver); one name in ten
+exists, the rest get NXDOMAIN. The same list of names is resolved with
+one lookup at a time, like the old blocking loop, and with the
+concurrent resolver engine.
+
+Usage:
+    python benchmarks/dns_lookups.py [--names N] [--latency MS] [--concurrency N]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from pyautoenum.utils.dns import RCODE_NXDOMAIN, DnsResolver, _read_name, encode_response  # noqa: E402
+
+
+class StandInServer(asyncio.DatagramProtocol):
+    """Answers host<i>.bench.test for i divisible by 10, after a delay."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.transport = None
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+
+    def datagram_received(self, query: bytes, client) -> None:
+        name = _read_name(query, 12)[0]
+        number = name.split(".")[0][4:]
+        if number.isdigit() and int(number) % 10 == 0:
+            response = encode_response(query, ["10.0.0.1"])
+        else:
+            response = encode_response(query, rcode=RCODE_NXDOMAIN)
+        asyncio.get_running_loop().call_later(self.latency, self.transport.sendto, response, client)
+
+
+def start_server(latency: float) -> str:
+    """Run the stand-in server in a background thread and return its address."""
+    ready = threading.Event()
+    address = []
+
+    def run() -> None:
+        loop = asyncio.new_event_loop()
+        transport, _ = loop.run_until_complete(loop.create_datagram_endpoint(
+            lambda: StandInServer(latency), local_addr=("127.0.0.1", 0)
+        ))
+        address.append("127.0.0.1:{}".format(transport.get_extra_info("sockname")[1]))
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return address[0]
+
+
+async def resolve_all(server: str, names, concurrency: int):
+    """Resolve names and return (seconds, found, unanswered)."""
+    start = time.perf_counter()
+    found = failed = 0
+    async with DnsResolver([server], concurrency=concurrency, rate=None, timeout=2.0) as resolver:
+        async for result in resolver.resolve_many(names):
+            found += bool(result.addresses)
+            failed += result.status in ("timeout", "error")
+    return time.perf_counter() - start, found, failed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--names", type=int, default=5000, help="Names to resolve")
+    parser.add_argument("--latency", type=float, default=20.0, help="Server response delay in ms")
+    parser.add_argument("--concurrency", type=int, default=256, help="Lookups in flight")
+    args = parser.parse_args()
+
+    server = start_server(args.latency / 1000)
+    names = [f"host{i}.bench.test" for i in range(args.names)]
+    sequential_names = names[:max(1, min(len(names), int(2000 / max(args.latency, 1))))]
+
+    seq_time, _, _ = asyncio.run(resolve_all(server, sequential_names, 1))
+    conc_time, found, failed = asyncio.run(resolve_all(server, names, args.concurrency))
+
+    seq_rate = len(sequential_names) / seq_time
+    conc_rate = len(names) / conc_time
+    print(f"DNS lookups/sec (server latency {args.latency:.0f} ms)")
+    print(f"  {'one at a time:':22}{seq_rate:10.1f}   ({len(sequential_names)} names)")
+    print(f"  {f'{args.concurrency} in flight:':22}{conc_rate:10.1f}   ({len(names)} names, "
+          f"{found} found, {failed} unanswered)")
+    print(f"  {'speedup:':22}{conc_rate / seq_rate:10.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+HTTP client benchmark for PyAutoEnum: TLS handshakes and requests/sec.
+
+A keep-alive HTTPS stand-in server on loopback (self-signed certificate
+generated with the openssl command) answers every request with a small
+page and counts accepted connections and resumed TLS sessions. The same
+requests are sent with plain requests.get(), which opens a connection and
+does a full handshake per request, and with the pooled http_client.
+
+Usage:
+    python benchmarks/http_client.py [--requests N] [--threads N]
+"""
+
+import argparse
+import http.server
+import os
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from pyautoenum.utils.network import HttpClient, disable_ssl_warnings  # noqa: E402
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"<html><body>stand-in</body></html>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer(http.server.ThreadingHTTPServer):
+    """HTTPS server counting TLS handshakes."""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, context: ssl.SSLContext):
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.context = context
+        self.handshakes = 0
+        self.resumed = 0
+        self.lock = threading.Lock()
+
+    def get_request(self):
+        sock, address = self.socket.accept()
+        return self.context.wrap_socket(sock, server_side=True, do_handshake_on_connect=False), address
+
+    def finish_request(self, request, client_address):
+        request.do_handshake()
+        with self.lock:
+            self.handshakes += 1
+            self.resumed += bool(request.session_reused)
+        super().finish_request(request, client_address)
+
+    def reset(self):
+        with self.lock:
+            self.handshakes = self.resumed = 0
+
+
+def start_server(directory: str) -> StandInServer:
+    """Generate a certificate and run the server in a background thread."""
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=127.0.0.1", "-keyout", key, "-out", cert],
+        check=True, capture_output=True,
+    )
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    server = StandInServer(context)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(get, url: str, count: int, threads: int) -> float:
+    """Send count GET requests from threads workers and return the seconds taken."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for response in executor.map(lambda _: get(url), range(count)):
+            response.raise_for_status()
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500, help="Requests per run")
+    parser.add_argument("--threads", type=int, default=8, help="Concurrent workers")
+    args = parser.parse_args()
+
+    import requests
+
+    disable_ssl_warnings()
+    with tempfile.TemporaryDirectory() as directory:
+        server = start_server(directory)
+        url = f"https://127.0.0.1:{server.server_address[1]}/"
+        results = []
+
+        seconds = run(lambda u: requests.get(u, verify=False, timeout=5), url, args.requests, args.threads)
+        results.append(("requests.get()", seconds, server.handshakes, server.resumed))
+
+        server.reset()
+        client = HttpClient(pool_maxsize=args.threads)
+        seconds = run(client.get, url, args.requests, args.threads)
+        results.append(("pooled http_client", seconds, server.handshakes, server.resumed))
+        client.close()
+        server.shutdown()
+
+    print(f"HTTPS requests ({args.requests} requests, {args.threads} threads)")
+    print(f"  {'':22}{'req/sec':>10}{'handshakes':>12}{'resumed':>10}")
+    for label, seconds, handshakes, resumed in results:
+        print(f"  {label + ':':22}{args.requests / seconds:10.1f}{handshakes:12d}{resumed:10d}")
+    print(f"  {'speedup:':22}{results[0][1] / results[1][1]:10.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
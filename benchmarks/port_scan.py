@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Port discovery benchmark for PyAutoEnum: ports scanned per second.
+
+Listeners are opened on random loopback ports, then a port range of
+127.0.0.1 is scanned one blocking connect at a time, with the async
+connect scanner, and (if installed) with the nmap discovery scan the
+scan manager used to run (nmap -Pn -F -T4), which covers only the top
+100 ports.
+
+Loopback answers a connect in microseconds, so every connect of the
+first two is delayed by --latency to stand in for the round trip to a
+remote target (0 measures raw loopback speed).
+
+Usage:
+    python benchmarks/port_scan.py [--ports SPEC] [--listeners N] [--concurrency N] [--latency MS]
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from pyautoenum.utils.portscan import ConnectScanner, parse_ports  # noqa: E402
+
+
+def open_listeners(count: int):
+    """Listen on count random loopback ports."""
+    sockets = []
+    for _ in range(count):
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        sock.listen(16)
+        sockets.append(sock)
+    return sockets
+
+
+class DelayedScanner(ConnectScanner):
+    """Connect scanner whose connects take at least latency seconds."""
+
+    def __init__(self, latency: float, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = latency
+
+    async def _connect(self, address, family, timeout):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return await super()._connect(address, family, timeout)
+
+
+def scan_sequential(ports, latency: float) -> int:
+    """Blocking connect per port, like a simple socket loop."""
+    found = 0
+    for port in ports:
+        if latency:
+            time.sleep(latency)
+        with socket.socket() as sock:
+            sock.settimeout(1.0)
+            found += sock.connect_ex(("127.0.0.1", port)) == 0
+    return found
+
+
+async def scan_async(ports, concurrency: int, latency: float):
+    """Connect scanner, returning (open ports, stats)."""
+    scanner = DelayedScanner(latency, concurrency=concurrency)
+    found = [port async for port in scanner.scan("127.0.0.1", ports)]
+    return found, scanner.get_stats()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ports", default="1-65535", help="Ports to scan")
+    parser.add_argument("--listeners", type=int, default=20, help="Open ports to create")
+    parser.add_argument("--concurrency", type=int, default=2000, help="Connects in flight")
+    parser.add_argument("--latency", type=float, default=20.0, help="Simulated connect round trip in ms")
+    args = parser.parse_args()
+    latency = args.latency / 1000
+
+    ports = parse_ports(args.ports)
+    listeners = open_listeners(args.listeners)
+    listening = {sock.getsockname()[1] for sock in listeners}
+    rows = []
+
+    sample = ports[:max(1, min(len(ports), int(2000 / max(args.latency, 0.4))))]
+    start = time.perf_counter()
+    scan_sequential(sample, latency)
+    rows.append(("one at a time", len(sample), time.perf_counter() - start, ""))
+
+    start = time.perf_counter()
+    found, stats = asyncio.run(scan_async(ports, args.concurrency, latency))
+    seconds = time.perf_counter() - start
+    missed = len(listening.intersection(ports) - set(found))
+    rows.append((f"{args.concurrency} in flight", len(ports), seconds, f"{len(found)} open, {missed} listeners missed"))
+
+    if shutil.which("nmap"):
+        start = time.perf_counter()
+        subprocess.run(["nmap", "-Pn", "-F", "-T4", "127.0.0.1"], capture_output=True, check=False)
+        rows.append(("nmap -Pn -F -T4", 100, time.perf_counter() - start, "top 100 ports only"))
+
+    for sock in listeners:
+        sock.close()
+
+    print(f"Port discovery on 127.0.0.1 (ports/sec, {args.latency:.0f} ms simulated round trip)")
+    for label, count, seconds, note in rows:
+        print(f"  {label + ':':22}{count / seconds:12.0f}   ({count} ports in {seconds:.2f}s) {note}")
+    print(f"  adaptive timeout after scan: {stats['timeout']:.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for PyAutoEnum: time to first scheduled task.
+
+Each run starts a fresh interpreter that imports the package, loads the
+module catalog, creates a target with one open HTTP port and runs one
+pass of the scan loop. The time until the first task is added to the
+thread pool is reported for a cold module catalog cache (empty cache
+directory) and a warm one.
+
+Usage:
+    python benchmarks/startup.py [--runs N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+
+def child(output_dir: str) -> None:
+    """Measure one startup inside a fresh interpreter and print seconds."""
+    start = time.perf_counter()
+
+    from pyautoenum.config.manager import ConfigManager
+    from pyautoenum.core.attack_thread import attack_thread_pool
+    from pyautoenum.core.scan import ScanManager
+    from pyautoenum.data.models import TargetInfo
+
+    first_task = []
+    original_add_task = attack_thread_pool.add_task
+
+    def add_task(module, port=None):
+        if not first_task:
+            first_task.append(time.perf_counter())
+        return original_add_task(module, port)
+
+    attack_thread_pool.add_task = add_task
+
+    config = ConfigManager()
+    config.init_config(path=output_dir)
+    config.load_modules()
+    target_info = TargetInfo(config, ip="127.0.0.1")
+    target_info.merge({"80": {"protocol": "http"}})
+    config.set_target_info(target_info)
+    ScanManager()._check_and_start_modules()
+
+    end = first_task[0] if first_task else time.perf_counter()
+    print(f"{end - start:.6f}")
+
+
+def run_once(output_dir: str, cache_dir: str) -> float:
+    """Run one child interpreter and return its time to first task."""
+    env = dict(os.environ, XDG_CACHE_HOME=cache_dir, LOG_LEVEL="ERROR")
+    env["PYTHONPATH"] = SRC + os.pathsep + env.get("PYTHONPATH", "")
+    result = subprocess.run(
+        [sys.executable, __file__, "--child", output_dir],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Runs per scenario")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = os.path.join(tmp, "output")
+        cold, warm = [], []
+        for i in range(args.runs):
+            cold.append(run_once(output_dir, os.path.join(tmp, f"cold-cache-{i}")))
+        warm_cache = os.path.join(tmp, "warm-cache")
+        run_once(output_dir, warm_cache)  # populate
+        for _ in range(args.runs):
+            warm.append(run_once(output_dir, warm_cache))
+
+    print("time to first scheduled task (median of {} runs)".format(args.runs))
+    print(f"  cold module catalog cache: {statistics.median(cold) * 1000:8.1f} ms")
+    print(f"  warm module catalog cache: {statistics.median(warm) * 1000:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
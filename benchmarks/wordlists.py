@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Wordlist service benchmark for PyAutoEnum: open, dedupe and share a list.
+
+A generated wordlist with duplicates is read the way consumers used to
+(each worker opening and streaming the whole file), and through the
+wordlist service: the first open scans the file and caches the index,
+later opens map the cached index, and worker processes get shards of
+it instead of the whole list.
+
+Usage:
+    python benchmarks/wordlists.py [--lines N] [--workers N]
+"""
+
+import argparse
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from pyautoenum.utils.wordlists import WordlistService, wordlist_service  # noqa: E402
+
+
+def read_whole_file(path: str) -> int:
+    """What every consumer did before: stream the full file itself."""
+    count = 0
+    with open(path, "r", errors="replace") as wordlist:
+        for line in wordlist:
+            word = line.strip()
+            if word and not word.startswith("#"):
+                count += 1
+    return count
+
+
+def read_shard(shard) -> int:
+    return sum(1 for _ in shard)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=1_000_000, help="Lines in the wordlist")
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["XDG_CACHE_HOME"] = os.path.join(directory, "cache")
+        path = os.path.join(directory, "words.txt")
+        random.seed(1)
+        # About a third of the lines are duplicates
+        vocabulary = [f"word{i:07d}" for i in range(args.lines * 2 // 3)]
+        with open(path, "w") as f:
+            for _ in range(args.lines):
+                f.write(random.choice(vocabulary) + "\n")
+
+        lines, plain = timed(read_whole_file, path)
+        words, cold = timed(lambda: WordlistService().open(path))
+        _, warm = timed(lambda: WordlistService().open(path))
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            _, per_worker = timed(lambda: list(executor.map(read_whole_file, [path] * args.workers)))
+        shards = wordlist_service.open(path).shards(args.workers)
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            counts, sharded = timed(lambda: list(executor.map(read_shard, shards)))
+
+    print(f"Wordlist ({args.lines} lines, {len(words)} unique)")
+    print(f"  stream the file once:            {plain * 1000:8.1f} ms  ({lines} words)")
+    print(f"  open, first time (build index):  {cold * 1000:8.1f} ms")
+    print(f"  open, cached index:              {warm * 1000:8.1f} ms")
+    print(f"{args.workers} worker processes")
+    print(f"  each streams the whole file:     {per_worker * 1000:8.1f} ms  ({args.workers * lines} words tested)")
+    print(f"  one shard each:                  {sharded * 1000:8.1f} ms  ({sum(counts)} words tested)")
+    print(f"  pickled shard:                   {len(pickle.dumps(shards[0])):8d} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
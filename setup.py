@@ -36,7 +36,6 @@ setup(
         "beautifulsoup4>=4.9.0",
         "ping3>=4.0.0",
         "pysmb>=1.2.0",
-        "python-nmap>=0.7.1",
         "PyYAML>=6.0.0",
         "requests>=2.25.0",
         "tqdm>=4.50.0",
@@ -1,4 +1,9 @@
-"""Main entry point for PyAutoEnum."""
+"""
+Main entry point for PyAutoEnum.
+
+The curses interfaces are imported only once a UI is actually started,
+so --help and --no-ui runs do not pay for them.
+"""
 
 import argparse
 import signal
@@ -10,9 +15,43 @@ from pyautoenum.config.manager import ConfigManager
 from pyautoenum.core.attack_thread import attack_thread_pool
 from pyautoenum.core.scan import ScanThread
 from pyautoenum.data.models import TargetInfo
-from pyautoenum.ui.interface import Interface
-from pyautoenum.ui.simple_interface import SimpleInterface
+from pyautoenum.utils.liveness import DEFAULT_PORTS
 from pyautoenum.utils.network import get_hostname_from_url, is_ip_address
+from pyautoenum.utils.portscan import parse_ports
+
+
+def sweep_targets(spec, ports):
+    """
+    Print the live hosts of a target range.
+    
+    Args:
+        spec: Hosts, networks or ranges, see liveness.expand_targets()
+        ports: TCP ports probed on each host
+        
+    Returns:
+        Exit code
+    """
+    import asyncio
+
+    from pyautoenum.utils.liveness import expand_targets, sweep
+
+    async def run():
+        alive = checked = 0
+        async for result in sweep(expand_targets(spec), ports):
+            checked += 1
+            if result.alive:
+                alive += 1
+                print(f"{result.host}\tup ({result.method}, {result.rtt * 1000:.0f} ms)", flush=True)
+        print(f"{alive} of {checked} hosts are up")
+
+    try:
+        asyncio.run(run())
+    except ValueError as e:
+        print(f"Invalid target: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 130
+    return 0
 
 
 def exit_handler(sig, frame):
@@ -38,6 +77,9 @@ def exit_handler(sig, frame):
     if ConfigManager.target_info:
         ConfigManager.target_info.save_to_file()
     
+    # Write out any buffered log lines
+    ConfigManager.flush_logs()
+    
     # Allow a short moment for cleanup before forcing exit
     time.sleep(0.5)
         
@@ -67,6 +109,47 @@ def main():
         action="store_true",
         help="New session, do not use saved session data",
     )
+    parser.add_argument(
+        "--rescan",
+        action="store_true",
+        help="Re-run discovery on a saved session and only re-run modules on changed services",
+    )
+    parser.add_argument(
+        "--max-age",
+        type=float,
+        help="With --rescan, also re-run modules whose results are older than this many hours",
+    )
+    parser.add_argument(
+        "-p",
+        "--ports",
+        default="1-65535",
+        help="TCP ports for discovery, e.g. 1-1024,8080 (default: all ports)",
+    )
+    parser.add_argument(
+        "--alive-ports",
+        default=",".join(map(str, DEFAULT_PORTS)),
+        help="TCP ports probed together with ICMP to check that a host is up",
+    )
+    parser.add_argument(
+        "--sweep",
+        action="store_true",
+        help="Only list the live hosts of --target, e.g. 10.0.0.0/24 or 10.0.0.1-50",
+    )
+    parser.add_argument(
+        "--log-level",
+        choices=["debug", "info", "success", "warning", "error"],
+        help="Minimum level of log messages to keep (default: info, or $LOG_LEVEL)",
+    )
+    parser.add_argument(
+        "--no-module-cache",
+        action="store_true",
+        help="Parse and validate modules.yml without using the module catalog cache",
+    )
+    parser.add_argument(
+        "--watch-modules",
+        action="store_true",
+        help="Reload modules.yml when it changes and run new or changed modules",
+    )
     parser.add_argument(
         "--no-ui",
         action="store_true",
@@ -84,6 +167,16 @@ def main():
         help="Select UI type: auto (default), simple, or full",
     )
     args = parser.parse_args()
+    try:
+        parse_ports(args.ports)
+    except ValueError as e:
+        parser.error(f"--ports: {e}")
+    try:
+        alive_ports = parse_ports(args.alive_ports)
+    except ValueError as e:
+        parser.error(f"--alive-ports: {e}")
+    if args.sweep:
+        return sweep_targets(args.target, alive_ports)
 
     # Process target information
     target = args.target
@@ -92,12 +185,22 @@ def main():
     hostname = hostname_from_url if hostname_from_url else "" 
     
     # Initialize configuration
+    if args.log_level:
+        ConfigManager.set_log_level(args.log_level)
     config_manager = ConfigManager()
     config_manager.init_config(path=args.path)
-    config_manager.load_modules()
+    config_manager.load_modules(use_cache=not args.no_module_cache)
     
-    # Initialize target information
-    target_info = TargetInfo(config_manager, ip=ip, hostname=hostname)
+    # Initialize target information, resuming the saved session if there is one
+    target_info = None
+    if not args.newsession:
+        target_info = TargetInfo.load_from_file(config_manager, hostname or ip)
+        if target_info:
+            ConfigManager.log_info(f"Resuming saved session for {target_info.get_host()}")
+    elif args.rescan:
+        ConfigManager.log_warning("--rescan has no effect together with --newsession")
+    if not target_info:
+        target_info = TargetInfo(config_manager, ip=ip, hostname=hostname)
     config_manager.set_target_info(target_info)
     
     # Start UI and scanning
@@ -134,6 +237,9 @@ def main():
                     
             # Reset terminal before starting UI
             os.system('reset')  # This ensures terminal is in a clean state
+            
+            from pyautoenum.ui.interface import Interface
+            from pyautoenum.ui.simple_interface import SimpleInterface
                     
             # Select appropriate interface based on command line args
             if args.ui_type == "simple":
@@ -177,7 +283,14 @@ def main():
             print(f"Running in non-interactive mode. Scanning target: {target}")
         
         # Start scanning thread
-        scan_thread = ScanThread()
+        max_age = args.max_age * 3600 if args.max_age is not None else None
+        scan_thread = ScanThread(
+            rescan=args.rescan,
+            max_age=max_age,
+            watch_modules=args.watch_modules,
+            ports=args.ports,
+            alive_ports=alive_ports,
+        )
         ConfigManager.set_scan_thread(scan_thread)
         
         # Set initial UI status
@@ -210,6 +323,8 @@ def main():
         # Save any data
         if ConfigManager.target_info:
             ConfigManager.target_info.save_to_file()
+        
+        ConfigManager.flush_logs()
     
     return 0
 
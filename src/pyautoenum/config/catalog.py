@@ -0,0 +1,269 @@
+"""Validated, cached module catalog for PyAutoEnum."""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pyautoenum
+
+# Bump when the layout of cached catalogs changes
+CATALOG_CACHE_VERSION = 4
+
+# Python modules whose functions can be used as module commands
+CUSTOM_MODULES_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "modules", "custom.py"
+)
+
+
+def default_cache_dir() -> str:
+    """Get the directory for cache files ($XDG_CACHE_HOME/pyautoenum)."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(Path.home(), ".cache")
+    return os.path.join(base, "pyautoenum")
+
+
+def file_sha1(path: str) -> str:
+    """Compute the SHA-1 hex digest of a file."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _mtime_ns(path: str) -> Optional[int]:
+    """Get the modification time of a path, or None if it does not exist."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _code_fingerprint() -> str:
+    """Fingerprint of the package code that decides which commands are valid."""
+    return f"{pyautoenum.__version__}:{_mtime_ns(CUSTOM_MODULES_FILE)}"
+
+
+class ModuleCatalogCache:
+    """
+    On-disk cache of the validated module catalog.
+
+    A catalog is the parsed and validated content of a ``modules.yml``:
+    the normalized module definitions that passed validation, the ones
+    that failed, and what validation depended on. It is stored as JSON,
+    which loads far faster than parsing YAML and scanning PATH again.
+
+    A cached catalog is only used while all of these still hold:
+
+    - ``modules.yml`` has the same mtime and size, or else the same SHA-1
+    - every resolved binary still exists with the same mtime, so the
+      resolved paths can be used without searching PATH again
+    - commands that were missing are still missing (checked via the
+      mtimes of the PATH directories)
+    - the package version, ``modules/custom.py`` and the caller's
+      ``code_key`` (e.g. the installed module packs) are unchanged
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory for cache files, defaults to default_cache_dir()
+        """
+        self.cache_dir = cache_dir or default_cache_dir()
+
+    def cache_path(self, config_file: str) -> str:
+        """Get the cache file path for a modules.yml file."""
+        key = hashlib.sha1(os.path.abspath(config_file).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"catalog-{key}.json")
+
+    def load(self, config_file: str, code_key: str = "") -> Optional[Dict[str, Any]]:
+        """
+        Load the cached catalog of a modules.yml file if it is still valid.
+
+        Args:
+            config_file: Path to the modules.yml file
+            code_key: Extra key the cached catalog must have been stored with
+
+        Returns:
+            Catalog dictionary, or None if there is no valid cache entry
+        """
+        cache_path = self.cache_path(config_file)
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                catalog = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if catalog.get("version") != CATALOG_CACHE_VERSION:
+            return None
+        if catalog.get("source") != os.path.abspath(config_file):
+            return None
+        if catalog.get("code") != f"{_code_fingerprint()}|{code_key}":
+            return None
+
+        # Source file: cheap stat check first, hash only if it was touched
+        try:
+            stat = os.stat(config_file)
+        except OSError:
+            return None
+        if (stat.st_mtime_ns, stat.st_size) != (catalog.get("mtime_ns"), catalog.get("size")):
+            if file_sha1(config_file) != catalog.get("sha1"):
+                return None
+            catalog["mtime_ns"], catalog["size"] = stat.st_mtime_ns, stat.st_size
+            self._write(cache_path, catalog)
+
+        # Resolved binaries must be unchanged
+        for path, mtime_ns in catalog.get("binaries", {}).items():
+            if _mtime_ns(path) != mtime_ns:
+                return None
+
+        # Missing commands must still be missing
+        if catalog.get("missing"):
+            if catalog.get("path_env") != os.environ.get("PATH", ""):
+                return None
+            for path, mtime_ns in catalog.get("path_dirs", {}).items():
+                if _mtime_ns(path) != mtime_ns:
+                    return None
+            for command in catalog["missing"]:
+                if os.path.isabs(command) and os.path.exists(command):
+                    return None
+
+        return catalog
+
+    def store(self, config_file: str, catalog: Dict[str, Any], code_key: str = "") -> None:
+        """
+        Store a freshly validated catalog.
+
+        Args:
+            config_file: Path to the modules.yml file
+            catalog: Catalog with "modules", "failed", "binaries" and "missing"
+            code_key: Extra key that must match when the catalog is loaded
+        """
+        stat = os.stat(config_file)
+        catalog = dict(catalog)
+        catalog.update({
+            "version": CATALOG_CACHE_VERSION,
+            "source": os.path.abspath(config_file),
+            "code": f"{_code_fingerprint()}|{code_key}",
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha1": file_sha1(config_file),
+        })
+        if catalog.get("missing"):
+            path_env = os.environ.get("PATH", "")
+            catalog["path_env"] = path_env
+            catalog["path_dirs"] = {
+                directory: _mtime_ns(directory)
+                for directory in path_env.split(os.pathsep) if directory
+            }
+        self._write(self.cache_path(config_file), catalog)
+
+    def _write(self, cache_path: str, catalog: Dict[str, Any]) -> None:
+        """Atomically write a catalog file, ignoring errors (the cache is optional)."""
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(catalog, f)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+
+
+def normalize_module_entry(module_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normalize one module definition from modules.yml.
+
+    Args:
+        module_data: Raw module dictionary from YAML
+
+    Returns:
+        Dictionary with the keyword arguments of Module (except config)
+    """
+    return {
+        "name": module_data.get("name"),
+        "description": module_data.get("description", ""),
+        "command": module_data.get("command", ""),
+        "switches": module_data.get("switches", []) or [],
+        "analyse_func": module_data.get("analyse_function", ""),
+        "protocol_list": [p.lower() for p in module_data.get("protocols", []) or []],
+        "requirements": [r.lower() for r in module_data.get("requires", []) or []],
+        "pipeline": [
+            {"command": stage.get("command", ""), "switches": stage.get("switches", []) or []}
+            for stage in module_data.get("pipeline", []) or []
+        ],
+        "resources": module_data.get("resources") or {},
+    }
+
+
+def is_python_command(command: str) -> bool:
+    """Check whether a command names a registered Python module function."""
+    from pyautoenum.modules.registry import module_registry
+    return module_registry.resolve(command) is not None
+
+
+def build_catalog(modules_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Validate parsed module definitions.
+
+    Args:
+        modules_data: List of module dictionaries from modules.yml
+
+    Returns:
+        Catalog with valid "modules", "failed" descriptions, "resolved"
+        commands (name to path), "binaries" (path to mtime) and "missing"
+        commands
+    """
+    import shutil
+
+    from pyautoenum.data.models import ModuleResources
+
+    modules, failed, missing = [], [], []
+    resolved_commands: Dict[str, str] = {}
+    binaries: Dict[str, Optional[int]] = {}
+    for module_data in modules_data:
+        entry = normalize_module_entry(module_data)
+        command = entry["command"]
+
+        try:
+            ModuleResources.from_dict(entry["resources"])
+        except (TypeError, ValueError) as e:
+            failed.append(f"{entry['name']} ({str(e)})")
+            continue
+
+        resolved = shutil.which(command) if command else None
+        if resolved:
+            resolved_commands[command] = resolved
+            binaries[resolved] = _mtime_ns(resolved)
+        elif not (command and is_python_command(command)):
+            failed.append(f"{entry['name']} ({command})")
+            missing.append(command)
+            continue
+
+        # Every pipeline stage must be an installed command
+        stage_missing = []
+        for stage in entry["pipeline"]:
+            stage_resolved = shutil.which(stage["command"]) if stage["command"] else None
+            if stage_resolved:
+                resolved_commands[stage["command"]] = stage_resolved
+                binaries[stage_resolved] = _mtime_ns(stage_resolved)
+            else:
+                stage_missing.append(stage["command"])
+        if stage_missing or (entry["pipeline"] and not resolved):
+            failed.append(f"{entry['name']} ({', '.join(stage_missing) or command})")
+            missing.extend(stage_missing)
+            continue
+
+        modules.append(entry)
+
+    return {
+        "modules": modules,
+        "failed": failed,
+        "count": len(modules_data),
+        "resolved": resolved_commands,
+        "binaries": binaries,
+        "missing": missing,
+    }
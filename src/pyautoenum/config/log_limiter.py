@@ -0,0 +1,251 @@
+"""Rate limiting and duplicate suppression of log records for PyAutoEnum."""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from pyautoenum.config.log_record import LogLevel, LogRecord
+
+# Default maximum records per call site and window, by level (None = unlimited).
+# Nothing is limited unless configured; noisy call sites opt in with a limit.
+DEFAULT_LEVEL_LIMITS: Dict[LogLevel, Optional[int]] = {
+    LogLevel.DEBUG: None,
+    LogLevel.INFO: None,
+    LogLevel.SUCCESS: None,
+    LogLevel.WARNING: None,
+    LogLevel.ERROR: None,
+}
+
+
+class _SiteState:
+    """Counters of one call site within the current window."""
+
+    __slots__ = ("window_start", "count", "suppressed", "last_key", "repeats",
+                 "last_record")
+
+    def __init__(self, now: float):
+        self.reset(now)
+
+    def reset(self, now: float) -> None:
+        """Start a new window."""
+        self.window_start = now
+        self.count = 0
+        self.suppressed = 0
+        self.last_key = None
+        self.repeats = 0
+        self.last_record = None
+
+
+class LogRateLimiter:
+    """
+    Per-call-site rate limiter with duplicate suppression.
+
+    A call site is identified by level, module and message template, so
+    each ``ConfigManager.log_*`` call in the code gets its own budget.
+    A site is limited if its module or level has a configured limit, or
+    if the call site asks for one (``limit=`` of the ``log_*`` methods);
+    configured limits take precedence. Within each window a limited site
+    may emit ``limit`` records. Limited sites, and sites of levels or
+    modules configured for it, also drop an exact repeat of their
+    previous record (same template and args) right away; other sites
+    log every record. When the window ends, one summary record reports
+    what was held back, e.g. ``... repeated 4,312 times in the last
+    10s``; it is handed to ``on_summary`` by a timer, or returned by
+    check() or flush() if there is no callback. This keeps log volume
+    flat however noisy a module is.
+    """
+
+    def __init__(
+        self,
+        window: float = 10.0,
+        level_limits: Optional[Dict[LogLevel, Optional[int]]] = None,
+        module_limits: Optional[Dict[str, Optional[int]]] = None,
+        dedupe_levels: Optional[Iterable[LogLevel]] = None,
+        dedupe_modules: Optional[Iterable[str]] = None,
+        on_summary: Optional[Callable[[LogRecord], None]] = None,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            window: Length of a rate limiting window in seconds
+            level_limits: Records per site and window by level (None = unlimited)
+            module_limits: Per-module overrides of the level limits
+            dedupe_levels: Levels whose sites drop exact repeats without a limit
+            dedupe_modules: Modules whose sites drop exact repeats without a limit
+            on_summary: Called with summary records as soon as their window ends
+        """
+        self.window = window
+        self.level_limits = dict(DEFAULT_LEVEL_LIMITS)
+        if level_limits:
+            self.level_limits.update(level_limits)
+        self.module_limits = dict(module_limits or {})
+        self.dedupe_levels = set(dedupe_levels or ())
+        self.dedupe_modules = set(dedupe_modules or ())
+        self.on_summary = on_summary
+
+        self._sites: Dict[Tuple[Any, ...], _SiteState] = {}
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+        self._timer: Optional[threading.Timer] = None
+        self.suppressed_total = 0
+
+    def configure(
+        self,
+        window: Optional[float] = None,
+        level_limits: Optional[Dict[LogLevel, Optional[int]]] = None,
+        module_limits: Optional[Dict[str, Optional[int]]] = None,
+        dedupe_levels: Optional[Iterable[LogLevel]] = None,
+        dedupe_modules: Optional[Iterable[str]] = None,
+    ) -> None:
+        """
+        Change limits at runtime. Arguments left as None are unchanged.
+
+        Args:
+            window: Length of a rate limiting window in seconds
+            level_limits: Records per site and window by level (None = unlimited)
+            module_limits: Per-module overrides of the level limits
+            dedupe_levels: Levels whose sites drop exact repeats without a limit
+            dedupe_modules: Modules whose sites drop exact repeats without a limit
+        """
+        with self._lock:
+            if window is not None:
+                self.window = window
+            if level_limits:
+                self.level_limits.update(level_limits)
+            if module_limits:
+                self.module_limits.update(module_limits)
+            if dedupe_levels is not None:
+                self.dedupe_levels = set(dedupe_levels)
+            if dedupe_modules is not None:
+                self.dedupe_modules = set(dedupe_modules)
+
+    def check(
+        self, record: LogRecord, now: Optional[float] = None, limit: Optional[int] = None
+    ) -> Tuple[bool, List[LogRecord]]:
+        """
+        Decide whether a record should be emitted.
+
+        Args:
+            record: Record about to be logged
+            now: Current monotonic time, for testing
+            limit: Records per window the call site asked for (None = unlimited)
+
+        Returns:
+            Tuple of (emit record, summary records to emit before it)
+        """
+        now = time.monotonic() if now is None else now
+        if record.module in self.module_limits:
+            limit = self.module_limits[record.module]
+        elif self.level_limits.get(record.level) is not None:
+            limit = self.level_limits[record.level]
+        site = (record.level, record.module, record.template)
+
+        with self._lock:
+            summaries = self._sweep(now) if now >= self._next_sweep else []
+
+            state = self._sites.get(site)
+            if state is None:
+                state = self._sites[site] = _SiteState(now)
+            elif now - state.window_start >= self.window:
+                summary = self._summarize(state, now)
+                if summary:
+                    summaries.append(summary)
+                state.reset(now)
+
+            key = None
+            if limit is not None or record.level in self.dedupe_levels or record.module in self.dedupe_modules:
+                try:
+                    key = hash((record.template, record.args))
+                except TypeError:
+                    key = None
+
+            if key is not None and key == state.last_key:
+                state.repeats += 1
+                state.last_record = record
+                self.suppressed_total += 1
+                self._schedule(state.window_start + self.window - now)
+                return False, summaries
+
+            state.last_key = key
+            if limit is not None and state.count >= limit:
+                state.suppressed += 1
+                state.last_record = record
+                self.suppressed_total += 1
+                self._schedule(state.window_start + self.window - now)
+                return False, summaries
+
+            state.count += 1
+            return True, summaries
+
+    def _schedule(self, delay: float) -> None:
+        """Start the summary timer if a callback is set and none is pending. Caller holds the lock."""
+        if self.on_summary is None or self._timer is not None:
+            return
+        self._timer = threading.Timer(max(0.0, delay), self._emit_due)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _emit_due(self) -> None:
+        """Hand the summaries of ended windows to on_summary (timer thread)."""
+        now = time.monotonic()
+        with self._lock:
+            self._timer = None
+            summaries = self._sweep(now)
+            # Sites still holding records back get their own summary later
+            pending = [
+                state.window_start + self.window - now
+                for state in self._sites.values() if state.repeats or state.suppressed
+            ]
+            if pending:
+                self._schedule(min(pending))
+        on_summary = self.on_summary
+        if on_summary is not None:
+            for summary in summaries:
+                on_summary(summary)
+
+    def flush(self) -> List[LogRecord]:
+        """
+        End all windows now (e.g. at shutdown) and return their summary records.
+
+        Returns:
+            Summary records for every site that held records back
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            return self._sweep(time.monotonic(), force=True)
+
+    def _sweep(self, now: float, force: bool = False) -> List[LogRecord]:
+        """Summarize and drop sites whose window has ended. Caller holds the lock."""
+        self._next_sweep = now + self.window
+        summaries = []
+        for site, state in list(self._sites.items()):
+            if force or now - state.window_start >= self.window:
+                summary = self._summarize(state, now)
+                if summary:
+                    summaries.append(summary)
+                del self._sites[site]
+        return summaries
+
+    def _summarize(self, state: _SiteState, now: float) -> Optional[LogRecord]:
+        """Build the summary record of a site's window, or None if nothing was held back."""
+        record = state.last_record
+        if record is None or not (state.repeats or state.suppressed):
+            return None
+
+        seconds = max(1, round(min(now - state.window_start, self.window)))
+        if state.suppressed:
+            return LogRecord(
+                record.level,
+                "Suppressed {:,} messages like \"{}\" in the last {}s",
+                (state.suppressed + state.repeats, record.message, seconds),
+                record.module, record.port, record.target,
+            )
+        return LogRecord(
+            record.level,
+            "\"{}\" repeated {:,} times in the last {}s",
+            (record.message, state.repeats, seconds),
+            record.module, record.port, record.target,
+        )
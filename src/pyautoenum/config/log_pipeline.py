@@ -0,0 +1,230 @@
+"""Asynchronous buffered log file writer for PyAutoEnum."""
+
+import atexit
+import collections
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from pyautoenum.config.log_store import LogFileIndex
+
+
+class LogPipeline:
+    """
+    Queue-based log pipeline with a single writer thread.
+
+    Callers enqueue lines without taking a lock (deque appends are atomic).
+    One writer thread keeps the log file open, drains the queue in batches
+    and flushes when either the flush interval elapses or a batch of
+    ``batch_size`` lines is pending. If the queue holds ``max_queue`` lines,
+    new lines are dropped and counted instead of blocking the caller.
+
+    The log file is rotated once it grows past ``max_bytes``; rotated files
+    are tracked by a LogFileIndex so older history can be paged through
+    without loading it into memory.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = 0.5,
+        batch_size: int = 256,
+        max_queue: int = 100_000,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        formatter: Callable[[Any], str] = str,
+    ):
+        """
+        Initialize the pipeline. The writer thread starts with start().
+
+        Args:
+            flush_interval: Maximum seconds a line waits before being flushed
+            batch_size: Pending line count that triggers an early flush
+            max_queue: Maximum number of pending lines before dropping
+            max_bytes: Size at which the log file is rotated (0 disables rotation)
+            backup_count: Number of rotated log files to keep
+            formatter: Converts queued records to lines, called on the writer thread
+        """
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_queue = max_queue
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.formatter = formatter
+
+        self._queue: collections.deque = collections.deque()
+        self._pending: List[str] = []  # Formatted lines of a batch not written yet
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._file = None
+        self._file_path = ""
+        self._index: Optional[LogFileIndex] = None
+        self._atexit_registered = False
+
+        # Statistics tracking
+        self._enqueued = 0
+        self._dropped = 0
+        self._written = 0
+        self._batches = 0
+
+    def start(self, file_path: str) -> None:
+        """
+        Open the log file and start the writer thread.
+
+        Lines queued before start() are written once the file is open.
+
+        Args:
+            file_path: Path of the log file, opened in append mode
+        """
+        with self._write_lock:
+            if self._file and self._file_path != file_path:
+                self._file.close()
+                self._file = None
+            if not self._file:
+                self._index = LogFileIndex(file_path, backup_count=self.backup_count)
+                self._file = open(file_path, "ab")
+                self._file_path = file_path
+
+        if self._thread is None or not self._thread.is_alive():
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="LogPipelineWriter", daemon=True
+            )
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.close)
+                self._atexit_registered = True
+
+    def submit(self, line: Any) -> bool:
+        """
+        Enqueue a line for writing.
+
+        Args:
+            line: Log line without trailing newline, or a record for the formatter
+
+        Returns:
+            False if the line was dropped because the queue is full
+        """
+        queue = self._queue
+        if len(queue) >= self.max_queue:
+            self._dropped += 1
+            return False
+
+        queue.append(line)
+        self._enqueued += 1
+        if len(queue) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def flush(self) -> None:
+        """Write all queued lines and flush the file from the calling thread."""
+        self._drain()
+
+    def close(self) -> None:
+        """Stop the writer thread, flush what is queued and close the file."""
+        self._stop_event.set()
+        self._wakeup.set()
+        thread = self._thread
+        if thread and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=2.0)
+        self._drain()
+        with self._write_lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+            if self._index:
+                self._index.save()
+
+    def read_history(self, skip: int, count: int) -> List[str]:
+        """
+        Read lines from the log file and its rotated backups.
+
+        Queued lines are written first so the history is complete.
+
+        Args:
+            skip: Number of newest lines to skip
+            count: Number of lines to return
+
+        Returns:
+            List of lines in chronological order
+        """
+        self._drain()
+        with self._write_lock:
+            if not self._index:
+                return []
+            return self._index.read(skip, count)
+
+    def history_size(self) -> int:
+        """Number of lines in the log file and its rotated backups."""
+        with self._write_lock:
+            return self._index.total_lines if self._index else 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get pipeline statistics.
+
+        Counters are updated without locking, so they are approximate
+        while several threads are logging.
+
+        Returns:
+            Dictionary with queued, enqueued, written, dropped and batch counts
+        """
+        return {
+            "queued": len(self._queue) + len(self._pending),
+            "enqueued": self._enqueued,
+            "written": self._written,
+            "dropped": self._dropped,
+            "batches": self._batches,
+        }
+
+    def _run(self) -> None:
+        """Writer thread loop."""
+        while not self._stop_event.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self._drain()
+            except Exception:
+                # Never let a write error kill the writer thread
+                time.sleep(self.flush_interval)
+
+    def _drain(self) -> None:
+        """
+        Write every queued line in one batch and flush the file.
+
+        Lines stay pending until the write succeeded, so a failed write
+        (e.g. a full disk) is retried with the same lines on the next
+        drain instead of losing them. New lines wait in the bounded queue
+        meanwhile.
+        """
+        with self._write_lock:
+            while self._file:
+                retry = bool(self._pending)
+                lines = self._pending
+                if not retry:
+                    queue = self._queue
+                    formatter = self.formatter
+                    while queue:
+                        lines.append(formatter(queue.popleft()))
+                    if not lines:
+                        return
+
+                data = ("\n".join(lines) + "\n").encode("utf-8", "replace")
+                self._file.write(data)
+                self._file.flush()
+                self._pending = []
+                self._index.record_write(data)
+                self._written += len(lines)
+                self._batches += 1
+
+                if self.max_bytes and self._index.files[0]["size"] >= self.max_bytes:
+                    self._rotate()
+                if not retry:
+                    return
+
+    def _rotate(self) -> None:
+        """Rotate the log file. Caller holds the write lock."""
+        self._file.close()
+        self._index.rotate()
+        self._file = open(self._file_path, "ab")
@@ -0,0 +1,175 @@
+"""Structured log records for PyAutoEnum."""
+
+import json
+import time
+from enum import IntEnum
+from typing import Any, Dict, Optional, Tuple
+
+
+class LogLevel(IntEnum):
+    """Severity of a log record, ordered so levels can be compared."""
+    DEBUG = 10
+    INFO = 20
+    SUCCESS = 25
+    WARNING = 30
+    ERROR = 40
+
+    @classmethod
+    def parse(cls, value: Any, default: "LogLevel" = None) -> "LogLevel":
+        """
+        Convert a level name or number to a LogLevel.
+
+        Args:
+            value: Level name (case-insensitive), number or LogLevel
+            default: Level returned if the value is not recognized
+
+        Returns:
+            Matching LogLevel, or default
+        """
+        if isinstance(value, LogLevel):
+            return value
+        try:
+            if isinstance(value, int) or str(value).isdigit():
+                return cls(int(value))
+            return cls[str(value).strip().upper()]
+        except (KeyError, ValueError):
+            if default is None:
+                raise ValueError(f"Unknown log level: {value}")
+            return default
+
+
+# Prefixes used by the plain-text rendering of records
+LEVEL_PREFIXES = {
+    LogLevel.DEBUG: "[.]",
+    LogLevel.INFO: "[*]",
+    LogLevel.SUCCESS: "[+]",
+    LogLevel.WARNING: "[!]",
+    LogLevel.ERROR: "[-]",
+}
+
+
+class LogRecord:
+    """
+    A single structured log entry.
+
+    The message is kept as a template plus arguments and only formatted
+    when something reads it (the log writer thread or the UI), so callers
+    do not pay for string formatting on the hot path. Templates use
+    ``str.format`` placeholders and are only formatted if args are given.
+    """
+
+    __slots__ = ("level", "timestamp", "template", "args", "module", "port", "target",
+                 "_message")
+
+    def __init__(
+        self,
+        level: LogLevel,
+        template: str,
+        args: Tuple[Any, ...] = (),
+        module: Optional[str] = None,
+        port: Optional[Any] = None,
+        target: Optional[str] = None,
+        timestamp: Optional[float] = None,
+    ):
+        """
+        Initialize a log record.
+
+        Args:
+            level: Severity of the record
+            template: Message or message template
+            args: Arguments for the template placeholders
+            module: Name of the module the record relates to
+            port: Port the record relates to
+            target: Target host the record relates to
+            timestamp: Creation time, defaults to now
+        """
+        self.level = level
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.template = template
+        self.args = args
+        self.module = module
+        self.port = port
+        self.target = target
+        self._message: Optional[str] = None
+
+    @property
+    def message(self) -> str:
+        """The formatted message, computed on first access."""
+        if self._message is None:
+            if self.args:
+                try:
+                    self._message = self.template.format(*self.args)
+                except (IndexError, KeyError, ValueError):
+                    self._message = f"{self.template} {self.args!r}"
+            else:
+                self._message = str(self.template)
+        return self._message
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the record to a dictionary."""
+        return {
+            "time": self.timestamp,
+            "level": self.level.name,
+            "module": self.module,
+            "port": self.port,
+            "target": self.target,
+            "message": self.message,
+            "template": self.template,
+            "args": list(self.args),
+        }
+
+    def to_json(self) -> str:
+        """Serialize the record as a single JSON line."""
+        return json.dumps(self.to_dict(), default=str)
+
+    @classmethod
+    def from_json(cls, line: str) -> "LogRecord":
+        """
+        Create a record from a JSON line written by to_json().
+
+        Lines that are not valid JSON (e.g. from older plain-text logs)
+        become INFO records with the line as message.
+
+        Args:
+            line: Serialized record
+
+        Returns:
+            New LogRecord instance
+        """
+        try:
+            data = json.loads(line)
+            record = cls(
+                level=LogLevel.parse(data.get("level"), LogLevel.INFO),
+                template=data.get("template", ""),
+                args=tuple(data.get("args") or ()),
+                module=data.get("module"),
+                port=data.get("port"),
+                target=data.get("target"),
+                timestamp=data.get("time"),
+            )
+            record._message = data.get("message")
+            return record
+        except (ValueError, AttributeError):
+            return cls(LogLevel.INFO, line)
+
+    def matches(self, min_level: LogLevel = LogLevel.DEBUG, module: Optional[str] = None) -> bool:
+        """
+        Check whether the record passes a level and module filter.
+
+        Args:
+            min_level: Minimum level to accept
+            module: Module name to accept, or None for any
+
+        Returns:
+            Boolean indicating if the record matches
+        """
+        if self.level < min_level:
+            return False
+        return module is None or self.module == module
+
+    def __str__(self) -> str:
+        """Plain-text rendering with the level prefix, e.g. ``[+] message``."""
+        return f"{LEVEL_PREFIXES[self.level]} {self.message}"
+
+    def __repr__(self) -> str:
+        return f"LogRecord({self.level.name}, {self.message!r})"
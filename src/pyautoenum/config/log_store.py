@@ -0,0 +1,249 @@
+"""In-memory log ring buffer and on-disk log history for PyAutoEnum."""
+
+import collections
+import itertools
+import json
+import os
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+class LogRingBuffer:
+    """
+    Fixed-capacity buffer holding the most recent log entries.
+
+    Appending is O(1) and reading the newest k entries is O(k). Once the
+    buffer is full the oldest entry is discarded on every append; older
+    entries remain available from the on-disk history.
+    """
+
+    def __init__(self, capacity: int = 10_000):
+        """
+        Initialize the buffer.
+
+        Args:
+            capacity: Maximum number of entries kept in memory
+        """
+        self.capacity = capacity
+        self._entries: collections.deque = collections.deque(maxlen=capacity)
+        self.total = 0  # Entries appended since start, including evicted ones
+
+    def append(self, entry: Any) -> None:
+        """Add an entry, evicting the oldest one if the buffer is full."""
+        self._entries.append(entry)
+        self.total += 1
+
+    def tail(
+        self,
+        count: Optional[int] = None,
+        skip: int = 0,
+        predicate: Optional[Callable[[Any], bool]] = None,
+    ) -> List[Any]:
+        """
+        Get the newest entries in chronological order.
+
+        Args:
+            count: Number of entries to return, or None for all
+            skip: Number of newest entries to skip (for paging back)
+            predicate: Only consider entries for which this returns True
+
+        Returns:
+            List of entries, oldest first
+        """
+        if count is None:
+            count = len(self._entries)
+
+        # Walking the deque fails if another thread appends meanwhile; retry
+        # a few times before falling back to an O(n) copy.
+        for attempt in range(4):
+            source = self._entries if attempt < 3 else self._entries.copy()
+            try:
+                entries = reversed(source)
+                if predicate is not None:
+                    entries = filter(predicate, entries)
+                result = list(itertools.islice(entries, skip, skip + count))
+            except RuntimeError:
+                continue
+            result.reverse()
+            return result
+        return []
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(list(self._entries))
+
+
+class LogFileIndex:
+    """
+    Sparse line-offset index of a log file and its rotated backups.
+
+    File 0 is the active log file (e.g. ``logs.jsonl``), file i is the i-th
+    rotated backup (``logs.1.jsonl`` is the most recent). For each file the
+    index stores its line count, byte size and a list of
+    ``(line_number, byte_offset)`` checkpoints roughly every ``interval``
+    lines, so any range of lines can be read by seeking to the nearest
+    checkpoint instead of scanning the whole history. The index is saved
+    next to the log file and rebuilt for any file whose size changed.
+    """
+
+    def __init__(self, file_path: str, backup_count: int = 5, interval: int = 1024):
+        """
+        Initialize the index.
+
+        Args:
+            file_path: Path of the active log file
+            backup_count: Number of rotated backups kept
+            interval: Approximate number of lines between checkpoints
+        """
+        self.file_path = file_path
+        self.backup_count = backup_count
+        self.interval = interval
+        self.index_path = os.path.splitext(file_path)[0] + ".index.json"
+        self.files: List[Dict[str, Any]] = []
+        self.load()
+
+    def path_for(self, number: int) -> str:
+        """Get the path of file ``number`` (0 is the active file)."""
+        if number == 0:
+            return self.file_path
+        root, ext = os.path.splitext(self.file_path)
+        return f"{root}.{number}{ext}"
+
+    def load(self) -> None:
+        """Load the saved index, rebuilding entries that no longer match the files."""
+        saved: List[Dict[str, Any]] = []
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                saved = json.load(f).get("files", [])
+        except (OSError, ValueError):
+            pass
+
+        self.files = []
+        for number in range(self.backup_count + 1):
+            path = self.path_for(number)
+            if not os.path.exists(path):
+                if number == 0:
+                    self.files.append(self._empty_entry())
+                    continue
+                break
+            entry = saved[number] if number < len(saved) else None
+            if not entry or entry.get("size") != os.path.getsize(path):
+                entry = self._scan(path)
+            self.files.append(entry)
+
+    def save(self) -> None:
+        """Write the index next to the log file."""
+        try:
+            with open(self.index_path, "w", encoding="utf-8") as f:
+                json.dump({"interval": self.interval, "files": self.files}, f)
+        except OSError:
+            pass
+
+    def record_write(self, data: bytes) -> None:
+        """
+        Account for a batch appended to the active file.
+
+        Args:
+            data: Bytes just written, ending in a newline
+        """
+        entry = self.files[0]
+        checkpoints = entry["checkpoints"]
+        if not checkpoints or entry["lines"] - checkpoints[-1][0] >= self.interval:
+            checkpoints.append([entry["lines"], entry["size"]])
+        entry["lines"] += data.count(b"\n")
+        entry["size"] += len(data)
+
+    def rotate(self) -> None:
+        """Shift the active file and backups by one, dropping the oldest."""
+        oldest = self.path_for(self.backup_count)
+        if os.path.exists(oldest):
+            os.remove(oldest)
+        for number in range(self.backup_count - 1, -1, -1):
+            path = self.path_for(number)
+            if os.path.exists(path):
+                os.replace(path, self.path_for(number + 1))
+
+        self.files.insert(0, self._empty_entry())
+        del self.files[self.backup_count + 1:]
+        self.save()
+
+    @property
+    def total_lines(self) -> int:
+        """Number of lines in the active file and all backups."""
+        return sum(entry["lines"] for entry in self.files)
+
+    def read(self, skip: int, count: int) -> List[str]:
+        """
+        Read lines counted back from the newest line on disk.
+
+        Args:
+            skip: Number of newest lines to skip
+            count: Number of lines to return
+
+        Returns:
+            List of lines in chronological order
+        """
+        segments = []
+        remaining_skip, remaining = skip, count
+        for number, entry in enumerate(self.files):
+            if remaining <= 0:
+                break
+            lines = entry["lines"]
+            if remaining_skip >= lines:
+                remaining_skip -= lines
+                continue
+            end = lines - remaining_skip
+            start = max(0, end - remaining)
+            segments.append((number, start, end))
+            remaining -= end - start
+            remaining_skip = 0
+
+        result: List[str] = []
+        for number, start, end in reversed(segments):
+            result.extend(self._read_range(number, start, end))
+        return result
+
+    def _read_range(self, number: int, start: int, end: int) -> List[str]:
+        """Read lines [start, end) of file ``number`` using the nearest checkpoint."""
+        line_no, offset = 0, 0
+        for checkpoint_line, checkpoint_offset in self.files[number]["checkpoints"]:
+            if checkpoint_line > start:
+                break
+            line_no, offset = checkpoint_line, checkpoint_offset
+
+        lines = []
+        try:
+            with open(self.path_for(number), "rb") as f:
+                f.seek(offset)
+                for raw in f:
+                    if line_no >= end:
+                        break
+                    if line_no >= start:
+                        lines.append(raw.rstrip(b"\n").decode("utf-8", "replace"))
+                    line_no += 1
+        except OSError:
+            pass
+        return lines
+
+    def _scan(self, path: str) -> Dict[str, Any]:
+        """Build an index entry by scanning a file once."""
+        entry = self._empty_entry()
+        try:
+            with open(path, "rb") as f:
+                for raw in f:
+                    if entry["lines"] % self.interval == 0:
+                        entry["checkpoints"].append([entry["lines"], entry["size"]])
+                    entry["lines"] += 1
+                    entry["size"] += len(raw)
+        except OSError:
+            pass
+        return entry
+
+    @staticmethod
+    def _empty_entry() -> Dict[str, Any]:
+        return {"lines": 0, "size": 0, "checkpoints": []}
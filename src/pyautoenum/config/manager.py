@@ -7,8 +7,11 @@ import traceback
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-import yaml
-
+from pyautoenum.config.catalog import ModuleCatalogCache, build_catalog
+from pyautoenum.config.log_limiter import LogRateLimiter
+from pyautoenum.config.log_pipeline import LogPipeline
+from pyautoenum.config.log_record import LogLevel, LogRecord
+from pyautoenum.config.log_store import LogRingBuffer
 from pyautoenum.data.models import Module
 
 
@@ -26,12 +29,20 @@ class ConfigManager:
     display_data: List[str] = []
     target_info = None
     modules: List[Module] = []
+    modules_file: Optional[str] = None  # modules.yml the modules were loaded from
+    _modules_file_stat: Optional[tuple] = None
+    module_catalog_cache = ModuleCatalogCache()
     scan_thread = None  # Reference to active scan thread
     ui_interface = None  # Reference to UI interface
     
     # Logging related
-    logs: List[str] = []
+    logs = LogRingBuffer(capacity=10_000)
     logs_lock = threading.Lock()
+    log_pipeline = LogPipeline(formatter=LogRecord.to_json)
+    # Summaries are logged when their window ends
+    log_limiter = LogRateLimiter(on_summary=lambda record: ConfigManager._emit_log(record))
+    min_log_level = LogLevel.parse(os.environ.get("LOG_LEVEL", "INFO"), LogLevel.INFO)
+    _log_target: Optional[str] = None
     
     def __new__(cls):
         """Ensure singleton pattern."""
@@ -83,6 +94,9 @@ class ConfigManager:
         # Create output directory if it doesn't exist
         os.makedirs(self.path, exist_ok=True)
         
+        # Start the buffered log writer (one JSON record per line)
+        self.log_pipeline.start(os.path.join(self.path, "logs.jsonl"))
+        
         self.log_info(f"Output path set to: {self.path}")
     
     def set_target_info(self, target_info) -> None:
@@ -93,13 +107,19 @@ class ConfigManager:
             target_info: The TargetInfo object
         """
         ConfigManager.target_info = target_info
+        ConfigManager._log_target = target_info.get_host() if target_info else None
     
-    def load_modules(self, config_file: str | None = None) -> None:
+    def load_modules(self, config_file: str | None = None, use_cache: bool = True) -> None:
         """
         Load attack modules from configuration file.
         
+        The validated catalog is cached (see ModuleCatalogCache), so later
+        launches skip YAML parsing and PATH lookups while modules.yml and
+        the resolved binaries are unchanged.
+        
         Args:
             config_file: Path to modules configuration file, or None for default
+            use_cache: Use and update the module catalog cache
         """
         if not config_file:
             # Check both potential locations for modules.yml
@@ -108,66 +128,141 @@ class ConfigManager:
             elif os.path.exists(os.path.join("resources", "modules.yml")):
                 config_file = os.path.join("resources", "modules.yml")
             else:
-                resource_path = os.path.join(
-                    os.path.dirname(os.path.abspath(__file__)), 
-                    "..", "resources", "modules.yml"
-                )
+                from pyautoenum.resources import ensure_modules_yml
+                
+                resource_path = ensure_modules_yml()
                 if os.path.exists(resource_path):
                     config_file = resource_path
                 else:
                     self.log_error("Could not find modules.yml configuration file")
                     return
         
+        ConfigManager.modules_file = config_file
+        ConfigManager._modules_file_stat = self._stat_modules_file()
+        modules = self._read_modules(config_file, use_cache)
+        if modules is not None:
+            ConfigManager.modules = modules
+    
+    def reload_modules(self) -> Optional[Dict[str, List[str]]]:
+        """
+        Re-read modules.yml and merge it into the loaded modules.
+        
+        Modules whose definition is unchanged keep their existing object,
+        so running and queued tasks are not affected. Scheduling the new
+        and changed modules is left to the scan (see ScanManager.reload_modules).
+        
+        Returns:
+            Dictionary with the "added", "changed" and "removed" module names,
+            or None if the file could not be loaded
+        """
+        if not self.modules_file:
+            self.log_error("No modules.yml loaded yet")
+            return None
+        
+        ConfigManager._modules_file_stat = self._stat_modules_file()
+        new_modules = self._read_modules(self.modules_file, use_cache=True)
+        if new_modules is None:
+            return None
+        
+        previous = {module.name: module for module in ConfigManager.modules}
+        changes: Dict[str, List[str]] = {"added": [], "changed": [], "removed": []}
+        merged = []
+        for module in new_modules:
+            old = previous.pop(module.name, None)
+            if old is not None and old.fingerprint == module.fingerprint:
+                # Resource hints only affect scheduling, not results
+                old.resources = module.resources
+                merged.append(old)
+                continue
+            changes["added" if old is None else "changed"].append(module.name)
+            merged.append(module)
+        changes["removed"] = list(previous)
+        
+        ConfigManager.modules = merged
+        return changes
+    
+    def modules_file_changed(self) -> bool:
+        """
+        Cheaply check whether modules.yml changed since it was last read.
+        
+        Returns:
+            Boolean indicating if the file's mtime or size differs
+        """
+        return bool(self.modules_file) and self._stat_modules_file() != self._modules_file_stat
+    
+    @classmethod
+    def _stat_modules_file(cls) -> Optional[tuple]:
+        """Get (mtime, size) of the loaded modules.yml, or None."""
         try:
-            # Load modules
-            with open(config_file, "r", encoding="utf-8") as file:
-                modules_data = yaml.safe_load(file)
+            stat = os.stat(cls.modules_file)
+        except (OSError, TypeError):
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _read_modules(self, config_file: str, use_cache: bool) -> Optional[List[Module]]:
+        """
+        Read, validate and resolve the modules of a modules.yml file.
+        
+        Args:
+            config_file: Path to modules configuration file
+            use_cache: Use and update the module catalog cache
             
-            checked_modules = []
-            failed_modules = []
+        Returns:
+            List of usable modules, or None on error
+        """
+        try:
+            from pyautoenum.core.command import compile_stages
+            from pyautoenum.modules.registry import EXECUTOR_EXTERNAL, module_registry
             
-            # Create Module instances
-            for module_data in modules_data:
-                # Extract module data
-                name = module_data.get("name")
-                description = module_data.get("description", "")
-                command = module_data.get("command", "")
-                switches = module_data.get("switches", [])
-                analyse_func = module_data.get("analyse_function", "")
+            code_key = module_registry.fingerprint()
+            catalog = self.module_catalog_cache.load(config_file, code_key) if use_cache else None
+            if catalog is None:
+                # Parse and validate the catalog, then cache the result
+                import yaml
                 
-                protocols = module_data.get("protocols", [])
-                protocols = [p.lower() for p in protocols]
-                
-                requirements = module_data.get("requires", [])
-                requirements = [r.lower() for r in requirements]
-                
-                # Check if the command is valid
-                if self.check_command_installed(command):
-                    module = Module(
-                        name=name,
-                        description=description,
-                        command=command,
-                        requirements=requirements,
-                        protocol_list=protocols,
-                        switches=switches,
-                        analyse_func=analyse_func,
-                        config=self,
-                    )
-                    checked_modules.append(module)
-                else:
-                    failed_modules.append(f"{name} ({command})")
+                with open(config_file, "r", encoding="utf-8") as file:
+                    modules_data = yaml.safe_load(file) or []
+                catalog = build_catalog(modules_data)
+                if use_cache:
+                    self.module_catalog_cache.store(config_file, catalog, code_key)
+            else:
+                self.log_debug("Using cached module catalog for {}", config_file)
+            
+            # Resolve callables and analyzers once into the dispatch table; binaries
+            # come from the catalog, which checked them, so PATH is not searched again
+            resolved = catalog["resolved"]
+            checked_modules = []
+            failed_modules = list(catalog["failed"])
+            for entry in catalog["modules"]:
+                module = Module(config=self, **entry)
+                module.dispatch = module_registry.build_dispatch(
+                    module.command, module.analyse_func, resolved.get(module.command, "")
+                )
+                if module.dispatch is None:
+                    failed_modules.append(f"{module.name} ({module.command})")
+                    continue
+                if module.dispatch.executor == EXECUTOR_EXTERNAL:
+                    try:
+                        module.stages = compile_stages(module, module.dispatch.executable, resolved)
+                    except ValueError as e:
+                        failed_modules.append(f"{module.name} (invalid switches: {str(e)})")
+                        continue
+                if module.analyse_func and module.dispatch.analyzer is None:
+                    self.log_warning(f"Analysis function {module.analyse_func} not found for {module.name}")
+                checked_modules.append(module)
             
-            count_loaded = len(modules_data)
+            count_loaded = catalog["count"]
             count_errors = len(failed_modules)
             self.log_success(f"Loaded {count_loaded - count_errors}/{count_loaded} Attack Modules")
             
             if failed_modules:
                 self.log_warning(f"Failed to load modules: {', '.join(failed_modules)}")
             
-            ConfigManager.modules = checked_modules
+            return checked_modules
             
         except Exception as e:
             self.log_error(f"Error loading modules: {str(e)}")
+            return None
     
     @classmethod
     def check_command_installed(cls, command: str) -> bool:
@@ -184,56 +279,247 @@ class ConfigManager:
         if shutil.which(command):
             return True
         
-        # Check for Python function
-        from pyautoenum.modules import custom
-        if hasattr(custom, command) and callable(getattr(custom, command)):
-            return True
-            
-        return False
+        # Check for registered Python function
+        from pyautoenum.modules.registry import module_registry
+        return module_registry.resolve(command) is not None
     
     # Logging methods
+    #
+    # All log methods take a message template plus optional arguments, e.g.
+    # log_info("Started Module: {}", name, module=name, port=port). The
+    # template is only formatted when the record is displayed or written,
+    # and records below min_log_level are not created at all.
+    @classmethod
+    def set_log_level(cls, level: Any) -> None:
+        """
+        Set the minimum level of records that are kept.
+        
+        Args:
+            level: Level name (e.g. "debug", "warning") or LogLevel
+        """
+        cls.min_log_level = LogLevel.parse(level)
+    
+    @classmethod
+    def configure_log_limits(
+        cls,
+        window: Optional[float] = None,
+        level_limits: Optional[Dict[Any, Optional[int]]] = None,
+        module_limits: Optional[Dict[str, Optional[int]]] = None,
+        dedupe_levels: Optional[List[Any]] = None,
+        dedupe_modules: Optional[List[str]] = None,
+    ) -> None:
+        """
+        Configure rate limiting and duplicate suppression of log messages.
+        
+        Call sites with a limit always drop exact repeats of their previous
+        message; others only if their level or module is listed here.
+        
+        Args:
+            window: Length of a rate limiting window in seconds
+            level_limits: Messages per call site and window by level name or
+                LogLevel, None for unlimited
+            module_limits: Per-module overrides of the level limits
+            dedupe_levels: Level names or LogLevels whose messages are deduplicated
+            dedupe_modules: Modules whose messages are deduplicated
+        """
+        if level_limits:
+            level_limits = {LogLevel.parse(level): limit for level, limit in level_limits.items()}
+        if dedupe_levels is not None:
+            dedupe_levels = [LogLevel.parse(level) for level in dedupe_levels]
+        cls.log_limiter.configure(window, level_limits, module_limits, dedupe_levels, dedupe_modules)
+    
     @classmethod
     def log_interaction(cls, text: str) -> None:
-        """Log user interaction."""
-        cls._write_log(f"<{os.getlogin()}> {str(text)}")
+        """Log user interaction (never rate limited)."""
+        cls._emit_log(LogRecord(LogLevel.INFO, "<{}> {}", (os.getlogin(), text), "ui", None, cls._log_target))
     
     @classmethod
-    def log_error(cls, text: str) -> None:
+    def log_debug(cls, text: str, *args: Any, module: Optional[str] = None, port: Any = None,
+                  limit: Optional[int] = None) -> None:
+        """Log debug message."""
+        if LogLevel.DEBUG >= cls.min_log_level:
+            cls._write_log(LogLevel.DEBUG, text, args, module, port, limit)
+    
+    @classmethod
+    def log_error(cls, text: str, *args: Any, module: Optional[str] = None, port: Any = None,
+                  limit: Optional[int] = None) -> None:
         """Log error message."""
-        cls._write_log("[-] " + str(text))
+        if LogLevel.ERROR >= cls.min_log_level:
+            cls._write_log(LogLevel.ERROR, text, args, module, port, limit)
     
     @classmethod
-    def log_warning(cls, text: str) -> None:
+    def log_warning(cls, text: str, *args: Any, module: Optional[str] = None, port: Any = None,
+                  limit: Optional[int] = None) -> None:
         """Log warning message."""
-        cls._write_log("[!] " + str(text))
+        if LogLevel.WARNING >= cls.min_log_level:
+            cls._write_log(LogLevel.WARNING, text, args, module, port, limit)
     
     @classmethod
-    def log_info(cls, text: str) -> None:
+    def log_info(cls, text: str, *args: Any, module: Optional[str] = None, port: Any = None,
+                  limit: Optional[int] = None) -> None:
         """Log informational message."""
-        cls._write_log("[*] " + str(text))
+        if LogLevel.INFO >= cls.min_log_level:
+            cls._write_log(LogLevel.INFO, text, args, module, port, limit)
     
     @classmethod
-    def log_success(cls, text: str) -> None:
+    def log_success(cls, text: str, *args: Any, module: Optional[str] = None, port: Any = None,
+                  limit: Optional[int] = None) -> None:
         """Log success message."""
-        cls._write_log("[+] " + str(text))
+        if LogLevel.SUCCESS >= cls.min_log_level:
+            cls._write_log(LogLevel.SUCCESS, text, args, module, port, limit)
     
     @classmethod
-    def _write_log(cls, text: str) -> None:
-        """Write message to logs."""
+    def _write_log(cls, level: LogLevel, template: str, args: tuple,
+                   module: Optional[str], port: Any, limit: Optional[int] = None) -> None:
+        """
+        Write a record to the logs.
+        
+        Does not block on file I/O or formatting: the record is handed to
+        the log pipeline, whose writer thread serializes it as JSON and
+        appends it to logs.jsonl in batches. Records from call sites with a
+        limit (passed as ``limit``, or configured for the module or level)
+        are held back by the rate limiter and reported in summary records.
+        """
         try:
-            with cls.logs_lock:
-                cls.logs.append(text)
-                
-                # Write to log file if path is set
-                if cls.path:
-                    log_file = os.path.join(cls.path, "logs.txt")
-                    with open(log_file, "a") as f:
-                        f.write(text + "\n")
-                        
+            record = LogRecord(level, template, args, module, port, cls._log_target)
+            allowed, summaries = cls.log_limiter.check(record, limit=limit)
+            for summary in summaries:
+                cls._emit_log(summary)
+            if allowed:
+                cls._emit_log(record)
         except Exception as e:
             pass
     
     @classmethod
-    def get_logs(cls) -> List[str]:
-        """Get all logged messages."""
-        return cls.logs
+    def _emit_log(cls, record: LogRecord) -> None:
+        """Store a record in memory and queue it for the log file."""
+        cls.logs.append(record)
+        cls.log_pipeline.submit(record)
+    
+    @classmethod
+    def flush_logs(cls) -> None:
+        """Write all queued log lines to the log file and close it."""
+        for summary in cls.log_limiter.flush():
+            cls._emit_log(summary)
+        stats = cls.log_pipeline.get_stats()
+        if stats["dropped"]:
+            cls.log_warning(f"Log pipeline dropped {stats['dropped']} records")
+        cls.log_pipeline.close()
+    
+    @classmethod
+    def get_log_stats(cls) -> Dict[str, int]:
+        """Get statistics of the log pipeline (queued, written, dropped, suppressed, ...)."""
+        stats = cls.log_pipeline.get_stats()
+        stats["suppressed"] = cls.log_limiter.suppressed_total
+        return stats
+    
+    @classmethod
+    def get_logs(
+        cls,
+        count: Optional[int] = None,
+        min_level: Optional[LogLevel] = None,
+        module: Optional[str] = None,
+    ) -> List[LogRecord]:
+        """
+        Get the most recent log records.
+        
+        Only the last ``logs.capacity`` records are kept in memory; use
+        get_log_page() to page back through older history on disk.
+        
+        Args:
+            count: Number of records to return, or None for all in memory
+            min_level: Only return records at or above this level
+            module: Only return records for this module
+            
+        Returns:
+            List of records, oldest first
+        """
+        return cls.logs.tail(count, predicate=cls._log_filter(min_level, module))
+    
+    @classmethod
+    def get_log_page(
+        cls,
+        page: int,
+        page_size: int,
+        min_level: Optional[LogLevel] = None,
+        module: Optional[str] = None,
+    ) -> List[LogRecord]:
+        """
+        Get a page of log history, counted back from the newest record.
+        
+        Pages that fit in the in-memory buffer are served from it; older
+        pages are read from logs.jsonl and its rotated backups via the
+        index. With a filter, pages count matching records only, in memory
+        and on disk alike; the disk is read once the matching records in
+        memory run out.
+        
+        Args:
+            page: Page number, 0 is the newest
+            page_size: Number of records per page
+            min_level: Only return records at or above this level
+            module: Only return records for this module
+            
+        Returns:
+            List of records, oldest first
+        """
+        predicate = cls._log_filter(min_level, module)
+        skip = page * page_size
+        in_memory = len(cls.logs)
+        if predicate is None:
+            if skip + page_size <= in_memory:
+                return cls.logs.tail(page_size, skip=skip)
+            # Reading the history writes the queued lines first
+            lines = cls.log_pipeline.read_history(skip, page_size)
+            if not lines:
+                return cls.logs.tail(page_size, skip=skip)
+            return [LogRecord.from_json(line) for line in lines]
+        
+        records = cls.logs.tail(page_size, skip=skip, predicate=predicate)
+        if len(records) == page_size:
+            return records
+        # The newest lines on disk are the records in memory; go on with older ones
+        matched = len(cls.logs.tail(predicate=predicate))
+        older = cls._read_log_history(in_memory, max(0, skip - matched), page_size - len(records), predicate)
+        return older + records
+    
+    @classmethod
+    def _read_log_history(cls, line_skip: int, skip: int, count: int, predicate) -> List[LogRecord]:
+        """
+        Read matching records from the log files, newest first.
+        
+        Args:
+            line_skip: Number of newest lines to pass over
+            skip: Number of matching records to skip after those
+            count: Number of matching records to return
+            predicate: Record filter
+            
+        Returns:
+            List of records, oldest first
+        """
+        found: List[LogRecord] = []
+        chunk = max(count, 1024)
+        while len(found) < count:
+            lines = cls.log_pipeline.read_history(line_skip, chunk)
+            if not lines:
+                break
+            line_skip += len(lines)
+            for line in reversed(lines):
+                record = LogRecord.from_json(line)
+                if not predicate(record):
+                    continue
+                if skip:
+                    skip -= 1
+                    continue
+                found.append(record)
+                if len(found) == count:
+                    break
+        found.reverse()
+        return found
+    
+    @staticmethod
+    def _log_filter(min_level: Optional[LogLevel], module: Optional[str]):
+        """Build a record predicate for the given filter, or None if unfiltered."""
+        if min_level is None and module is None:
+            return None
+        level = min_level if min_level is not None else LogLevel.DEBUG
+        return lambda record: record.matches(level, module)
@@ -0,0 +1,137 @@
+"""Resource-weighted admission control for the attack thread pool."""
+
+import collections
+import os
+from typing import Dict, Optional
+
+from pyautoenum.data.models import ModuleResources
+
+# Budgeted resources of the pool (fields of ModuleResources)
+RESOURCES = ("cpu", "net", "memory")
+
+# Seconds between admission rounds of the attack pool while tasks wait
+POLL_INTERVAL = 0.1
+
+# Tasks at or below these hints are cheap probes that are never held back
+CHEAP_SHARE = 0.1
+CHEAP_MEMORY_MB = 64.0
+
+
+def _default_memory_budget() -> Optional[float]:
+    """Half of the physical memory in megabytes, or None if unknown."""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / (2 * 1024 * 1024)
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+class AdmissionController:
+    """
+    Decides which queued tasks may start, based on their resource hints.
+
+    Each running task reserves its cpu, net and memory hints from the
+    pool's budgets and counts against its module's ``max_parallel``. A
+    task that asks for more than a whole budget is limited to the budget,
+    so it can still run on its own. Cheap probes (see CHEAP_SHARE) only
+    respect ``max_parallel`` and are never held back by heavy scans.
+
+    When a task has waited longer than ``starvation_timeout``, its
+    resources are reserved: other non-cheap tasks are only admitted if
+    they fit next to it, so a stream of medium tasks cannot starve a
+    heavy one.
+    """
+
+    def __init__(
+        self,
+        cpu: Optional[float] = None,
+        net: Optional[float] = 2.0,
+        memory: Optional[float] = None,
+        starvation_timeout: float = 60.0,
+    ):
+        """
+        Initialize the controller.
+
+        Args:
+            cpu: CPU budget in cores, defaults to the CPU count
+            net: Network budget (1.0 is one sustained network-heavy scanner), None for unlimited
+            memory: Memory budget in megabytes, defaults to half the physical memory
+            starvation_timeout: Seconds after which a waiting task reserves its resources
+        """
+        self.capacity: Dict[str, Optional[float]] = {
+            "cpu": float(cpu or os.cpu_count() or 1),
+            "net": net,
+            "memory": memory if memory is not None else _default_memory_budget(),
+        }
+        self.starvation_timeout = starvation_timeout
+        self.in_use: Dict[str, float] = dict.fromkeys(RESOURCES, 0.0)
+        self.running: collections.Counter = collections.Counter()
+
+    @staticmethod
+    def is_cheap(hints: ModuleResources) -> bool:
+        """Check whether hints describe a cheap probe."""
+        return hints.cpu <= CHEAP_SHARE and hints.net <= CHEAP_SHARE and hints.memory <= CHEAP_MEMORY_MB
+
+    def demand(self, hints: ModuleResources, resource: str) -> float:
+        """Get the amount of a resource a task reserves, limited to the budget."""
+        capacity = self.capacity[resource]
+        amount = getattr(hints, resource)
+        return amount if capacity is None else min(amount, capacity)
+
+    def fits(
+        self,
+        module_name: str,
+        hints: ModuleResources,
+        reserved: Optional[ModuleResources] = None,
+    ) -> bool:
+        """
+        Check whether a task may start now.
+
+        Args:
+            module_name: Name of the task's module
+            hints: Resource hints of the task
+            reserved: Hints of a starving task whose resources are held back
+
+        Returns:
+            Boolean indicating if the task may start
+        """
+        if hints.max_parallel is not None and self.running[module_name] >= hints.max_parallel:
+            return False
+        if self.is_cheap(hints):
+            return True
+
+        for resource in RESOURCES:
+            capacity = self.capacity[resource]
+            if capacity is None:
+                continue
+            need = self.demand(hints, resource)
+            if reserved is not None:
+                need += self.demand(reserved, resource)
+            if self.in_use[resource] + need > capacity + 1e-9:
+                return False
+        return True
+
+    def acquire(self, module_name: str, hints: ModuleResources) -> None:
+        """Reserve the resources of a starting task."""
+        self.running[module_name] += 1
+        for resource in RESOURCES:
+            self.in_use[resource] += self.demand(hints, resource)
+
+    def release(self, module_name: str, hints: ModuleResources) -> None:
+        """Return the resources of a finished task."""
+        self.running[module_name] -= 1
+        if self.running[module_name] <= 0:
+            del self.running[module_name]
+        for resource in RESOURCES:
+            self.in_use[resource] = max(0.0, self.in_use[resource] - self.demand(hints, resource))
+
+    def get_load(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """
+        Get the current usage of each budget.
+
+        Returns:
+            Dictionary of resource to {"used", "capacity"}
+        """
+        return {
+            resource: {"used": self.in_use[resource], "capacity": self.capacity[resource]}
+            for resource in RESOURCES
+        }
@@ -2,15 +2,18 @@
 
 import concurrent.futures
 import queue
-import subprocess
+import shlex
 import threading
 import time
 import traceback
 from dataclasses import dataclass
 from enum import Enum, auto
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from pyautoenum.config.manager import ConfigManager
+from pyautoenum.core.admission import POLL_INTERVAL, AdmissionController
+from pyautoenum.core.command import CommandStage, compile_stages, run_pipeline
+from pyautoenum.modules.registry import EXECUTOR_PYTHON, ModuleDispatch, module_registry
 
 
 class TaskStatus(Enum):
@@ -26,23 +29,76 @@ class AttackTask:
     """Represents a task to be executed by the thread pool."""
     module: Any
     port: Optional[Union[str, int]] = None
+    dispatch: Optional[ModuleDispatch] = None
+    resources: Any = None  # ModuleResources reserved while the task runs
     status: TaskStatus = TaskStatus.PENDING
     progress: float = 0.0
     start_time: float = 0.0
     end_time: float = 0.0
     output: str = ""
     error: str = ""
+    queued_time: float = 0.0
+
+
+# Task run by the current worker thread, for report_progress()
+_current = threading.local()
+
+
+def report_progress(percent: float) -> None:
+    """
+    Set the progress of the task running in the calling thread.
+    
+    Python modules call this to report their own progress; outside a
+    worker thread it does nothing.
+    
+    Args:
+        percent: Percentage done (kept below 100 until the task finishes)
+    """
+    task = getattr(_current, "task", None)
+    if task is not None:
+        task.progress = max(0.0, min(99.0, float(percent)))
+
+
+def current_output_file() -> str:
+    """
+    Get the output file of the module running in the calling thread.
+    
+    Python modules use it for the ``[outfile]`` placeholder of their
+    switches; outside a worker thread it is empty.
+    
+    Returns:
+        Path of the module's output file, or ""
+    """
+    task = getattr(_current, "task", None)
+    return task.module.output_file if task is not None else ""
+
+
+def stop_requested() -> bool:
+    """
+    Whether the attack thread pool is stopping.
+    
+    Long-running Python modules poll this to end early.
+    
+    Returns:
+        True once stop() was called on the pool
+    """
+    return attack_thread_pool._stop_event.is_set()
     
 
 class AttackThreadPool:
     """Thread pool for running attack modules against targets."""
     
-    def __init__(self, max_workers: Optional[int] = None):
+    def __init__(self, max_workers: Optional[int] = None, admission: Optional[AdmissionController] = None):
         """
         Initialize the attack thread pool.
         
+        Tasks start in queue order as long as their module's resource hints
+        fit the budgets of the admission controller; cheap probes may
+        overtake heavy tasks that are waiting for resources.
+        
         Args:
             max_workers: Maximum number of worker threads, defaults to (CPU count + 4)
+            admission: Admission controller, defaults to one with default budgets
         """
         # Use a slightly higher number of threads than CPU cores for I/O bound tasks
         self.max_workers = max_workers or (threading.active_count() + 4)
@@ -53,6 +109,8 @@ class AttackThreadPool:
         self.worker_thread = threading.Thread(target=self._process_queue, daemon=True)
         self.lock = threading.RLock()
         self._stop_event = threading.Event()
+        self.admission = admission or AdmissionController()
+        self._waiting: List[str] = []  # Queued task ids waiting for resources, in order
         
         # Statistics tracking
         self.stats = {
@@ -94,6 +152,10 @@ class AttackThreadPool:
             self.running = False
             # 
             ConfigManager.log_info("Attack thread pool stopping...")
+        # Scans would otherwise keep running (and holding their share of the
+        # scan budget) until nmap is done on its own
+        from pyautoenum.utils.nmap_stream import terminate_running
+        terminate_running()
     
     def add_task(self, module: Any, port: Optional[Union[str, int]] = None) -> str:
         """
@@ -109,12 +171,16 @@ class AttackThreadPool:
         task_id = f"{module.name}_{port if port else 'target'}"
         
         with self.lock:
-            # Check if task is already in queue
-            if task_id in self.tasks:
+            # Check if task is already queued or running; finished tasks may
+            # be scheduled again (e.g. after the module definition changed)
+            existing = self.tasks.get(task_id)
+            if existing and existing.status in (TaskStatus.PENDING, TaskStatus.RUNNING):
                 return task_id
                 
             # Create new task
-            task = AttackTask(module=module, port=port)
+            task = AttackTask(
+                module=module, port=port, dispatch=self._get_dispatch(module), queued_time=time.time()
+            )
             self.tasks[task_id] = task
             self.task_queue.put(task_id)
             
@@ -122,10 +188,57 @@ class AttackThreadPool:
             self.stats["pending"] += 1
             self.stats["total"] += 1
             
-            ConfigManager.log_info(f"Added task to queue: {module.name} for {'port ' + str(port) if port else 'target'}")
+            ConfigManager.log_debug(
+                "Added task to queue: {} for {}", module.name, f"port {port}" if port else "target",
+                module=module.name, port=port,
+            )
             
         return task_id
     
+    def active_ports(self, module_name: str) -> List[str]:
+        """
+        Get the ports a module is currently running against.
+        
+        Args:
+            module_name: Name of the module
+            
+        Returns:
+            List of ports ("target" for target-wide tasks)
+        """
+        with self.lock:
+            return [
+                str(task.port) if task.port else "target"
+                for task in self.tasks.values()
+                if task.module.name == module_name and task.status == TaskStatus.RUNNING
+            ]
+    
+    def replace_pending(self, module_name: str, module: Optional[Any] = None) -> int:
+        """
+        Swap the module of queued tasks, or cancel them. Running tasks are not touched.
+        
+        Args:
+            module_name: Name of the module
+            module: New module definition, or None to cancel the queued tasks
+            
+        Returns:
+            Number of queued tasks affected
+        """
+        with self.lock:
+            pending = [
+                (task_id, task) for task_id, task in self.tasks.items()
+                if task.module.name == module_name and task.status == TaskStatus.PENDING
+            ]
+            for task_id, task in pending:
+                if module is None:
+                    # The queue worker skips task ids that are gone
+                    del self.tasks[task_id]
+                    self.stats["pending"] -= 1
+                    self.stats["total"] -= 1
+                else:
+                    task.module = module
+                    task.dispatch = self._get_dispatch(module)
+            return len(pending)
+    
     def get_task_status(self, task_id: str) -> Optional[TaskStatus]:
         """
         Get the status of a task.
@@ -157,40 +270,68 @@ class AttackThreadPool:
         
         while not self._stop_event.is_set():
             try:
-                # Get a task from the queue with a timeout
+                # Get new tasks from the queue; poll faster while tasks wait for resources
                 try:
                     # 
-                    task_id = self.task_queue.get(timeout=1.0)
-                    
+                    task_id = self.task_queue.get(timeout=POLL_INTERVAL if self._waiting else 1.0)
+                    self._waiting.append(task_id)
+                    while True:
+                        self._waiting.append(self.task_queue.get_nowait())
                 except queue.Empty:
-                    continue
+                    pass
                 
-                # Get the task
-                with self.lock:
-                    task = self.tasks.get(task_id)
-                    if not task:
-                        
-                        self.task_queue.task_done()
-                        continue
+                for task_id in self._admit_waiting():
+                    # Submit task to thread pool
+                    future = self.executor.submit(self._execute_task, task_id)
                     
-                    # Update task status
-                    
-                    task.status = TaskStatus.RUNNING
-                    task.start_time = time.time()
-                    self.stats["pending"] -= 1
-                    self.stats["running"] += 1
-                
-                # Submit task to thread pool
-                future = self.executor.submit(self._execute_task, task_id)
-                
-                # Register callback for task completion
-                future.add_done_callback(lambda f, tid=task_id: self._task_done(tid, f))
+                    # Register callback for task completion
+                    future.add_done_callback(lambda f, tid=task_id: self._task_done(tid, f))
                 
             except Exception:
                 ConfigManager.log_error(
                     f"Exception in thread pool worker: {traceback.format_exc()}"
                 )
     
+    def _admit_waiting(self) -> List[str]:
+        """
+        Start the waiting tasks whose resource hints fit the budgets.
+        
+        Returns:
+            IDs of the tasks to submit, now marked as running
+        """
+        admitted = []
+        now = time.time()
+        with self.lock:
+            reserved = None
+            remaining = []
+            for task_id in self._waiting:
+                task = self.tasks.get(task_id)
+                if not task or task.status != TaskStatus.PENDING:
+                    # Cancelled, or queued twice after being re-added
+                    self.task_queue.task_done()
+                    continue
+                
+                hints = task.module.resources
+                if self.stats["running"] >= self.max_workers or not self.admission.fits(
+                    task.module.name, hints, reserved
+                ):
+                    remaining.append(task_id)
+                    # Hold back resources for a task that waited too long
+                    if reserved is None and now - task.queued_time > self.admission.starvation_timeout:
+                        reserved = hints
+                    continue
+                
+                # Update task status
+                self.admission.acquire(task.module.name, hints)
+                task.resources = hints
+                task.status = TaskStatus.RUNNING
+                task.start_time = now
+                self.stats["pending"] -= 1
+                self.stats["running"] += 1
+                admitted.append(task_id)
+            self._waiting = remaining
+        return admitted
+    
     def _execute_task(self, task_id: str) -> bool:
         """
         Execute a task.
@@ -207,7 +348,7 @@ class AttackThreadPool:
                 return False
                 
         try:
-            ConfigManager.log_info(f"Started Module: {task.module.name}")
+            ConfigManager.log_info("Started Module: {}", task.module.name, module=task.module.name, port=task.port)
             
             # Ensure target_info is available before proceeding
             if not ConfigManager.target_info:
@@ -216,18 +357,24 @@ class AttackThreadPool:
                 return False
             
             # Mark module as completed in TargetInfo
-            ConfigManager.target_info.mark_module_as_run(task.port, task.module.name)
+            ConfigManager.target_info.mark_module_as_run(
+                task.port, task.module.name, task.module.fingerprint
+            )
             
-            # Check if the command is a Python function
-            func = self._get_callable_func(task.module.command)
-            if func:
+            # Dispatch on the executor resolved at load time
+            dispatch = task.dispatch
+            if dispatch and dispatch.executor == EXECUTOR_PYTHON:
                 # Run Python function
-                task.output = func(ConfigManager.target_info, task.port, task.module.switches)
+                _current.task = task
+                try:
+                    task.output = dispatch.func(ConfigManager.target_info, task.port, task.module.switches)
+                finally:
+                    _current.task = None
             else:
                 # Run external command
                 task.output = self._run_external_command(task)
             
-            ConfigManager.log_success(f"Finished Module: {task.module.name}")
+            ConfigManager.log_success("Finished Module: {}", task.module.name, module=task.module.name, port=task.port)
             
             # Run analysis if needed
             if task.module.analyse_func:
@@ -255,6 +402,9 @@ class AttackThreadPool:
                 
             task.end_time = time.time()
             self.stats["running"] -= 1
+            if task.resources is not None:
+                self.admission.release(task.module.name, task.resources)
+                task.resources = None
             
             # Update task status based on success/failure
             try:
@@ -277,97 +427,95 @@ class AttackThreadPool:
                 
             self.task_queue.task_done()
     
-    def _get_callable_func(self, cmd: str) -> Optional[Callable]:
+    def _get_dispatch(self, module: Any) -> Optional[ModuleDispatch]:
         """
-        Get a callable function from module name.
+        Get the dispatch entry of a module.
+        
+        Modules loaded by ConfigManager carry one already; others are
+        resolved here once.
         
         Args:
-            cmd: Function name
+            module: Module to run
             
         Returns:
-            Callable function or None
+            ModuleDispatch or None if the command cannot be resolved
         """
-        # Try to find function in modules.custom
-        from pyautoenum.modules import custom
-        if hasattr(custom, cmd) and callable(getattr(custom, cmd)):
-            return getattr(custom, cmd)
+        dispatch = getattr(module, "dispatch", None)
+        if dispatch is None:
+            dispatch = module_registry.build_dispatch(module.command, module.analyse_func)
+            module.dispatch = dispatch
+        return dispatch
+    
+    def _get_stages(self, task: AttackTask) -> Tuple[CommandStage, ...]:
+        """
+        Get the compiled command stages of a task's module.
+        
+        Args:
+            task: The task containing the module
             
-        return None
+        Returns:
+            Tuple of CommandStage, the module command first
+        """
+        stages = getattr(task.module, "stages", None)
+        if stages is None:
+            executable = task.dispatch.executable if task.dispatch else ""
+            stages = compile_stages(task.module, executable)
+            task.module.stages = stages
+        return stages
     
     def _run_external_command(self, task: AttackTask) -> str:
-        """Run an external command and capture output to a file."""
+        """Run an external command (or pipeline) and stream its output to a file."""
         try:
-            # Format command with arguments
-            cmd = [task.module.command] + self._format_switches(task)
-            cmd_str = " ".join(cmd)
-            ConfigManager.log_info(f"Running command: {cmd_str}")
-            
-            # Execute command with progress monitoring
-            process = subprocess.Popen(
-                cmd, 
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
+            # Build argv of every stage from the compiled templates
+            values = self._template_values(task)
+            argvs = [[stage.executable] + stage.template.render(values) for stage in self._get_stages(task)]
+            ConfigManager.log_info(
+                "Running command: {}", " | ".join(shlex.join(argv) for argv in argvs),
+                module=task.module.name, port=task.port,
             )
             
-            output = []
-            # Poll the process and update progress
-            if process.stdout:
-                while True:
-                    line = process.stdout.readline()
-                    if not line and process.poll() is not None:
-                        break
-                    if line:
-                        output.append(line)
-                        with self.lock:
-                            # Update progress based on output lines as a rough estimate
-                            task.progress = min(99.0, task.progress + 0.5)
-            
-            process.wait()
+            expected_runtime = task.module.resources.expected_runtime
             
-            # Write output to file
-            with open(task.module.output_file, "w") as outfile:
-                outfile.write("".join(output))
+            def on_line(line: str) -> None:
+                with self.lock:
+                    if expected_runtime:
+                        # Estimate progress from the declared runtime
+                        elapsed = time.time() - task.start_time
+                        task.progress = min(99.0, 100.0 * elapsed / expected_runtime)
+                    else:
+                        # Update progress based on output lines as a rough estimate
+                        task.progress = min(99.0, task.progress + 0.5)
             
-            return "".join(output)
+            return run_pipeline(argvs, task.module.output_file, on_line)
                 
         except Exception as e:
             error_msg = f"Error running command {task.module.command}: {str(e)}"
             ConfigManager.log_error(error_msg)
             return error_msg
     
-    def _format_switches(self, task: AttackTask) -> List[str]:
+    def _template_values(self, task: AttackTask) -> Dict[str, str]:
         """
-        Format command-line switches with target-specific values.
+        Get the values of the switch placeholders for a task.
         
         Args:
             task: The task containing the module and port
             
         Returns:
-            List of formatted command-line switches
+            Dictionary of placeholder name to value
         """
-        if not ConfigManager.target_info:
-            return []
-            
-        port_data = ConfigManager.target_info.get_port(task.port)
-        hostname = ConfigManager.target_info.get_host()
+        snapshot = ConfigManager.target_info.snapshot()
+        port_data = snapshot.get_port(task.port)
         
-        return [
-            switch.replace(
-                "[protocol]",
-                port_data.protocol if port_data else f"port_{task.port}_no_data",
-            )
-            .replace("[hostname]", hostname)
-            .replace("[port]", str(task.port) if task.port else "")
-            .replace("[outfile]", task.module.output_file)
-            for switch in task.module.switches
-        ]
+        return {
+            "protocol": port_data.protocol if port_data else f"port_{task.port}_no_data",
+            "hostname": snapshot.get_host(),
+            "port": str(task.port) if task.port else "",
+            "outfile": task.module.output_file,
+        }
     
     def _process_analysis(self, task: AttackTask) -> None:
         """Handle analysis of the output after execution."""
-        analyse_func = self._get_callable_func(task.module.analyse_func)
+        analyse_func = task.dispatch.analyzer if task.dispatch else None
         if analyse_func:
             try:
                 if not ConfigManager.target_info:
@@ -376,7 +524,7 @@ class AttackThreadPool:
                     return
                     
                 analyse_func(ConfigManager.target_info, task.output)
-                ConfigManager.log_info(f"Analysis completed for {task.module.name}")
+                ConfigManager.log_info("Analysis completed for {}", task.module.name, module=task.module.name, port=task.port)
             except Exception as e:
                 error_msg = f"Error in analysis for {task.module.name}: {str(e)}"
                 task.error = error_msg
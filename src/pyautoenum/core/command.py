@@ -0,0 +1,160 @@
+"""Compiled command templates and process pipelines for external modules."""
+
+import os
+import re
+import shlex
+import shutil
+import subprocess
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+# Reserved placeholders of modules.yml switches
+PLACEHOLDERS = ("protocol", "hostname", "port", "outfile")
+_PLACEHOLDER_RE = re.compile(r"\[(" + "|".join(PLACEHOLDERS) + r")\]")
+
+
+class SwitchTemplate:
+    """
+    argv builder compiled from the switches of a module.
+
+    Each switch is split into arguments with shell quoting rules once,
+    so ``"-z file,/path"`` becomes two arguments and quotes around
+    ``'[protocol]://[hostname]:[port]'`` are removed. Placeholders are
+    substituted per argument when rendering, so values containing spaces
+    never split an argument.
+    """
+
+    __slots__ = ("tokens",)
+
+    def __init__(self, switches: Sequence[Any]):
+        """
+        Compile switches.
+
+        Args:
+            switches: Switches from modules.yml
+
+        Raises:
+            ValueError: If a switch has unbalanced quotes
+        """
+        tokens: List[Any] = []
+        for switch in switches:
+            for token in shlex.split(str(switch)):
+                parts = _PLACEHOLDER_RE.split(token)
+                # Literal arguments are kept as str, templated ones as a tuple
+                # alternating literal text and placeholder names
+                tokens.append(token if len(parts) == 1 else tuple(parts))
+        self.tokens: Tuple[Any, ...] = tuple(tokens)
+
+    def render(self, values: Dict[str, str]) -> List[str]:
+        """
+        Build the argument list.
+
+        Args:
+            values: Placeholder name to value
+
+        Returns:
+            List of arguments
+        """
+        return [
+            token if token.__class__ is str
+            else "".join(values[part] if i % 2 else part for i, part in enumerate(token))
+            for token in self.tokens
+        ]
+
+
+class CommandStage(NamedTuple):
+    """One process of a module's pipeline."""
+    executable: str
+    template: SwitchTemplate
+
+
+def compile_stages(
+    module: Any, executable: str = "", resolved: Optional[Mapping[str, str]] = None
+) -> Tuple[CommandStage, ...]:
+    """
+    Compile a module's command and pipeline into stages.
+
+    Args:
+        module: Module with command, switches and pipeline
+        executable: Resolved path of the module command, if known
+        resolved: Resolved paths of stage commands (e.g. from the module
+            catalog); stages not in it are looked up on PATH
+
+    Returns:
+        Tuple of stages, the module command first
+
+    Raises:
+        ValueError: If a switch has unbalanced quotes
+    """
+    stages = [CommandStage(executable or module.command, SwitchTemplate(module.switches))]
+    for stage in getattr(module, "pipeline", None) or []:
+        command = stage.get("command", "")
+        path = resolved.get(command) if resolved is not None else None
+        stages.append(CommandStage(
+            path or shutil.which(command) or command,
+            SwitchTemplate(stage.get("switches") or []),
+        ))
+    return tuple(stages)
+
+
+def run_pipeline(
+    argvs: Sequence[List[str]],
+    output_file: str,
+    on_line: Optional[Callable[[str], None]] = None,
+) -> str:
+    """
+    Run processes connected with OS pipes and stream the output to a file.
+
+    Each process reads the previous one's stdout directly, without a shell
+    or a copy through Python. Output and errors of the last process are
+    written to output_file as they arrive; errors of earlier processes go
+    to ``<output_file>.stderr``.
+
+    Args:
+        argvs: Argument lists, one per process
+        output_file: File receiving the output of the last process
+        on_line: Called for every output line, e.g. to update progress
+
+    Returns:
+        Output of the last process
+    """
+    processes: List[subprocess.Popen] = []
+    error_file = None
+    output: List[str] = []
+    try:
+        if len(argvs) > 1:
+            error_file = open(f"{output_file}.stderr", "wb")
+
+        stdin = None
+        for number, argv in enumerate(argvs):
+            last = number == len(argvs) - 1
+            process = subprocess.Popen(
+                argv,
+                stdin=stdin,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT if last else error_file,
+                text=last,
+                bufsize=1 if last else -1,
+            )
+            # Only the next process keeps the read end, so EOF and SIGPIPE propagate
+            if stdin is not None:
+                stdin.close()
+            stdin = process.stdout
+            processes.append(process)
+
+        with open(output_file, "w") as outfile:
+            for line in processes[-1].stdout:
+                outfile.write(line)
+                output.append(line)
+                if on_line:
+                    on_line(line)
+    finally:
+        for process in processes:
+            if process.stdout and not process.stdout.closed:
+                process.stdout.close()
+            process.wait()
+        if error_file:
+            error_file.close()
+            if os.path.getsize(error_file.name) == 0:
+                os.remove(error_file.name)
+
+    return "".join(output)
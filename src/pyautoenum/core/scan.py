@@ -1,15 +1,17 @@
 """Core scanning functionality for PyAutoEnum."""
 
+import asyncio
 import threading
 import time
 import traceback
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Sequence
 
 from pyautoenum.config.manager import ConfigManager
 from pyautoenum.core.attack_thread import attack_thread_pool
-from pyautoenum.data.models import PortData
-from pyautoenum.modules.custom import check_open_ports
+from pyautoenum.utils.http_cache import response_cache
+from pyautoenum.utils.liveness import DEFAULT_PORTS
 from pyautoenum.utils.network import check_target_up
+from pyautoenum.utils.portscan import ALL_PORTS, ConnectScanner, parse_ports, service_name
 
 
 class ScanManager:
@@ -17,10 +19,37 @@ class ScanManager:
     Manages the scanning process for a given target.
     """
     
-    def __init__(self):
-        """Initialize the scan manager."""
+    def __init__(
+        self,
+        rescan: bool = False,
+        max_age: Optional[float] = None,
+        watch_modules: bool = False,
+        ports: str = ALL_PORTS,
+        alive_ports: Sequence[int] = DEFAULT_PORTS,
+    ):
+        """
+        Initialize the scan manager.
+        
+        Args:
+            rescan: Re-run discovery against a saved session and only re-run
+                modules whose service changed or whose results expired
+            max_age: Maximum age of stored module results in seconds, or None
+            watch_modules: Reload modules.yml whenever it changes, and keep
+                waiting for changes after all modules finished
+            ports: TCP ports for discovery, e.g. "1-1024,8080"
+            alive_ports: TCP ports probed by the liveness check
+        """
         # 
+        self._ports = parse_ports(ports)
+        self._alive_ports = alive_ports
+        self._rescan = rescan
+        self._max_age = max_age
+        self._watch_modules = watch_modules
         self._stop_requested = False
+        self._cancelled = False
+        self._complete = False
+        self._loop_active = False
+        self._loop_lock = threading.Lock()
         self._discovery_complete = False
         self._target = ""
         self._scan_stats = {
@@ -54,7 +83,7 @@ class ScanManager:
             "modules_total": pool_stats["total"],
             "elapsed_time": elapsed,
             "target": self._target,
-            "total_ports": len(ConfigManager.target_info.ports) if ConfigManager.target_info else 0,
+            "total_ports": len(ConfigManager.target_info.snapshot().ports) if ConfigManager.target_info else 0,
         })
         
         # Calculate progress percentage
@@ -88,42 +117,112 @@ class ScanManager:
 
         
         ConfigManager.log_info(f"Starting enumeration for {self._target}")
+        # Responses of an earlier scan in this process may be outdated
+        response_cache.clear()
         self._scan_stats["discovery_status"] = "Checking target availability"
 
-        # Check if target can be pinged
+        # Check if target answers a ping or a TCP connect
         
-        if not check_target_up(self._target):
+        if not check_target_up(self._target, ports=self._alive_ports):
             
-            ConfigManager.log_warning(f"Target {self._target} did NOT respond to ping")
-            self._scan_stats["discovery_status"] = "Target did not respond to ping, continuing anyway"
+            ConfigManager.log_warning(f"Target {self._target} did NOT respond to ping or TCP probes")
+            self._scan_stats["discovery_status"] = "Target did not respond to probes, continuing anyway"
         else:
             # 
             ConfigManager.log_success("Target is up")
             self._scan_stats["discovery_status"] = "Target is up, performing port discovery"
 
-        # If no open ports exist yet, perform an NMAP scan
+        # If no open ports exist yet (or a re-scan was requested), run port discovery.
+        # Ports of a new session are scheduled while discovery is still running.
         # 
-        if not ConfigManager.target_info.ports:
-            # 
-            nmap_args = ["-Pn", "-F", "-T4"]
-            ConfigManager.log_info(f"Started fast NMAP scan (nmap {self._target} {' '.join(nmap_args)})")
-            
-            nmap_results = check_open_ports(ConfigManager.target_info, None, nmap_args)
-            
-            if nmap_results:
-                # 
-                ConfigManager.target_info.merge(nmap_results)
+        has_session = bool(ConfigManager.target_info.ports)
+        if not has_session or self._rescan:
+            threading.Thread(target=self._run_discovery, args=(has_session,), daemon=True).start()
+        else:
+            self._scan_stats["discovery_status"] = "Using ports of the saved session, scanning services"
+            self._discovery_complete = True
 
         # Start the thread pool
         # 
         attack_thread_pool.start()
         # 
+
+        with self._loop_lock:
+            self._loop_active = True
+        self._scan_loop()
+    
+    def _run_discovery(self, has_session: bool) -> None:
+        """
+        Find open TCP ports with the connect scanner.
+        
+        Each open port of a new session is added to the target as soon as
+        it answers, so its modules start right away. In a re-scan the
+        results are reconciled with the saved session at the end. The
+        protocol is left empty: the conventional service name of a port
+        number is only a guess, so it is logged but not stored. Protocols
+        and versions are detected by check_for_http and the full_nmap
+        module, which only scans the ports found here.
+        
+        Args:
+            has_session: Whether the target already has saved ports
+        """
+        scanner = ConnectScanner()
+        found: Dict[str, Dict[str, Any]] = {}
+        ConfigManager.log_info(
+            "Started TCP connect scan of {} ports on {}", len(self._ports), self._target
+        )
+        
+        async def discover() -> None:
+            async for port in scanner.scan(self._target, self._ports):
+                port_data = {
+                    "protocol": "",
+                    "product": "",
+                    "version": "",
+                    "modules": [],
+                    "hostnames": [],
+                    "infos": {},
+                }
+                found[str(port)] = port_data
+                ConfigManager.log_success(
+                    "Discovered port {}/tcp (probably {})", port, service_name(port) or "unknown",
+                    module="discovery", port=port,
+                )
+                if not has_session:
+                    ConfigManager.target_info.merge({str(port): port_data})
+        
+        start = time.time()
+        completed = False
+        try:
+            asyncio.run(discover())
+            completed = True
+        except OSError as e:
+            ConfigManager.log_error("Port discovery failed: {}", e)
+        elapsed = time.time() - start
+        stats = scanner.get_stats()
+        ConfigManager.log_info(
+            "Connect scan finished in {:.1f}s: {} open, {} closed, {} filtered ({} retries, timeout {:.2f}s)",
+            elapsed, stats["open"], stats["closed"], stats["filtered"], stats["retries"], stats["timeout"],
+        )
+        
+        # No open ports is a result too: every stored port in the range closed.
+        # A failed discovery says nothing about them.
+        if has_session and completed:
+            self._apply_rescan(found)
         self._scan_stats["discovery_status"] = "Port discovery complete, scanning services"
         self._discovery_complete = True
-        # 
-
-        # Main scanning loop
-        while not self._stop_requested:
+    
+    def _scan_loop(self) -> None:
+        """Schedule modules until all finished (or until stopped when watching modules.yml)."""
+        while True:
+            with self._loop_lock:
+                if self._stop_requested:
+                    self._loop_active = False
+                    return
+            
+            # Pick up edits of modules.yml (one stat call per iteration)
+            if self._watch_modules and ConfigManager().modules_file_changed():
+                self.reload_modules()
+            
             # Check modules that match requirements and start them
             self._check_and_start_modules()
             
@@ -134,14 +233,103 @@ class ScanManager:
             # If stop requested, break out of the loop
             if self._stop_requested:
                 # 
-                break
+                continue
                 
             # Wait before next iteration
             time.sleep(1)
     
+    def reload_modules(self) -> Optional[Dict[str, List[str]]]:
+        """
+        Reload modules.yml and schedule only what changed.
+        
+        New modules run against the existing ports. Changed modules run
+        again, except where they are running right now; queued tasks take
+        the new definition. Queued tasks of removed modules are cancelled.
+        Discovery is not repeated.
+        
+        Returns:
+            Dictionary with the "added", "changed" and "removed" module names,
+            or None if modules.yml could not be loaded
+        """
+        changes = ConfigManager().reload_modules()
+        if changes is None:
+            return None
+        
+        modules = {module.name: module for module in ConfigManager.modules}
+        for name in changes["changed"]:
+            attack_thread_pool.replace_pending(name, modules[name])
+            if ConfigManager.target_info:
+                ConfigManager.target_info.forget_module(
+                    name, keep_ports=attack_thread_pool.active_ports(name)
+                )
+        for name in changes["removed"]:
+            attack_thread_pool.replace_pending(name, None)
+        
+        if any(changes.values()):
+            ConfigManager.log_info(
+                "Reloaded modules: {} added, {} changed, {} removed",
+                ", ".join(changes["added"]) or "none",
+                ", ".join(changes["changed"]) or "none",
+                ", ".join(changes["removed"]) or "none",
+            )
+            self.resume()
+        else:
+            ConfigManager.log_info("Reloaded modules: no changes")
+        return changes
+    
+    def resume(self) -> None:
+        """Restart the scheduling loop if it finished, e.g. after new modules were loaded."""
+        if self._cancelled or not self._discovery_complete:
+            return
+        with self._loop_lock:
+            self._stop_requested = False
+            self._complete = False
+            if self._loop_active:
+                return
+            self._loop_active = True
+        threading.Thread(target=self._scan_loop, daemon=True).start()
+    
+    def _apply_rescan(self, nmap_results: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Reconcile discovery results with the saved session.
+        
+        Discovery does not detect service versions, so target-wide modules
+        that wait for discovery (the full_nmap version scan) run again; the
+        version scan then merges its results and invalidates the modules of
+        ports whose service changed (see TargetInfo.merge).
+        
+        Args:
+            nmap_results: Port data from the discovery scan
+        """
+        target_info = ConfigManager.target_info
+        scanned = {str(port) for port in self._ports}
+        closed = sorted(
+            (port for port in target_info.snapshot().ports if port in scanned and port not in nmap_results),
+            key=int,
+        )
+        invalidated = target_info.apply_rescan(
+            nmap_results, ConfigManager.modules, self._max_age, scanned=scanned
+        )
+        count = sum(len(names) for names in invalidated.values())
+        ConfigManager.log_info(
+            f"Re-scan: {count} module results on {len(invalidated)} ports are stale, "
+            "keeping all other stored results"
+        )
+        for port, names in invalidated.items():
+            ConfigManager.log_info(f"Re-scan: port {port} re-runs {', '.join(names)}")
+        if closed:
+            ConfigManager.log_warning(
+                "Re-scan: ports {} no longer answer and were removed", ", ".join(closed)
+            )
+        
+        for module in ConfigManager.modules:
+            if not module.needs_port() and "discovery_complete" in module.requirements:
+                target_info.forget_module(module.name)
+    
     def stop(self):
         """Request scan to stop."""
         # 
+        self._cancelled = True
         self._stop_requested = True
         # 
         attack_thread_pool.stop()
@@ -155,11 +343,14 @@ class ScanManager:
             
         tasks_added = False
         
+        # Work on a consistent snapshot while worker threads keep writing
+        snapshot = ConfigManager.target_info.snapshot()
+        
         for module in ConfigManager.modules:
             # Process port-specific modules
             if module.needs_port():
                 
-                for port, port_data in ConfigManager.target_info.ports.items():
+                for port, port_data in snapshot.ports.items():
                     # Skip if module already run on this port
                     if module.name in port_data.modules:
                         
@@ -182,12 +373,11 @@ class ScanManager:
             else:
                 # Target-wide module (no specific port)
                 
-                
                 # Ensure target port exists
                 self._ensure_target_port_exists()
                 
                 # Skip if module already run on the target (stored in a special "target" port)
-                if "target" in ConfigManager.target_info.ports and module.name in ConfigManager.target_info.ports["target"].modules:
+                if ConfigManager.target_info.check_module_finished("target", module.name):
                     
                     continue
                     
@@ -201,9 +391,9 @@ class ScanManager:
                 attack_thread_pool.add_task(module)
                 
                 # Mark target-wide module as being run
-                if "target" in ConfigManager.target_info.ports:
-                    ConfigManager.target_info.ports["target"].modules.append(module.name)
-                    
+                ConfigManager.target_info.mark_module_as_run(
+                    "target", module.name, module.fingerprint
+                )
                     
                 tasks_added = True
                     
@@ -219,18 +409,29 @@ class ScanManager:
                 (self._scan_stats["modules_completed"] / self._scan_stats["modules_total"]) * 100
             )
             
-        # If no new tasks were added and all tasks are complete, mark discovery complete
-        if not tasks_added and attack_thread_pool.stats["running"] == 0 and attack_thread_pool.stats["pending"] == 0:
-            if not self._stop_requested:
+        if tasks_added:
+            self._complete = False
+        
+        # If discovery is done, no new tasks were added and all tasks are complete, mark the scan complete
+        if self._discovery_complete and not tasks_added \
+                and attack_thread_pool.stats["running"] == 0 and attack_thread_pool.stats["pending"] == 0:
+            if not self._stop_requested and not self._complete:
                 # 
                 if ConfigManager.ui_interface:
                     ConfigManager.ui_interface.set_status("Scan complete")
                 
                 # Save final results
                 ConfigManager.target_info.save_to_file()
+                cache_stats = response_cache.get_stats()
+                ConfigManager.log_debug(
+                    "HTTP response cache: {} hits, {} misses, {} pages parsed ({} reused)",
+                    cache_stats["hits"], cache_stats["misses"], cache_stats["parsed"], cache_stats["parse_hits"],
+                )
                 
-                # Mark scan as finished
-                self._stop_requested = True
+                # Mark scan as finished (keep watching modules.yml if asked to)
+                self._complete = True
+                if not self._watch_modules:
+                    self._stop_requested = True
                 # 
 
     def _ensure_target_port_exists(self):
@@ -239,9 +440,7 @@ class ScanManager:
             # 
             return
             
-        if "target" not in ConfigManager.target_info.ports:
-            # 
-            ConfigManager.target_info.ports["target"] = PortData()
+        ConfigManager.target_info.ensure_port("target")
 
 
 class ScanThread(threading.Thread):
@@ -249,11 +448,29 @@ class ScanThread(threading.Thread):
     Manages a scanning process in a separate thread using a ScanManager.
     """
 
-    def __init__(self):
-        """Initialize the scan thread."""
+    def __init__(
+        self,
+        rescan: bool = False,
+        max_age: Optional[float] = None,
+        watch_modules: bool = False,
+        ports: str = ALL_PORTS,
+        alive_ports: Sequence[int] = DEFAULT_PORTS,
+    ):
+        """
+        Initialize the scan thread.
+        
+        Args:
+            rescan: Run the scan in incremental re-scan mode
+            max_age: Maximum age of stored module results in seconds, or None
+            watch_modules: Reload modules.yml whenever it changes
+            ports: TCP ports for discovery
+            alive_ports: TCP ports probed by the liveness check
+        """
         super().__init__()
         # 
-        self.scan_manager = ScanManager()
+        self.scan_manager = ScanManager(
+            rescan=rescan, max_age=max_age, watch_modules=watch_modules, ports=ports, alive_ports=alive_ports
+        )
         # 
         self.finished = False
         self.daemon = True
@@ -1,9 +1,194 @@
 """Data model definitions for PyAutoEnum."""
 
+import hashlib
 import json
 import os
+import threading
+import time
+from collections.abc import Mapping as AbcMapping
+from collections.abc import MutableSet
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from types import MappingProxyType
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+
+def service_fingerprint(data: Dict[str, Any]) -> str:
+    """
+    Compute a fingerprint of the service reported by port discovery.
+
+    Args:
+        data: Port data dictionary with protocol, product and version
+
+    Returns:
+        Short hex digest identifying the service
+    """
+    key = "|".join(
+        str(data.get(field) or "") for field in ("protocol", "product", "version")
+    )
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def _freeze(value: Any) -> Any:
+    """Deep-freeze a value: dicts become read-only mappings, lists and sets tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple, set, frozenset, OrderedSet)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Turn a frozen value back into plain dicts and lists."""
+    if isinstance(value, AbcMapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def scan_fingerprint(data: Dict[str, Any]) -> str:
+    """
+    Get the service fingerprint of scan data, if it comes from a version scan.
+
+    Args:
+        data: Port data dictionary
+
+    Returns:
+        The data's "fingerprint", the fingerprint of its product and
+        version if it has either, or "" for discovery-only data
+    """
+    if data.get("fingerprint"):
+        return data["fingerprint"]
+    if data.get("product") or data.get("version"):
+        return service_fingerprint(data)
+    return ""
+
+
+def _service_changed(port_data: "PortData", data: Dict[str, Any]) -> bool:
+    """
+    Check whether version scan data describes a different service.
+
+    A stored fingerprint always comes from a version scan, so it is
+    compared directly. Without one (discovery only, or an older session)
+    only a known product or version that differs counts as a change.
+    """
+    if port_data.fingerprint:
+        return port_data.fingerprint != scan_fingerprint(data)
+    known = (port_data.product, port_data.version)
+    return any(known) and known != (data.get("product", ""), data.get("version", ""))
+
+
+class OrderedSet(MutableSet):
+    """
+    Set that remembers insertion order.
+
+    Backed by a dict so membership tests and inserts are O(1) while
+    iteration and serialization keep the order items were added in.
+    Provides ``append``/``extend`` so it can stand in for the lists
+    previously used for hostnames and modules.
+    """
+
+    __slots__ = ("_items",)
+
+    def __init__(self, iterable: Optional[Iterable[Any]] = None):
+        """
+        Initialize the set.
+
+        Args:
+            iterable: Optional initial items, duplicates are dropped
+        """
+        self._items: Dict[Any, None] = dict.fromkeys(iterable) if iterable else {}
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self._items
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self._items)!r})"
+
+    def add(self, item: Any) -> None:
+        """Add an item, keeping its original position if already present."""
+        self._items[item] = None
+
+    def discard(self, item: Any) -> None:
+        """Remove an item if present."""
+        self._items.pop(item, None)
+
+    append = add
+
+    def update(self, iterable: Iterable[Any]) -> None:
+        """Add all items from an iterable in a single pass."""
+        self._items.update(dict.fromkeys(iterable))
+
+    extend = update
+
+    def to_list(self) -> List[Any]:
+        """Return the items as a JSON-serializable list."""
+        return list(self._items)
+
+
+class ModuleResources(NamedTuple):
+    """
+    Resource hints of a module, from the ``resources`` stanza of modules.yml.
+
+    cpu and net are shares of the pool's CPU and network budgets a task
+    reserves while it runs (1.0 is about one busy core or one sustained
+    network-heavy scanner), memory is in megabytes.
+    """
+    cpu: float = 0.25
+    net: float = 0.25
+    memory: float = 0.0
+    max_parallel: Optional[int] = None
+    expected_runtime: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "ModuleResources":
+        """
+        Create resource hints from a modules.yml stanza.
+
+        Args:
+            data: Dictionary with any of the field names, or None for defaults
+
+        Returns:
+            New ModuleResources instance
+
+        Raises:
+            ValueError: If a key is unknown or a value is not a non-negative number
+        """
+        data = data or {}
+        if not isinstance(data, dict):
+            raise ValueError("resources must be a mapping")
+        unknown = set(data) - set(cls._fields)
+        if unknown:
+            raise ValueError(f"unknown resource hints: {', '.join(sorted(unknown))}")
+
+        values: Dict[str, Any] = {}
+        for field, value in data.items():
+            if value is None:
+                continue
+            number = float(value)
+            if number < 0:
+                raise ValueError(f"resource hint {field} must not be negative")
+            values[field] = int(number) if field == "max_parallel" else number
+        if values.get("max_parallel") == 0:
+            raise ValueError("resource hint max_parallel must be at least 1")
+        return cls(**values)
 
 
 class Module:
@@ -20,6 +205,8 @@ class Module:
         protocol_list: List[str] = list(),
         switches: List[str] = list(),
         analyse_func: str = str(),
+        pipeline: List[Dict[str, Any]] = list(),
+        resources: Optional[Dict[str, Any]] = None,
         config=None,
     ):
         """
@@ -33,6 +220,9 @@ class Module:
             protocol_list: List of protocols the module supports
             switches: Command-line switches for external commands
             analyse_func: Optional function name for analyzing output
+            pipeline: Further processes the command output is piped through,
+                each a dictionary with command and switches
+            resources: Resource hints (see ModuleResources)
             config: Configuration manager instance
         """
         self.name = name.replace(" ", "_")
@@ -49,6 +239,21 @@ class Module:
 
         self.switches = switches or []
         self.analyse_func = analyse_func
+        self.pipeline = pipeline or []
+        self.resources = ModuleResources.from_dict(resources)
+
+        # Resolved callable/executable and analyzer, set when the module is loaded
+        self.dispatch = None
+        # Compiled argv builders of external commands (see core.command)
+        self.stages = None
+
+    @property
+    def fingerprint(self) -> str:
+        """Fingerprint of the module definition (command and switches)."""
+        key = "|".join([self.command, self.analyse_func] + [str(s) for s in self.switches])
+        if self.pipeline:
+            key += "|" + json.dumps(self.pipeline, sort_keys=True)
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
 
     def needs_port(self) -> bool:
         """Check if the module requires a port number."""
@@ -93,6 +298,8 @@ class PortData:
         hostnames: List[str] = list(),
         modules: List[str] = list(),
         infos: Dict[str, Any] = dict(),
+        fingerprint: str = "",
+        module_runs: Dict[str, Dict[str, Any]] = dict(),
     ):
         """
         Initialize port data with service information.
@@ -104,18 +311,27 @@ class PortData:
             hostnames: List of hostnames associated with this port
             modules: List of modules that have run against this port
             infos: Additional information about the port/service
+            fingerprint: Service fingerprint from port discovery
+            module_runs: Run records (time and input fingerprints) per module
         """
         self.protocol = protocol
         self.version = version
         self.product = product
-        self.hostnames = hostnames or []
-        self.modules = modules or []
+        self.hostnames = OrderedSet(hostnames)
+        self.modules = OrderedSet(modules)
         self.infos = infos or {}
+        self.fingerprint = fingerprint
+        self.module_runs = dict(module_runs) if module_runs else {}
+        # Column -> (value, frozen value) of the last freeze()
+        self._frozen_infos: Dict[str, Tuple[Any, Any]] = {}
 
     def update(self, data: Dict[str, Any]) -> None:
         """
         Update this instance with data from a dictionary.
 
+        Only fills in service details that are still empty; replacing
+        them and the fingerprint is left to TargetInfo.merge().
+
         Args:
             data: Dictionary with port data
         """
@@ -123,33 +339,74 @@ class PortData:
         self.version = self.version or data.get("version", "")
         self.product = self.product or data.get("product", "")
 
-        # Update hostnames without duplicating
-        if "hostnames" in data and data["hostnames"]:
-            for hostname in data["hostnames"]:
-                if hostname not in self.hostnames:
-                    self.hostnames.append(hostname)
+        # Update hostnames and modules without duplicating
+        if data.get("hostnames"):
+            self.hostnames.update(data["hostnames"])
 
-        # Update modules without duplicating
-        if "modules" in data and data["modules"]:
-            for module in data["modules"]:
-                if module not in self.modules:
-                    self.modules.append(module)
+        if data.get("modules"):
+            self.modules.update(data["modules"])
 
         # Update infos, merging dictionaries
         if "infos" in data and data["infos"]:
             self.infos.update(data["infos"])
 
+        if data.get("module_runs"):
+            self.module_runs.update(data["module_runs"])
+
+    def forget_module(self, module_name: str) -> None:
+        """
+        Forget that a module has run so it gets scheduled again.
+
+        Args:
+            module_name: Name of the module
+        """
+        self.modules.discard(module_name)
+        self.module_runs.pop(module_name, None)
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert port data to a dictionary."""
         return {
             "protocol": self.protocol,
             "version": self.version,
             "product": self.product,
-            "hostnames": self.hostnames,
-            "modules": self.modules,
+            "hostnames": self.hostnames.to_list(),
+            "modules": self.modules.to_list(),
             "infos": self.infos,
+            "fingerprint": self.fingerprint,
+            "module_runs": self.module_runs,
         }
 
+    def freeze(self) -> "PortSnapshot":
+        """
+        Create an immutable snapshot of this port.
+
+        Infos are frozen deeply. Writers replace info values rather than
+        mutating them, so a column still holding the object it held at
+        the last freeze reuses its frozen copy and only changed columns
+        are copied.
+        """
+        cache = self._frozen_infos
+        infos = {}
+        for column, value in self.infos.items():
+            cached = cache.get(column)
+            if cached is None or cached[0] is not value:
+                cached = cache[column] = (value, _freeze(value))
+            infos[column] = cached[1]
+        if len(cache) > len(infos):
+            for column in cache.keys() - infos.keys():
+                del cache[column]
+
+        return PortSnapshot(
+            protocol=self.protocol,
+            version=self.version,
+            product=self.product,
+            hostnames=tuple(self.hostnames),
+            modules=tuple(self.modules),
+            infos=MappingProxyType(infos),
+            fingerprint=self.fingerprint,
+            module_runs=_freeze(self.module_runs),
+        )
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "PortData":
         """
@@ -168,12 +425,157 @@ class PortData:
             hostnames=data.get("hostnames", []),
             modules=data.get("modules", []),
             infos=data.get("infos", {}),
+            fingerprint=data.get("fingerprint", ""),
+            module_runs=data.get("module_runs", {}),
         )
 
 
+class PortSnapshot(NamedTuple):
+    """
+    Immutable view of a PortData instance at one point in time.
+    """
+
+    protocol: str
+    version: str
+    product: str
+    hostnames: Tuple[str, ...]
+    modules: Tuple[str, ...]
+    infos: Mapping[str, Any]
+    fingerprint: str = ""
+    module_runs: Mapping[str, Dict[str, Any]] = MappingProxyType({})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the snapshot to a dictionary."""
+        return {
+            "protocol": self.protocol,
+            "version": self.version,
+            "product": self.product,
+            "hostnames": list(self.hostnames),
+            "modules": list(self.modules),
+            "infos": _thaw(self.infos),
+            "fingerprint": self.fingerprint,
+            "module_runs": _thaw(self.module_runs),
+        }
+
+
+class _PortMap(AbcMapping):
+    """
+    Read-only port mapping of a snapshot, updated one port at a time.
+
+    A large base dict is shared between snapshot versions; ports changed
+    since it was built sit in a small overlay. Publishing a change copies
+    only the overlay, and the overlay is folded into a new base once it
+    outgrows a fraction of the base, so a write costs amortized O(1)
+    instead of a copy of every port. Iteration keeps insertion order.
+    """
+
+    __slots__ = ("_base", "_overlay", "_added")
+
+    def __init__(
+        self,
+        base: Optional[Dict[str, PortSnapshot]] = None,
+        overlay: Optional[Dict[str, PortSnapshot]] = None,
+        added: int = 0,
+    ):
+        self._base = base or {}
+        self._overlay = overlay or {}
+        self._added = added  # Overlay keys missing from the base
+
+    def __getitem__(self, port: str) -> PortSnapshot:
+        try:
+            return self._overlay[port]
+        except KeyError:
+            return self._base[port]
+
+    def __contains__(self, port: object) -> bool:
+        return port in self._overlay or port in self._base
+
+    def __len__(self) -> int:
+        return len(self._base) + self._added
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._base
+        if self._added:
+            for port in self._overlay:
+                if port not in self._base:
+                    yield port
+
+    def replace(self, updates: Dict[str, PortSnapshot]) -> "_PortMap":
+        """
+        Create a new mapping with some ports replaced or added.
+
+        Args:
+            updates: New snapshots keyed by port
+
+        Returns:
+            New mapping sharing the unchanged ports with this one
+        """
+        base, overlay = self._base, self._overlay
+        added = self._added + sum(port not in base and port not in overlay for port in updates)
+        overlay = {**overlay, **updates}
+        if len(overlay) > max(32, len(base) // 8):
+            return _PortMap({**base, **overlay})
+        return _PortMap(base, overlay, added)
+
+
+class TargetSnapshot(NamedTuple):
+    """
+    Immutable, versioned view of a TargetInfo instance.
+
+    Readers (UI, persistence, exporters) can hold on to a snapshot and
+    iterate it freely while worker threads keep mutating the target.
+    """
+
+    version: int
+    ip: str
+    hostname: str
+    ports: Mapping[str, PortSnapshot]
+
+    def get_host(self) -> str:
+        """Get the primary host identifier (hostname or IP)."""
+        return self.hostname if self.hostname else self.ip
+
+    def get_port(self, port: Optional[Union[str, int]]) -> Optional[PortSnapshot]:
+        """Get the snapshot of a specific port, or None."""
+        if port is None:
+            return None
+        return self.ports.get(str(port))
+
+    def get_ports_dict_data(self) -> Dict[str, Dict[str, str]]:
+        """
+        Get formatted port data for display.
+
+        Returns:
+            Dictionary with port data in display format
+        """
+        return {
+            port: {
+                "protocol": port_data.protocol,
+                "product": port_data.product,
+                "version": port_data.version,
+                "modules": ", ".join(port_data.modules),
+            }
+            for port, port_data in self.ports.items()
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the snapshot to a dictionary."""
+        return {
+            "ip": self.ip,
+            "hostname": self.hostname,
+            "ports": {
+                port: port_data.to_dict() for port, port_data in self.ports.items()
+            },
+        }
+
+
 class TargetInfo:
     """
     Stores all information about a target system.
+
+    Mutations go through the methods of this class, which apply them
+    under a short writer lock and then publish a new immutable
+    TargetSnapshot. Readers call snapshot() and never take the lock.
     """
 
     def __init__(
@@ -197,6 +599,91 @@ class TargetInfo:
         self.hostname = hostname
         self.ports = ports or {}
 
+        self._write_lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        self._saved_version = -1
+        self._snapshot = TargetSnapshot(
+            version=0,
+            ip=self.ip,
+            hostname=self.hostname,
+            ports=_PortMap({port: port_data.freeze() for port, port_data in self.ports.items()}),
+        )
+
+    @property
+    def version(self) -> int:
+        """Version number of the latest published snapshot."""
+        return self._snapshot.version
+
+    def snapshot(self) -> TargetSnapshot:
+        """
+        Get the latest published snapshot.
+
+        Lock-free: the snapshot reference is swapped atomically by writers.
+
+        Returns:
+            Immutable TargetSnapshot
+        """
+        return self._snapshot
+
+    def _publish(self, *changed_ports: str) -> None:
+        """
+        Publish a new snapshot after a mutation.
+
+        Only the changed ports are frozen again and replaced in the port
+        mapping; unchanged ports share their snapshot with the previous
+        version. Must be called while holding the writer lock.
+
+        Args:
+            changed_ports: Port keys that were modified
+        """
+        ports = self._snapshot.ports
+        if changed_ports:
+            ports = ports.replace({port: self.ports[port].freeze() for port in changed_ports})
+
+        self._snapshot = TargetSnapshot(
+            version=self._snapshot.version + 1,
+            ip=self.ip,
+            hostname=self.hostname,
+            ports=ports,
+        )
+
+    def _get_or_create_port(self, port_str: str, protocol: str = "") -> PortData:
+        """Get a port, creating it if needed. Caller holds the writer lock."""
+        port_data = self.ports.get(port_str)
+        if port_data is None:
+            port_data = PortData(protocol=protocol)
+            self.ports[port_str] = port_data
+        return port_data
+
+    def ensure_port(self, port: Union[str, int]) -> None:
+        """
+        Make sure an entry exists for a port.
+
+        Args:
+            port: Port number or special key (e.g., "target")
+        """
+        port_str = str(port)
+        if port_str in self._snapshot.ports:
+            return
+
+        with self._write_lock:
+            if port_str not in self.ports:
+                self._get_or_create_port(port_str)
+                self._publish(port_str)
+
+    def set_protocol(self, port: Union[str, int], protocol: str) -> None:
+        """
+        Set the protocol detected on a port.
+
+        Args:
+            port: Port number
+            protocol: Protocol name (e.g., "http")
+        """
+        port_str = str(port)
+        with self._write_lock:
+            self._get_or_create_port(port_str).protocol = protocol
+            self._publish(port_str)
+
     def add_hostname(self, port: Union[str, int], hostname: str, protocol: str) -> None:
         """
         Add a hostname to a port.
@@ -207,11 +694,12 @@ class TargetInfo:
             protocol: Protocol used (e.g., "http")
         """
         port_str = str(port)
-        if port_str not in self.ports:
-            self.ports[port_str] = PortData(protocol=protocol)
-
-        if hostname not in self.ports[port_str].hostnames:
-            self.ports[port_str].hostnames.append(hostname)
+        with self._write_lock:
+            port_data = self._get_or_create_port(port_str, protocol)
+            if hostname in port_data.hostnames:
+                return
+            port_data.hostnames.add(hostname)
+            self._publish(port_str)
 
     def add_information(self, port: Union[str, int], column: str, info: Any) -> None:
         """
@@ -223,31 +711,62 @@ class TargetInfo:
             info: Information to add
         """
         port_str = str(port)
-        if port_str not in self.ports:
-            self.ports[port_str] = PortData()
+        with self._write_lock:
+            self._get_or_create_port(port_str).infos[column] = info
+            self._publish(port_str)
 
-        self.ports[port_str].infos[column] = info
+    def update_information(self, port: Union[str, int], column: str, entries: Dict[str, Any]) -> None:
+        """
+        Merge entries into a dictionary of additional information.
+
+        Unlike add_information(), entries stored by other modules or
+        earlier calls under the same column are kept.
+
+        Args:
+            port: Port number
+            column: Information category
+            entries: Entries to add or replace
+        """
+        port_str = str(port)
+        with self._write_lock:
+            infos = self._get_or_create_port(port_str).infos
+            current = infos.get(column)
+            infos[column] = {**(current if isinstance(current, dict) else {}), **entries}
+            self._publish(port_str)
 
     def mark_module_as_run(
-        self, port: Optional[Union[str, int]], module_name: str
+        self,
+        port: Optional[Union[str, int]],
+        module_name: str,
+        module_fingerprint: str = "",
     ) -> None:
         """
         Mark a module as having been run against a port.
 
+        Also records when it ran and the service and module fingerprints
+        it ran with, so a later re-scan can tell whether it is stale.
+
         Args:
             port: Port number or None for target-wide modules
             module_name: Name of the module
+            module_fingerprint: Fingerprint of the module definition
         """
         if port is None:
             # Handle target-wide modules (not port-specific)
             return
 
         port_str = str(port)
-        if port_str not in self.ports:
-            self.ports[port_str] = PortData()
-
-        if module_name not in self.ports[port_str].modules:
-            self.ports[port_str].modules.append(module_name)
+        with self._write_lock:
+            port_data = self._get_or_create_port(port_str)
+            if module_name in port_data.modules:
+                return
+            port_data.modules.add(module_name)
+            port_data.module_runs[module_name] = {
+                "time": time.time(),
+                "service": port_data.fingerprint,
+                "module": module_fingerprint,
+            }
+            self._publish(port_str)
 
     def check_module_finished(self, port: Union[str, int], module_name: str) -> bool:
         """
@@ -260,11 +779,34 @@ class TargetInfo:
         Returns:
             Boolean indicating if module has run
         """
-        port_str = str(port)
-        if port_str not in self.ports:
+        port_data = self._snapshot.get_port(port)
+        if port_data is None:
             return False
 
-        return module_name in self.ports[port_str].modules
+        return module_name in port_data.modules
+
+    def forget_module(self, module_name: str, keep_ports: Iterable[str] = ()) -> List[str]:
+        """
+        Forget that a module ran, so the scan loop schedules it again.
+
+        Args:
+            module_name: Name of the module
+            keep_ports: Ports whose run is kept (e.g. still running)
+
+        Returns:
+            List of ports the module will run against again
+        """
+        keep_ports = set(keep_ports)
+        with self._write_lock:
+            forgotten = [
+                port for port, port_data in self.ports.items()
+                if port not in keep_ports and module_name in port_data.modules
+            ]
+            for port in forgotten:
+                self.ports[port].forget_module(module_name)
+            if forgotten:
+                self._publish(*forgotten)
+        return forgotten
 
     def get_ports_dict_data(self) -> Dict[str, Dict[str, str]]:
         """
@@ -273,31 +815,22 @@ class TargetInfo:
         Returns:
             Dictionary with port data in display format
         """
-        result = {}
-        for port, port_data in self.ports.items():
-            result[port] = {
-                "protocol": port_data.protocol,
-                "product": port_data.product,
-                "version": port_data.version,
-                "modules": ", ".join(port_data.modules),
-            }
-        return result
+        return self._snapshot.get_ports_dict_data()
 
-    def get_port(self, port: Optional[Union[str, int]]) -> Optional[PortData]:
+    def get_port(self, port: Optional[Union[str, int]]) -> Optional[PortSnapshot]:
         """
-        Get data for a specific port.
+        Get data for a specific port from the latest snapshot.
+
+        Modules get an immutable view; changes go through the writer
+        methods of this class.
 
         Args:
             port: Port number or None
 
         Returns:
-            PortData instance or None if port doesn't exist
+            PortSnapshot or None if port doesn't exist
         """
-        if port is None:
-            return None
-
-        port_str = str(port)
-        return self.ports.get(port_str)
+        return self._snapshot.get_port(port)
 
     def get_host(self) -> str:
         """
@@ -308,28 +841,153 @@ class TargetInfo:
         """
         return self.hostname if self.hostname else self.ip
 
-    def merge(self, other_ports: Dict[str, Dict[str, Any]]) -> None:
+    def merge(self, other_ports: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
         """
         Merge port data from another source.
 
+        Handles a whole scan result in one pass: unknown ports are
+        created directly and known ports are updated in place, with
+        hostname and module sets merged in bulk.
+
+        Data from a version scan has a service fingerprint (see
+        scan_fingerprint()). It replaces the stored product, version and fingerprint. If it
+        describes a different service than the one stored, every module
+        run against the port is forgotten; a port that only had discovery
+        data just learns its service details. Module runs recorded before
+        the port had a fingerprint are never stale by service.
+
         Args:
             other_ports: Dictionary of port data to merge
+
+        Returns:
+            Dictionary of port to the module names that will run again
         """
-        for port, data in other_ports.items():
-            if port not in self.ports:
-                self.ports[port] = PortData.from_dict(data)
-            else:
-                self.ports[port].update(data)
+        ports = self.ports
+        from_dict = PortData.from_dict
+        invalidated: Dict[str, List[str]] = {}
+        with self._write_lock:
+            changed = []
+            for port, data in other_ports.items():
+                port = str(port)
+                existing = ports.get(port)
+                new_fingerprint = scan_fingerprint(data)
+                if existing is None:
+                    existing = ports[port] = from_dict(data)
+                    existing.fingerprint = new_fingerprint
+                    changed.append(port)
+                    continue
+
+                service_changed = new_fingerprint and _service_changed(existing, data)
+                existing.update(data)
+                if new_fingerprint and new_fingerprint != existing.fingerprint:
+                    if service_changed:
+                        existing.protocol = data.get("protocol") or existing.protocol
+                        stale = list(existing.modules)
+                        for module_name in stale:
+                            existing.forget_module(module_name)
+                        if stale:
+                            invalidated[port] = stale
+                    existing.product = data.get("product", "")
+                    existing.version = data.get("version", "")
+                    existing.fingerprint = new_fingerprint
+                changed.append(port)
+            if changed:
+                self._publish(*changed)
+        return invalidated
+
+    def apply_rescan(
+        self,
+        discovered: Dict[str, Dict[str, Any]],
+        modules: Iterable[Module] = (),
+        max_age: Optional[float] = None,
+        scanned: Optional[Iterable[Union[str, int]]] = None,
+    ) -> Dict[str, List[str]]:
+        """
+        Reconcile fresh discovery results with the stored session.
+
+        New ports are added. Ports in the scanned range that no longer
+        answer are removed. Data from a version scan (see
+        scan_fingerprint()) replaces the service details of ports whose
+        fingerprint changed and forgets every module run against them;
+        without one, service changes are picked up when the version scan
+        merges its results (see merge()). On all ports, module runs are
+        forgotten if they ran against a different service fingerprint,
+        with a different module definition, or longer than max_age seconds
+        ago. Everything else keeps its stored results, so the scan loop
+        only schedules what is stale.
+
+        Args:
+            discovered: Port data from discovery, keyed by port number
+            modules: Currently loaded modules
+            max_age: Maximum age of module results in seconds, or None
+            scanned: Ports discovery checked; stored ports among them that
+                are missing from discovered are removed. None keeps all ports.
+
+        Returns:
+            Dictionary of port to the module names that will run again
+        """
+        now = time.time()
+        module_fingerprints = {module.name: module.fingerprint for module in modules}
+        invalidated: Dict[str, List[str]] = {}
+        discovered = {str(port): data for port, data in discovered.items()}
+
+        with self._write_lock:
+            if scanned is not None:
+                for port in {str(port) for port in scanned} - discovered.keys():
+                    self.ports.pop(port, None)
+
+            changed_services = set()
+            for port, data in discovered.items():
+                new_fingerprint = scan_fingerprint(data)
+                existing = self.ports.get(port)
+                if existing is None:
+                    self.ports[port] = PortData.from_dict(data)
+                    self.ports[port].fingerprint = new_fingerprint
+                    continue
+
+                if new_fingerprint and existing.fingerprint != new_fingerprint:
+                    if _service_changed(existing, data):
+                        changed_services.add(port)
+                    existing.protocol = data.get("protocol", "")
+                    existing.product = data.get("product", "")
+                    existing.version = data.get("version", "")
+                    existing.fingerprint = new_fingerprint
+
+            for port, port_data in self.ports.items():
+                stale = []
+                for module_name in port_data.modules:
+                    run = port_data.module_runs.get(module_name)
+                    if port in changed_services:
+                        stale.append(module_name)
+                    elif run is None:
+                        if max_age is not None:
+                            stale.append(module_name)
+                    elif max_age is not None and now - run.get("time", 0) > max_age:
+                        stale.append(module_name)
+                    elif port_data.fingerprint and run.get("service") not in ("", port_data.fingerprint):
+                        stale.append(module_name)
+                    elif run.get("module") and module_name in module_fingerprints \
+                            and run["module"] != module_fingerprints[module_name]:
+                        stale.append(module_name)
+
+                for module_name in stale:
+                    port_data.forget_module(module_name)
+                if stale:
+                    invalidated[port] = stale
+
+            # Ports may have been removed, so build the port mapping anew
+            self._snapshot = TargetSnapshot(
+                version=self._snapshot.version + 1,
+                ip=self.ip,
+                hostname=self.hostname,
+                ports=_PortMap({port: port_data.freeze() for port, port_data in self.ports.items()}),
+            )
+
+        return invalidated
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert target info to a dictionary."""
-        return {
-            "ip": self.ip,
-            "hostname": self.hostname,
-            "ports": {
-                port: port_data.to_dict() for port, port_data in self.ports.items()
-            },
-        }
+        return self._snapshot.to_dict()
 
     @classmethod
     def from_dict(cls, config, data: Dict[str, Any]) -> "TargetInfo":
@@ -354,15 +1012,52 @@ class TargetInfo:
             ports=ports,
         )
 
+    @classmethod
+    def load_from_file(cls, config, host: str) -> Optional["TargetInfo"]:
+        """
+        Load a previously saved session for a host.
+
+        Args:
+            config: Configuration manager instance
+            host: Hostname or IP the session was saved under
+
+        Returns:
+            TargetInfo instance or None if no session was saved
+        """
+        if not config or not getattr(config, "path", "") or not host:
+            return None
+
+        file_path = os.path.join(config.path, f"{host}.json")
+        if not os.path.exists(file_path):
+            return None
+
+        try:
+            with open(file_path, "r") as f:
+                return cls.from_dict(config, json.load(f))
+        except Exception as e:
+            if hasattr(config, "log_error"):
+                config.log_error(f"Failed to load saved session {file_path}: {str(e)}")
+            return None
+
     def save_to_file(self) -> None:
-        """Save target information to a JSON file."""
+        """
+        Save target information to a JSON file.
+
+        Skips the write if nothing changed since the last save.
+        """
         if not self.config or not hasattr(self.config, "path"):
             return
 
         try:
-            file_path = os.path.join(self.config.path, f"{self.get_host()}.json")
-            with open(file_path, "w") as f:
-                json.dump(self.to_dict(), f, indent=2)
+            with self._save_lock:
+                snapshot = self._snapshot
+                if snapshot.version == self._saved_version:
+                    return
+
+                file_path = os.path.join(self.config.path, f"{snapshot.get_host()}.json")
+                with open(file_path, "w") as f:
+                    json.dump(snapshot.to_dict(), f, indent=2)
+                self._saved_version = snapshot.version
         except Exception as e:
             if hasattr(self.config, "log_error"):
                 self.config.log_error(f"Failed to save target info: {str(e)}")
@@ -1,36 +1,92 @@
-"""Custom modules for PyAutoEnum."""
+"""
+Custom modules for PyAutoEnum.
 
+Heavy third-party dependencies (requests, BeautifulSoup) are imported by
+the module functions that need them, not at import time.
+"""
+
+import asyncio
 import os
 import re
-import socket
-from typing import Any, Dict, List, Optional, Tuple
-from urllib.parse import urljoin, urlparse
-
-import requests
-import urllib3
-from bs4 import BeautifulSoup
-from ping3 import ping
+from typing import Dict, List, Tuple
 
 from pyautoenum.config.manager import ConfigManager
-from pyautoenum.utils.network import (
-    check_http_connection,
-    get_hostname_from_url,
-    is_default_page,
-    is_ip_address,
-)
+from pyautoenum.data.models import service_fingerprint
+from pyautoenum.modules.registry import register
+from pyautoenum.utils.network import check_http_connection
+
+
+def _parse_options(switches: List[str], defaults: Dict[str, str]) -> Dict[str, str]:
+    """
+    Parse "key=value" switches of a Python module.
+
+    Args:
+        switches: Switches from modules.yml
+        defaults: Accepted keys and their default values
+
+    Returns:
+        Dictionary of options
+    """
+    options = dict(defaults)
+    for switch in switches:
+        key, sep, value = str(switch).partition("=")
+        if not sep or key.strip() not in defaults:
+            raise ValueError(f"Unknown option: {switch} (expected one of {', '.join(defaults)})")
+        options[key.strip()] = value.strip()
+    return options
+
+
+def _open_words(wordlist_path: str, shard: str = ""):
+    """
+    Open a shared wordlist (see utils.wordlists), or one shard of it.
+
+    Args:
+        wordlist_path: Wordlist file
+        shard: "" for every word, or "<number>/<count>" for the number-th of
+            count contiguous parts, so several runs can split a long list
+
+    Returns:
+        Wordlist or WordlistShard, each word once
+
+    Raises:
+        OSError: If the wordlist cannot be read
+        ValueError: If the shard is not "<number>/<count>"
+    """
+    from pyautoenum.utils.wordlists import wordlist_service
+
+    words = wordlist_service.open(wordlist_path)
+    if not shard:
+        return words
+    number, _, count = shard.partition("/")
+    if not (number.isdigit() and count.isdigit() and 1 <= int(number) <= int(count)):
+        raise ValueError(f"Invalid shard: {shard} (expected <number>/<count>, e.g. 2/4)")
+    shards = words.shards(int(count))
+    # A list shorter than count has fewer shards; the missing ones are empty
+    return shards[int(number) - 1] if int(number) <= len(shards) else []
+
 
-# Disable SSL warnings
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+def _read_subdomains(wordlist_path: str, hostname: str, shard: str = ""):
+    """Yield candidate names from a wordlist (or a shard of it), each name once."""
+    for subdomain in _open_words(wordlist_path, shard):
+        yield f"{subdomain}.{hostname}"
 
 
+@register
 def subdomain_enum_brute(target_info, port, switches):
     """
     Perform subdomain enumeration using brute force.
 
+    Names are resolved concurrently with raw DNS queries (see
+    pyautoenum.utils.dns); names that resolve go through a bounded
+    concurrent HTTP liveness check.
+
     Args:
         target_info: Target information object
         port: Port to scan
-        switches: Additional parameters
+        switches: Wordlist path, optionally followed by "key=value" options:
+            resolvers (comma separated), concurrency, rate (queries/s per
+            resolver), timeout, retries, http_concurrency and shard
+            (<number>/<count> of the wordlist)
 
     Returns:
         Output of the scan
@@ -43,36 +99,146 @@ def subdomain_enum_brute(target_info, port, switches):
         raise ValueError("No wordlist provided for subdomain enumeration")
 
     wordlist_path = switches[0]
-    discovered_domains = []
+    options = _parse_options(switches[1:], {
+        "resolvers": "",
+        "concurrency": "256",
+        "rate": "500",
+        "timeout": "1.0",
+        "retries": "3",
+        "http_concurrency": "20",
+        "shard": "",
+    })
 
     try:
-        with open(wordlist_path, "r") as wordlist_file:
-            for line in wordlist_file:
-                subdomain = line.strip()
-                if not subdomain or subdomain.startswith("#"):
-                    continue
-
-                domain_to_check = f"{subdomain}.{hostname}"
-                try:
-                    # Try to resolve the domain
-                    ip_address = socket.gethostbyname(domain_to_check)
-                    discovered_domains.append((domain_to_check, ip_address))
-
-                    # Check if the domain responds on the specified port
-                    if check_http_connection(protocol, domain_to_check, port):
-                        target_info.add_hostname(port, domain_to_check, protocol)
-                        ConfigManager.log_success(
-                            f"Found active subdomain: {domain_to_check} ({ip_address})"
-                        )
-                except socket.gaierror:
-                    # Domain doesn't resolve
-                    pass
+        return asyncio.run(_subdomain_brute_force(
+            target_info, port, protocol, hostname, _read_subdomains(wordlist_path, hostname, options["shard"]), options
+        ))
     except Exception as e:
         ConfigManager.log_error(f"Error in subdomain enumeration: {str(e)}")
+        return []
+
+
+async def _subdomain_brute_force(target_info, port, protocol, hostname, candidates, options) -> List[Tuple[str, str]]:
+    """
+    Resolve candidate names and check the ones that exist for HTTP.
+
+    If the domain has wildcard DNS, live hosts must answer differently
+    than a random name does. Names that resolve only to the wildcard
+    addresses may still be virtual hosts on the same server, so they are
+    kept only if that HTTP check tells them apart.
+
+    Args:
+        target_info: Target information object
+        port: Port to check
+        protocol: Protocol of the port
+        hostname: Domain being brute forced
+        candidates: Iterable of candidate names
+        options: Parsed module options
+
+    Returns:
+        List of (name, address) for every name that resolved, except
+        wildcard matches that answer like a random name
+    """
+    from concurrent.futures import ThreadPoolExecutor
 
+    from pyautoenum.utils.dns import STATUS_OK, DnsResolver, negative_cache, random_label, wildcard_cache
+    from pyautoenum.utils.network import http_response_signature
+
+    resolvers = [r for r in options["resolvers"].split(",") if r.strip()] or None
+    http_concurrency = max(1, int(options["http_concurrency"]))
+    loop = asyncio.get_running_loop()
+    discovered_domains = []
+    checks = set()
+    dropped = 0
+    wildcard_signature = None
+
+    # init_config() sets the output path on the instance
+    output_path = ConfigManager().path
+    cache_file = os.path.join(output_path, "dns_negative_cache.json") if output_path else None
+    if cache_file:
+        negative_cache.load(cache_file)
+    skipped_before = negative_cache.hits
+
+    def is_live(domain: str) -> bool:
+        # Check if the domain responds on the specified port
+        if wildcard_signature is None:
+            return check_http_connection(protocol, domain, port)
+        signature = http_response_signature(protocol, domain, port)
+        return signature is not None and not signature.matches(wildcard_signature)
+
+    async def check_liveness(domain: str, ip_address: str, wildcard_match: bool) -> None:
+        nonlocal dropped
+        live = await loop.run_in_executor(executor, is_live, domain)
+        if wildcard_match:
+            if not live:
+                # Same addresses and same response as a random name
+                dropped += 1
+                return
+            discovered_domains.append((domain, ip_address))
+        if live:
+            target_info.add_hostname(port, domain, protocol)
+            ConfigManager.log_success(
+                "Found active subdomain: {} ({})", domain, ip_address,
+                module="subdomain_enum_brute", port=port,
+            )
+
+    with ThreadPoolExecutor(max_workers=http_concurrency) as executor:
+        async with DnsResolver(
+            resolvers,
+            concurrency=int(options["concurrency"]),
+            rate=float(options["rate"]) or None,
+            timeout=float(options["timeout"]),
+            retries=int(options["retries"]),
+            negative_cache=negative_cache,
+        ) as resolver:
+            wildcard_addresses = await wildcard_cache.detect(resolver, hostname)
+            if wildcard_addresses:
+                wildcard_signature = await loop.run_in_executor(
+                    executor, http_response_signature, protocol, f"{random_label()}.{hostname}", port
+                )
+                ConfigManager.log_warning(
+                    "Wildcard DNS on {}: random names resolve to {}; names resolving there must answer "
+                    "differently over HTTP",
+                    hostname, ", ".join(sorted(wildcard_addresses)),
+                    module="subdomain_enum_brute", port=port,
+                )
+
+            async for result in resolver.resolve_many(candidates):
+                if result.status != STATUS_OK or not result.addresses:
+                    continue
+                wildcard_match = bool(wildcard_addresses) and wildcard_addresses.issuperset(result.addresses)
+                if not wildcard_match:
+                    discovered_domains.append((result.name, result.addresses[0]))
+
+                # Bounded liveness stage: resolving pauses while it is full
+                if len(checks) >= http_concurrency * 2:
+                    done, checks = await asyncio.wait(checks, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        if task.exception():
+                            ConfigManager.log_error(
+                                "Error checking subdomain: {}", task.exception(),
+                                module="subdomain_enum_brute", port=port, limit=20,
+                            )
+                checks.add(asyncio.ensure_future(check_liveness(result.name, result.addresses[0], wildcard_match)))
+
+        for error in await asyncio.gather(*checks, return_exceptions=True):
+            if isinstance(error, Exception):
+                ConfigManager.log_error(
+                    "Error checking subdomain: {}", error, module="subdomain_enum_brute", port=port, limit=20,
+                )
+
+    if cache_file:
+        negative_cache.save(cache_file)
+    ConfigManager.log_info(
+        "Subdomain brute force on {}: {} resolved, {} wildcard matches dropped, "
+        "{} skipped as known non-existent",
+        hostname, len(discovered_domains), dropped, negative_cache.hits - skipped_before,
+        module="subdomain_enum_brute", port=port,
+    )
     return discovered_domains
 
 
+@register
 def analyse_subdomain_enum_brute(target_info, output):
     """
     Process the results of subdomain enumeration.
@@ -92,102 +258,204 @@ def analyse_subdomain_enum_brute(target_info, output):
     )
 
 
+@register
 def check_for_http(target_info, port, switches):
     """
-    Check if a port is running an HTTP server.
+    Check which ports run an HTTP or HTTPS server.
+
+    Plain and TLS probes run at once on every port (see
+    pyautoenum.utils.sniff), and any HTTP status counts as HTTP. The
+    module runs per port, so ports found later (nmap shards, re-scans)
+    are checked too, but the tasks started together share one batch of
+    probes (see SniffBatcher). Without a port, all known ports are
+    checked concurrently.
+
+    Switches are "key=value" options: timeout (per probe, seconds) and
+    concurrency (ports probed at once).
 
     Args:
         target_info: Target information object
-        port: Port to check
-        switches: Additional parameters
+        port: Port to check, or None for all discovered ports
+        switches: Options
 
     Returns:
-        Boolean indicating if HTTP service was detected
+        Boolean indicating if an HTTP service was detected
     """
-    hostname = target_info.get_host()
-
-    # Try HTTP
-    http_available = check_http_connection("http", hostname, port)
-    if http_available:
-        target_info.get_port(port).protocol = "http"
-        ConfigManager.log_success(f"HTTP service detected on port {port}")
+    from pyautoenum.utils.sniff import PROTOCOL_HTTP, PROTOCOL_HTTPS, sniff_batcher, sniff_protocols
 
-    # Try HTTPS
-    https_available = check_http_connection("https", hostname, port)
-    if https_available:
-        target_info.get_port(port).protocol = "https"
-        ConfigManager.log_success(f"HTTPS service detected on port {port}")
-
-    return http_available or https_available
+    options = _parse_options(switches, {"timeout": "3", "concurrency": "128"})
+    timeout, concurrency = float(options["timeout"]), int(options["concurrency"])
+    hostname = target_info.get_host()
+    if port is not None:
+        if not str(port).isdigit():
+            # The special "target" entry
+            return False
+        results = {str(port): sniff_batcher.sniff(hostname, int(port), timeout, concurrency)}
+    else:
+        ports = [number for number in target_info.snapshot().ports if str(number).isdigit()]
+        results = asyncio.run(sniff_protocols(hostname, ports, timeout=timeout, concurrency=concurrency))
+
+    detected = False
+    for port_str, protocol in sorted(results.items(), key=lambda item: int(item[0])):
+        if protocol not in (PROTOCOL_HTTP, PROTOCOL_HTTPS):
+            continue
+        target_info.set_protocol(port_str, protocol)
+        ConfigManager.log_success(
+            "{} service detected on port {}", protocol.upper(), port_str,
+            module="check_for_http", port=port_str,
+        )
+        detected = True
+    return detected
 
 
+@register
 def check_open_ports(target_info, port, switches):
     """
-    Scan for open ports using nmap.
+    Scan ports using nmap and merge the results into the target.
+
+    Unless the switches select ports (-p), only the ports already found
+    by discovery are scanned (or the given port). Large port ranges are
+    split into shards scanned by parallel nmap processes (see
+    pyautoenum.utils.nmap_stream.run_sharded_nmap). nmap's XML output is
+    parsed while it runs: every open port is merged as soon as nmap
+    reports it and nmap's progress becomes the task progress. Protocols
+    detected by check_for_http are kept.
+
+    Besides nmap arguments, the switches may contain the options
+    shards=<maximum parallel shards> and max_rate=<packets per second
+    for the whole scan, shared with other nmap scans running meanwhile>.
 
     Args:
         target_info: Target information object
-        port: Port to scan (or None for all ports)
+        port: Port to scan (or None for all known ports)
         switches: Additional parameters for nmap
 
     Returns:
         Dictionary with discovered ports
     """
-
+    import shlex
+
+    from pyautoenum.core.attack_thread import current_output_file, report_progress, stop_requested
+    from pyautoenum.utils.nmap_stream import (
+        nmap_budget,
+        run_nmap,
+        run_sharded_nmap,
+        split_output_option,
+        split_port_option,
+    )
+    from pyautoenum.utils.portscan import parse_ports
+
+    target = target_info.get_host()
+
+    # Separate our options from the nmap arguments
+    options = {"shards": "", "max_rate": ""}
+    nmap_switches = []
+    for switch in switches:
+        key, sep, value = str(switch).partition("=")
+        if sep and key.strip() in options:
+            options[key.strip()] = value.strip()
+        else:
+            nmap_switches.append(switch)
+
+    # Build command
+    arguments = [argument for switch in nmap_switches for argument in shlex.split(str(switch))]
+    spec, arguments = split_port_option(arguments)
+    output_file, arguments = split_output_option(arguments)
+    if output_file:
+        # Only known while running as a module; the report is skipped otherwise
+        output_file = output_file.replace("[outfile]", current_output_file())
+    if spec is None:
+        if port is not None:
+            spec = str(port)
+        else:
+            spec = ",".join(sorted(
+                (number for number in target_info.snapshot().ports if str(number).isdigit()), key=int
+            ))
+        if not spec:
+            ConfigManager.log_info("No open ports to scan with nmap")
+            return {}
     try:
-        try:
-            import nmap
-
-            #
-        except ImportError:
-            #
-            return None
-
-        scanner = nmap.PortScanner()
-        #
-        target = target_info.get_host()
-
-        # Build command
-        switches_str = " ".join(switches)
-
-        ConfigManager.log_info(f"Running nmap scan: {target} {switches_str}")
-
-        # Run scan
-
-        scanner.scan(target, arguments=switches_str)
-
-        # Process results
-        discovered_ports = {}
-
-        for host in scanner.all_hosts():
-            for proto in scanner[host].all_protocols():
-                for port_num in scanner[host][proto]:
-                    port_info = scanner[host][proto][port_num]
-
-                    port_data = {
-                        "protocol": port_info.get("name", ""),
-                        "product": port_info.get("product", ""),
-                        "version": port_info.get("version", ""),
-                        "modules": [],
-                        "hostnames": [],
-                        "infos": {},
-                    }
-
-                    discovered_ports[str(port_num)] = port_data
-                    ConfigManager.log_success(
-                        f"Discovered port {port_num}/{proto}: {port_data['protocol']} {port_data['product']} {port_data['version']}"
-                    )
-
-        return discovered_ports
+        ports = parse_ports(spec)
+    except ValueError:
+        # Protocol prefixes or service names: leave the list to nmap
+        ports = None
+
+    ConfigManager.log_info("Running nmap scan: {} {} -p {}", target, " ".join(arguments), spec)
+
+    discovered_ports = {}
+
+    def on_port(address, port_info):
+        if port_info["state"] != "open":
+            return
+        # Found ports are reported right away and again with their service details
+        details = port_info["protocol"] or port_info["product"] or port_info["version"]
+        if not details and port_info["port"] in discovered_ports:
+            return
+        port_data = {
+            "protocol": port_info["protocol"],
+            "product": port_info["product"],
+            "version": port_info["version"],
+            "modules": [],
+            "hostnames": [],
+            "infos": {},
+        }
+        if port_info["method"] == "probed":
+            # Identified by version detection: the service fingerprint is known
+            port_data["fingerprint"] = service_fingerprint(port_data)
+        discovered_ports[port_info["port"]] = port_data
+        # Fills in service details; protocols that were already detected are kept
+        invalidated = target_info.merge({port_info["port"]: port_data})
+        if details:
+            ConfigManager.log_success(
+                "Discovered port {}/{}: {} {} {}", port_info["port"], port_info["transport"],
+                port_data["protocol"], port_data["product"], port_data["version"],
+                module="check_open_ports", port=port_info["port"],
+            )
+        else:
+            ConfigManager.log_success(
+                "Discovered port {}/{}", port_info["port"], port_info["transport"],
+                module="check_open_ports", port=port_info["port"],
+            )
+        for changed_port, names in invalidated.items():
+            ConfigManager.log_info(
+                "Service on port {} changed, re-running {}", changed_port, ", ".join(names),
+                module="check_open_ports", port=changed_port,
+            )
 
-    except ImportError:
-        ConfigManager.log_error("python-nmap not installed. Cannot run port scan.")
+    try:
+        max_rate = int(options["max_rate"]) if options["max_rate"] else None
+        if ports is None:
+            output_arguments = ["-oN", output_file] if output_file else []
+            with nmap_budget.slot(max_rate) as rate:
+                rate_arguments = ["--max-rate", str(rate)] if rate else []
+                errors = run_nmap(
+                    target, arguments + ["-p", spec] + output_arguments + rate_arguments, on_port, report_progress,
+                    should_stop=stop_requested,
+                )
+        else:
+            errors = run_sharded_nmap(
+                target, arguments, ports, on_port, report_progress,
+                max_shards=int(options["shards"]) if options["shards"] else None,
+                max_rate=max_rate,
+                normal_output=output_file or None,
+                should_stop=stop_requested,
+            )
+    except FileNotFoundError:
+        ConfigManager.log_error("nmap not installed. Cannot run port scan.")
         return {}
     except Exception as e:
         ConfigManager.log_error(f"Error in port scan: {str(e)}")
-        return {}
+        return discovered_ports
+
+    # Shards repeat the same warnings
+    for line in dict.fromkeys(errors):
+        if line.strip():
+            ConfigManager.log_warning("nmap: {}", line, module="check_open_ports")
 
+    return discovered_ports
 
+
+@register
 def analyse_full_nmap(target_info, output):
     """
     Process the full nmap scan results.
@@ -199,42 +467,54 @@ def analyse_full_nmap(target_info, output):
     pass  # Handled directly by check_open_ports function
 
 
+@register
 def create_wordlist_from_website(target_info, port, switches):
     """
-    Create a custom wordlist by scraping website content.
+    Create a custom wordlist by crawling the website.
+
+    Same-origin pages are fetched concurrently up to a depth and page
+    budget (see utils.crawler), and words are ranked by how often they
+    occur across the site.
 
     Args:
         target_info: Target information object
         port: Target port
-        switches: Additional parameters
+        switches: Options depth=<links followed>, max_pages=<pages fetched>,
+            concurrency=<pages at once>, max_words=<words written>
 
     Returns:
-        List of extracted words
+        List of extracted words, most frequent first
     """
+    from pyautoenum.utils.crawler import Crawler
+
     hostname = target_info.get_host()
     port_data = target_info.get_port(port)
     if not port_data or not port_data.protocol:
         ConfigManager.log_error(f"No protocol information available for port {port}")
         return []
 
-    url = f"{port_data.protocol}://{hostname}:{port}"
+    url = f"{port_data.protocol}://{hostname}:{port}/"
 
     try:
-        response = requests.get(url, verify=False, timeout=10)
-        if not response.ok:
-            ConfigManager.log_error(
-                f"Failed to fetch content from {url}: {response.status_code}"
-            )
+        options = _parse_options(
+            switches, {"depth": "2", "max_pages": "200", "concurrency": "16", "max_words": "50000"}
+        )
+        crawler = Crawler(
+            url,
+            max_depth=int(options["depth"]),
+            max_pages=int(options["max_pages"]),
+            concurrency=int(options["concurrency"]),
+            max_words=int(options["max_words"]),
+        )
+        unique_words = crawler.crawl()[:int(options["max_words"])]
+        stats = crawler.get_stats()
+        if not stats["pages"]:
+            ConfigManager.log_error(f"Failed to fetch content from {url}")
             return []
-
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # Extract text
-        text_content = soup.get_text()
-
-        # Extract words
-        words = re.findall(r"\b[a-zA-Z0-9_-]{3,15}\b", text_content)
-        unique_words = sorted(set(words))
+        ConfigManager.log_info(
+            "Crawled {} pages of {} ({} errors)", stats["pages"], url, stats["errors"],
+            module="custom_created_wordlist", port=port,
+        )
 
         directory = ConfigManager.path if ConfigManager.path else "./output/wordlists"
         # Ensure directory exists
@@ -255,3 +535,103 @@ def create_wordlist_from_website(target_info, port, switches):
     except Exception as e:
         ConfigManager.log_error(f"Error creating wordlist: {str(e)}")
         return []
+
+
+@register
+def discover_web_content(target_info, port, switches):
+    """
+    Find files and directories on a web server with a wordlist.
+
+    Paths are requested by the built-in engine of
+    pyautoenum.utils.content_discovery (pipelined keep-alive requests,
+    adaptive concurrency). The wordlist is shared through
+    utils.wordlists, so duplicate words are requested once. Every hit is
+    stored right away in the port's infos under the column option, as
+    {path: "<status> <size> bytes [-> location]"}. The scan ends early
+    when the attack thread pool stops.
+
+    Switches are "key=value" options: wordlist, extensions (comma
+    separated, e.g. ".php,.txt"), suffix (e.g. "/" for directories),
+    method, hide_status and hide_size (comma separated), concurrency,
+    pipeline, timeout, column and shard (<number>/<count> of the
+    wordlist).
+
+    Args:
+        target_info: Target information object
+        port: Target port
+        switches: Options
+
+    Returns:
+        List of paths found
+    """
+    from pyautoenum.core.attack_thread import report_progress, stop_requested
+    from pyautoenum.utils.content_discovery import ContentDiscovery
+
+    options = _parse_options(switches, {
+        "wordlist": "/usr/share/seclists/Discovery/Web-Content/raft-medium-files.txt",
+        "extensions": "",
+        "suffix": "",
+        "method": "GET",
+        "hide_status": "404",
+        "hide_size": "",
+        "concurrency": "64",
+        "pipeline": "8",
+        "timeout": "10",
+        "column": "web_content",
+        "shard": "",
+    })
+    port_data = target_info.get_port(port)
+    if not port_data or not port_data.protocol:
+        ConfigManager.log_error(f"No protocol information available for port {port}")
+        return []
+    try:
+        words = _open_words(options["wordlist"], options["shard"])
+    except (OSError, ValueError) as e:
+        ConfigManager.log_error(f"Cannot read wordlist {options['wordlist']}: {e}")
+        return []
+
+    def split(value: str) -> List[str]:
+        return [item.strip() for item in value.split(",") if item.strip()]
+
+    def on_hit(hit) -> None:
+        details = f"{hit.status} {hit.size} bytes" + (f" -> {hit.location}" if hit.location else "")
+        target_info.update_information(port, options["column"], {hit.path: details})
+        # Every hit is stored in the port infos; the log only samples a flood of them
+        ConfigManager.log_success(
+            "Found {} ({})", hit.path, details, module="discover_web_content", port=port, limit=100,
+        )
+
+    engine = ContentDiscovery(
+        f"{port_data.protocol}://{target_info.get_host()}:{port}/",
+        words,
+        extensions=split(options["extensions"]),
+        suffix=options["suffix"],
+        method=options["method"],
+        hide_status=[int(status) for status in split(options["hide_status"])],
+        hide_sizes=[int(size) for size in split(options["hide_size"])],
+        concurrency=int(options["concurrency"]),
+        pipeline=int(options["pipeline"]),
+        timeout=float(options["timeout"]),
+        on_hit=on_hit,
+    )
+    total = max(1, len(words))
+
+    async def scan():
+        task = asyncio.ensure_future(engine.run())
+        while not task.done():
+            if stop_requested():
+                engine.cancel()
+            report_progress(100.0 * engine.stats["words"] / total)
+            await asyncio.wait({task}, timeout=0.5)
+        return task.result()
+
+    hits = asyncio.run(scan())
+    stats = engine.get_stats()
+    ConfigManager.log_info(
+        "Content discovery on {}: {} hits, {} requests in {:.1f}s ({:.0f}/s), {} failed{}",
+        port, len(hits), stats["requests"], stats["seconds"],
+        stats["responses"] / max(stats["seconds"], 1e-6), stats["failed"],
+        " (cancelled)" if engine.cancelled else "",
+        module="discover_web_content", port=port,
+    )
+    return [hit.path for hit in hits]
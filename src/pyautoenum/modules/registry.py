@@ -0,0 +1,176 @@
+"""
+Registry of Python attack modules and analyzers for PyAutoEnum.
+
+Python functions become available as ``command`` or ``analyse_function``
+in modules.yml by registering them::
+
+    from pyautoenum.modules.registry import register
+
+    @register
+    def my_module(target_info, port, switches):
+        ...
+
+Third-party packs are discovered through the ``pyautoenum.modules``
+entry point group. An entry point may point at a module (whose import
+registers functions with the decorator) or directly at a function,
+which is then registered under the entry point name.
+"""
+
+import shutil
+import threading
+from typing import Callable, Dict, NamedTuple, Optional
+
+ENTRY_POINT_GROUP = "pyautoenum.modules"
+
+# Executor types of a dispatch entry
+EXECUTOR_PYTHON = "python"
+EXECUTOR_EXTERNAL = "external"
+
+
+class ModuleDispatch(NamedTuple):
+    """Resolved execution details of a module, computed once at load time."""
+    executor: str
+    func: Optional[Callable] = None
+    executable: str = ""
+    analyzer: Optional[Callable] = None
+
+
+class ModuleRegistry:
+    """
+    Name to function table for Python modules and analyzers.
+
+    Built-in modules (pyautoenum.modules.custom) and entry point packs
+    are loaded on first lookup.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._functions: Dict[str, Callable] = {}
+        self._loaded = False
+        self._lock = threading.RLock()
+        self._fingerprint: Optional[str] = None
+        self.entry_points: Dict[str, str] = {}  # entry point name -> value
+
+    def register(self, func: Optional[Callable] = None, *, name: Optional[str] = None):
+        """
+        Register a function, usable as a decorator with or without arguments.
+
+        Args:
+            func: Function to register
+            name: Name used in modules.yml, defaults to the function name
+
+        Returns:
+            The function unchanged (or a decorator if func is None)
+        """
+        def decorator(f: Callable) -> Callable:
+            with self._lock:
+                self._functions[name or f.__name__] = f
+            return f
+
+        if func is None:
+            return decorator
+        return decorator(func)
+
+    def resolve(self, name: str) -> Optional[Callable]:
+        """
+        Look up a registered function.
+
+        Args:
+            name: Function name as used in modules.yml
+
+        Returns:
+            Callable or None if nothing is registered under that name
+        """
+        if not name:
+            return None
+        self.load()
+        return self._functions.get(name)
+
+    def load(self) -> None:
+        """Import built-in modules and entry point packs (once)."""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+
+            import pyautoenum.modules.custom  # noqa: F401  (registers built-ins)
+            self._load_entry_points()
+
+    @staticmethod
+    def _entry_point_group() -> list:
+        """List the entry points of the pack group (metadata only, nothing is imported)."""
+        from importlib import metadata
+
+        try:
+            entry_points = metadata.entry_points()
+            if hasattr(entry_points, "select"):
+                return list(entry_points.select(group=ENTRY_POINT_GROUP))
+            return list(entry_points.get(ENTRY_POINT_GROUP, []))  # Python < 3.10
+        except Exception:
+            return []
+
+    def _load_entry_points(self) -> None:
+        """Load third-party packs from the entry point group."""
+        from pyautoenum.config.manager import ConfigManager
+
+        for entry_point in self._entry_point_group():
+            try:
+                loaded = entry_point.load()
+            except Exception as e:
+                ConfigManager.log_error(
+                    f"Failed to load module pack {entry_point.name} ({entry_point.value}): {str(e)}"
+                )
+                continue
+            self.entry_points[entry_point.name] = entry_point.value
+            if callable(loaded) and not isinstance(loaded, type):
+                self._functions.setdefault(entry_point.name, loaded)
+
+    def fingerprint(self) -> str:
+        """
+        Identify the installed packs, for caches that depend on them.
+
+        Read from the entry point metadata without importing the packs,
+        once per process like load().
+        """
+        if self._fingerprint is None:
+            self._fingerprint = ",".join(sorted(
+                f"{entry_point.name}={entry_point.value}" for entry_point in self._entry_point_group()
+            ))
+        return self._fingerprint
+
+    def build_dispatch(
+        self, command: str, analyse_func: str = "", executable: Optional[str] = None
+    ) -> Optional[ModuleDispatch]:
+        """
+        Resolve a module's command and analyzer.
+
+        System commands take precedence over Python functions, as before.
+
+        Args:
+            command: Command from modules.yml
+            analyse_func: Analyzer function name from modules.yml
+            executable: Path the command already resolved to ("" if it is
+                not a binary), e.g. from the module catalog; None searches PATH
+
+        Returns:
+            ModuleDispatch, or None if the command cannot be resolved
+        """
+        analyzer = self.resolve(analyse_func) if analyse_func else None
+
+        if executable is None:
+            executable = shutil.which(command) if command else None
+        if executable:
+            return ModuleDispatch(EXECUTOR_EXTERNAL, executable=executable, analyzer=analyzer)
+
+        func = self.resolve(command)
+        if func is not None:
+            return ModuleDispatch(EXECUTOR_PYTHON, func=func, analyzer=analyzer)
+
+        return None
+
+
+# Global registry instance
+module_registry = ModuleRegistry()
+register = module_registry.register
@@ -4,12 +4,26 @@ import os
 import shutil
 from pathlib import Path
 
-# Ensure modules.yml is available in the resources directory
-if not os.path.exists(os.path.join(os.path.dirname(__file__), "modules.yml")):
-    # Try to copy from project root if it exists there
-    root_modules_yml = os.path.join(Path(__file__).parents[3], "modules.yml")
-    if os.path.exists(root_modules_yml):
-        try:
-            shutil.copy2(root_modules_yml, os.path.join(os.path.dirname(__file__), "modules.yml"))
-        except Exception:
-            pass
+RESOURCES_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def ensure_modules_yml() -> str:
+    """
+    Ensure modules.yml is available in the resources directory.
+
+    Copies it from the project root if it is missing here (e.g. in a
+    source checkout). Called on demand rather than at import time.
+
+    Returns:
+        Path of the bundled modules.yml (which may not exist)
+    """
+    modules_yml = os.path.join(RESOURCES_DIR, "modules.yml")
+    if not os.path.exists(modules_yml):
+        # Try to copy from project root if it exists there
+        root_modules_yml = os.path.join(Path(__file__).parents[3], "modules.yml")
+        if os.path.exists(root_modules_yml):
+            try:
+                shutil.copy2(root_modules_yml, modules_yml)
+            except Exception:
+                pass
+    return modules_yml
@@ -3,8 +3,9 @@
 import sys
 import threading
 import traceback
-from typing import List
+from typing import List, Mapping
 
+from pyautoenum.config.log_record import LogLevel
 from pyautoenum.config.manager import ConfigManager
 
 
@@ -25,6 +26,7 @@ class CommandProcessor:
             "logs": self.command_logs,
             "scan": self.command_scan,
             "ports": self.command_ports,
+            "reload": self.command_reload,
         }
         
     def execute_command(self, user_input: str) -> None:
@@ -83,14 +85,19 @@ class CommandProcessor:
                 help_text.append("Usage: clear")
                 help_text.append("Clears the screen")
             elif cmd == "logs":
-                help_text.append("Usage: logs")
-                help_text.append("Shows recent log messages")
+                help_text.append("Usage: logs [page] [level] [module=NAME]")
+                help_text.append("Shows log messages; page 0 is the newest, higher pages go back in history")
+                help_text.append("level (debug, info, success, warning, error) hides less severe messages")
+                help_text.append("module=NAME only shows messages of one module")
             elif cmd == "scan":
                 help_text.append("Usage: scan")
                 help_text.append("Shows the current scan progress")
             elif cmd == "ports":
                 help_text.append("Usage: ports")
                 help_text.append("Shows discovered ports and services")
+            elif cmd == "reload":
+                help_text.append("Usage: reload")
+                help_text.append("Reloads modules.yml and runs new or changed modules against the known ports")
             else:
                 help_text.append(f"No specific help available for '{cmd}'")
                 
@@ -123,7 +130,7 @@ class CommandProcessor:
             return
 
         port = args[0]
-        port_data = ConfigManager.target_info.get_port(port)
+        port_data = ConfigManager.target_info.snapshot().get_port(port)
         
         if not port_data:
             ConfigManager.log_error(f"No information available for port {port}")
@@ -154,7 +161,15 @@ class CommandProcessor:
         if port_data.infos:
             display_data.append("\nAdditional Information:")
             for key, value in sorted(port_data.infos.items()):
-                display_data.append(f"  {key}: {value}")
+                if isinstance(value, Mapping):
+                    display_data.append(f"  {key}:")
+                    for entry, details in sorted(value.items()):
+                        display_data.append(f"    {entry}: {details}")
+                elif isinstance(value, tuple):
+                    # Snapshots store lists as tuples
+                    display_data.append(f"  {key}: {list(value)}")
+                else:
+                    display_data.append(f"  {key}: {value}")
 
         if ConfigManager.ui_interface:
             ConfigManager.ui_interface.set_info_data(display_data)
@@ -208,8 +223,26 @@ class CommandProcessor:
         Args:
             args: Command arguments
         """
+        page = 0
+        min_level = None
+        module = None
+        for arg in args:
+            if arg.isdigit():
+                page = int(arg)
+            elif arg.startswith("module="):
+                module = arg[len("module="):] or None
+            elif arg.upper() in LogLevel.__members__:
+                min_level = LogLevel[arg.upper()]
+            else:
+                ConfigManager.log_interaction("Usage: logs [page] [level] [module=NAME]")
+                return
+            
         if ConfigManager.ui_interface:
             ConfigManager.ui_interface.switch_mode("logs")
+            if hasattr(ConfigManager.ui_interface, "set_log_filter"):
+                ConfigManager.ui_interface.set_log_filter(min_level, module)
+            if hasattr(ConfigManager.ui_interface, "set_log_page"):
+                ConfigManager.ui_interface.set_log_page(page)
         ConfigManager.log_info("Showing logs")
         
     def command_scan(self, args: List[str]) -> None:
@@ -237,7 +270,22 @@ class CommandProcessor:
         if ConfigManager.ui_interface:
             ConfigManager.ui_interface.switch_mode("port_data")
         
-        if not ConfigManager.target_info or not ConfigManager.target_info.ports:
+        snapshot = ConfigManager.target_info.snapshot() if ConfigManager.target_info else None
+        if not snapshot or not snapshot.ports:
             ConfigManager.log_warning("No ports discovered yet")
         else:
-            ConfigManager.log_info(f"Showing {len(ConfigManager.target_info.ports)} discovered ports")
+            ConfigManager.log_info(f"Showing {len(snapshot.ports)} discovered ports")
+
+    def command_reload(self, args: List[str]) -> None:
+        """
+        Reload modules.yml and schedule new or changed modules.
+        
+        Args:
+            args: Command arguments
+        """
+        if ConfigManager.scan_thread:
+            ConfigManager.scan_thread.scan_manager.reload_modules()
+        else:
+            changes = ConfigManager().reload_modules()
+            if changes is not None:
+                ConfigManager.log_info(f"Loaded {len(ConfigManager.modules)} modules")
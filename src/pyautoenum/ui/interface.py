@@ -7,6 +7,7 @@ import time
 from datetime import timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
+from pyautoenum.config.log_record import LogLevel
 from pyautoenum.config.manager import ConfigManager
 from pyautoenum.core.attack_thread import attack_thread_pool
 from pyautoenum.ui.commands import CommandProcessor
@@ -42,6 +43,10 @@ class Interface(threading.Thread):
         self._last_update = 0
         self._update_interval = 0.5  # seconds
         self._colors_initialized = False
+        self._ports_cache: Tuple[int, Dict[str, Dict[str, str]]] = (-1, {})
+        self._log_page = 0
+        self._log_min_level: Optional[LogLevel] = None
+        self._log_module: Optional[str] = None
     
     def run(self):
         """Start the interface in a curses wrapper."""
@@ -93,11 +98,14 @@ class Interface(threading.Thread):
             "  help              - Show this help",
             "  scan              - Show current scan progress",
             "  ports             - Show discovered ports and services",
-            "  logs              - Show recent log messages",
+            "  logs [page] [level] [module=NAME]",
+            "                    - Show log messages, page 0 is the newest",
+            "  reload            - Reload modules.yml and run new or changed modules",
             "  quit, exit        - Exit the application",
             "  clear             - Clear the screen",
             "",
             "Use <TAB> to cycle through view modes",
+            "Use <PgUp>/<PgDn> in the logs view to page through history",
             "Press <Ctrl+C> to exit"
         ]
         self.set_info_data(help_text)
@@ -106,6 +114,18 @@ class Interface(threading.Thread):
     def set_status(self, message: str):
         """Set the status message."""
         self._status_message = message
+    
+    def set_log_page(self, page: int):
+        """Set the page of log history shown in logs mode (0 is the newest)."""
+        self._log_page = max(0, page)
+        self._last_update = 0  # Force immediate update
+    
+    def set_log_filter(self, min_level: Optional[LogLevel] = None, module: Optional[str] = None):
+        """Only show log records at or above min_level and/or for one module."""
+        self._log_min_level = min_level
+        self._log_module = module
+        self._log_page = 0
+        self._last_update = 0  # Force immediate update
         
     def _setup_colors(self):
         """Initialize color pairs for the UI."""
@@ -269,7 +289,7 @@ class Interface(threading.Thread):
                     "start_time": time.time(),
                     "discovery_status": "Initializing",
                     "progress_percentage": 0,
-                    "ports_found": len(ConfigManager.target_info.ports) if ConfigManager.target_info else 0,
+                    "ports_found": len(ConfigManager.target_info.snapshot().ports) if ConfigManager.target_info else 0,
                     "modules_total": 0,
                     "modules_running": 0,
                     "modules_pending": 0,
@@ -359,13 +379,18 @@ class Interface(threading.Thread):
                 self._safe_addstr(self.data_win, 1, 2, "No target information available.")
                 return
                 
-            data_unordered = ConfigManager.target_info.get_ports_dict_data()
+            snapshot = ConfigManager.target_info.snapshot()
+            
+            # Reuse the formatted rows while the snapshot version is unchanged
+            if self._ports_cache[0] != snapshot.version:
+                self._ports_cache = (snapshot.version, snapshot.get_ports_dict_data())
+            data_unordered = self._ports_cache[1]
             if not data_unordered:
                 self._safe_addstr(self.data_win, 1, 2, "No port data available yet.")
                 return
 
             # Draw header with host information
-            host = ConfigManager.target_info.get_host()
+            host = snapshot.get_host()
             self._safe_addstr(self.data_win, 1, 2, f"Target: {host}", curses.color_pair(2) | curses.A_BOLD)
         except Exception as e:
             self._safe_addstr(self.data_win, 1, 2, f"Error displaying port data: {str(e)}")
@@ -437,22 +462,27 @@ class Interface(threading.Thread):
     def print_logs(self):
         """Print recent logs in the data window."""
         try:
-            recent_logs = ConfigManager.get_logs()[-20:] if ConfigManager.get_logs() else []
+            page_size = max(1, self.height - 6)
+            recent_logs = ConfigManager.get_log_page(
+                self._log_page, page_size, self._log_min_level, self._log_module
+            )
             
-            self._safe_addstr(self.data_win, 1, 2, "Recent Logs:", curses.color_pair(2) | curses.A_BOLD)
+            title = "Recent Logs" if self._log_page == 0 else f"Log History (page {self._log_page})"
+            if self._log_min_level is not None:
+                title += f" [level >= {self._log_min_level.name.lower()}]"
+            if self._log_module:
+                title += f" [module {self._log_module}]"
+            self._safe_addstr(self.data_win, 1, 2, title + ":", curses.color_pair(2) | curses.A_BOLD)
         
-            for i, log in enumerate(recent_logs):
-                color = curses.color_pair(0)
-                if log.startswith("[-]"):
-                    color = curses.color_pair(5)  # Error
-                elif log.startswith("[+]"):
-                    color = curses.color_pair(3)  # Success
-                elif log.startswith("[!]"):
-                    color = curses.color_pair(4)  # Warning
-                elif log.startswith("[*]"):
-                    color = curses.color_pair(6)  # Info
-                    
-                self._safe_addstr(self.data_win, 3 + i, 2, log, color)
+            level_colors = {
+                LogLevel.ERROR: curses.color_pair(5),
+                LogLevel.SUCCESS: curses.color_pair(3),
+                LogLevel.WARNING: curses.color_pair(4),
+                LogLevel.INFO: curses.color_pair(6),
+            }
+            for i, record in enumerate(recent_logs):
+                color = level_colors.get(record.level, curses.color_pair(0))
+                self._safe_addstr(self.data_win, 3 + i, 2, str(record), color)
         except Exception as e:
             self._safe_addstr(self.data_win, 1, 2, f"Error displaying logs: {str(e)}")
     
@@ -501,6 +531,12 @@ class Interface(threading.Thread):
         elif key == curses.KEY_F1:  # F1 - Help
             self.show_help()
             
+        elif key == curses.KEY_PPAGE and self._ui_mode == UIMode.LOGS:  # Page Up - older logs
+            self.set_log_page(self._log_page + 1)
+            
+        elif key == curses.KEY_NPAGE and self._ui_mode == UIMode.LOGS:  # Page Down - newer logs
+            self.set_log_page(self._log_page - 1)
+            
         elif 32 <= key <= 126:  # Printable ASCII
             input_str += chr(key)
             
@@ -7,6 +7,7 @@ import time
 from datetime import datetime, timedelta
 from typing import List
 
+from pyautoenum.config.log_record import LogLevel
 from pyautoenum.config.manager import ConfigManager
 from pyautoenum.ui.commands import CommandProcessor
 
@@ -98,24 +99,24 @@ class SimpleInterface(threading.Thread):
             self.stdscr.addstr(1, 0, status_line)
             
             # Show recent logs
-            if ConfigManager.get_logs():
-                max_logs = min(10, len(ConfigManager.get_logs()))
-                recent_logs = ConfigManager.get_logs()[-max_logs:]
-                for i, log in enumerate(recent_logs):
+            recent_logs = ConfigManager.get_logs(10)
+            if recent_logs:
+                for i, record in enumerate(recent_logs):
                     color = curses.A_NORMAL
-                    if log.startswith("[+]"):
+                    if record.level == LogLevel.SUCCESS:
                         color = curses.color_pair(1)
-                    elif log.startswith("[-]"):
+                    elif record.level == LogLevel.ERROR:
                         color = curses.color_pair(2)
-                    elif log.startswith("[!]"):
+                    elif record.level == LogLevel.WARNING:
                         color = curses.color_pair(3)
-                    elif log.startswith("[*]"):
+                    elif record.level == LogLevel.INFO:
                         color = curses.color_pair(4)
-                    self.stdscr.addstr(3 + i, 2, log[:self.width-4], color)
+                    self.stdscr.addstr(3 + i, 2, str(record)[:self.width-4], color)
                 
             # Draw ports data if available
-            if ConfigManager.target_info and ConfigManager.target_info.ports:
-                ports_count = len(ConfigManager.target_info.ports)
+            snapshot = ConfigManager.target_info.snapshot() if ConfigManager.target_info else None
+            if snapshot and snapshot.ports:
+                ports_count = len(snapshot.ports)
                 self.stdscr.addstr(self.height - 5, 0, f"Discovered Ports: {ports_count}")
                 
             # Draw command prompt
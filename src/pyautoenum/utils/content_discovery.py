@@ -0,0 +1,528 @@
+"""
+Web content discovery engine for PyAutoEnum.
+
+ContentDiscovery requests a path for every word of a wordlist (and
+every word + extension) on one web server and reports the paths that
+exist. It speaks HTTP/1.1 directly on asyncio streams:
+
+- Each worker keeps one keep-alive connection and pipelines a batch of
+  requests on it before reading the responses in order. Requests the
+  server did not answer (it closed the connection, timed out or asked
+  to slow down) are sent again on a new connection.
+- The number of active connections follows AIMD: one more after a
+  clean round of batches, half as many after an error or a 429.
+- Words are read from the wordlist lazily, so large lists are never
+  held in memory.
+- Responses are filtered by status and size, and by the status and size
+  a random (surely missing) path gets, which hides catch-all pages.
+
+cancel() can be called from any thread; connections are aborted and
+run() returns the hits found so far.
+"""
+
+import asyncio
+import itertools
+import ssl
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+from urllib.parse import quote, urlsplit
+
+# Requests sent back to back on one connection before reading responses
+DEFAULT_PIPELINE = 8
+
+# Attempts per path before it is given up
+MAX_ATTEMPTS = 3
+
+# 429 responses per path before it is given up; a busy server is not a broken path
+MAX_THROTTLED = 10
+
+# Seconds a worker waits after a 429
+THROTTLE_DELAY = 1.0
+
+# Characters of a word that are sent unquoted
+_SAFE_PATH_CHARACTERS = "/:@!$&'()*+,;=-._~%"
+
+# Statuses whose responses never have a body
+_NO_BODY_STATUSES = {204, 304}
+
+_READ_CHUNK = 64 * 1024
+
+
+class Hit(NamedTuple):
+    """A path that exists on the server."""
+    path: str
+    status: int
+    size: int
+    location: str = ""  # Redirect target, if any
+
+
+class _Response(NamedTuple):
+    status: int
+    size: int
+    location: str
+    keep_alive: bool
+
+
+def read_words(path: str) -> Iterator[str]:
+    """
+    Stream the words of a wordlist file.
+
+    Empty lines and comments ("#...") are skipped.
+
+    Args:
+        path: Wordlist file
+
+    Yields:
+        Words, in file order
+    """
+    with open(path, "r", errors="replace") as wordlist:
+        for line in wordlist:
+            word = line.strip()
+            if word and not word.startswith("#"):
+                yield word
+
+
+class ConcurrencyController:
+    """Additive-increase, multiplicative-decrease limit of active connections."""
+
+    def __init__(self, initial: int = 8, maximum: int = 64):
+        """
+        Initialize the controller.
+
+        Args:
+            initial: Connections to start with
+            maximum: Upper bound of the limit
+        """
+        self.maximum = max(1, maximum)
+        self.limit = max(1, min(initial, self.maximum))
+        self.backoffs = 0
+        self._clean = 0
+
+    def record(self, ok: bool) -> None:
+        """
+        Account for a finished batch.
+
+        Args:
+            ok: Whether every request of the batch was answered normally
+        """
+        if not ok:
+            self.limit = max(1, self.limit // 2)
+            self.backoffs += 1
+            self._clean = 0
+            return
+        self._clean += 1
+        if self._clean >= self.limit:
+            self.limit = min(self.maximum, self.limit + 1)
+            self._clean = 0
+
+
+class _Retry(Exception):
+    """The connection failed; unanswered requests must be sent again."""
+
+    def __init__(self, answered: int, throttled: bool = False, closed: bool = False):
+        super().__init__(answered)
+        self.answered = answered
+        self.throttled = throttled
+        self.closed = closed  # The server announced the close: not an error
+
+
+class ContentDiscovery:
+    """
+    Brute-force paths of a web server with pipelined keep-alive requests.
+
+    Example:
+        engine = ContentDiscovery("http://10.0.0.5:8080/", read_words("words.txt"), extensions=[".php"])
+        hits = asyncio.run(engine.run())
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        words: Iterable[str],
+        extensions: Sequence[str] = (),
+        suffix: str = "",
+        method: str = "GET",
+        hide_status: Iterable[int] = (404,),
+        hide_sizes: Iterable[int] = (),
+        concurrency: int = 64,
+        pipeline: int = DEFAULT_PIPELINE,
+        timeout: float = 10.0,
+        calibrate: bool = True,
+        host_header: Optional[str] = None,
+        on_hit: Optional[Callable[[Hit], None]] = None,
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            base_url: Scheme, host, port and base path, e.g. "https://host:8443/app/"
+            words: Words to try (consumed lazily)
+            extensions: Also try every word with each of these appended
+            suffix: Appended to every path, e.g. "/" for directories
+            method: HTTP method (GET or HEAD)
+            hide_status: Statuses that are not reported
+            hide_sizes: Body sizes that are not reported
+            concurrency: Maximum number of connections
+            pipeline: Requests sent on a connection before reading responses
+            timeout: Seconds a connection may take to answer a batch
+            calibrate: Hide the status and size that random paths get
+            host_header: Host header, default: host (and port) of base_url
+            on_hit: Called with every hit as soon as it is found
+        """
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme.lower() or "http"
+        self.host = parts.hostname or ""
+        self.port = parts.port or (443 if self.scheme == "https" else 80)
+        self.base_path = parts.path.rstrip("/") + "/"
+        self.host_header = host_header or parts.netloc
+        self.extensions = tuple(extensions)
+        self.suffix = suffix
+        self.method = method.upper()
+        self.hide_status: Set[int] = set(hide_status)
+        self.hide_sizes: Set[int] = set(hide_sizes)
+        self.pipeline = max(1, pipeline)
+        self.timeout = timeout
+        self.calibrate = calibrate
+        self.on_hit = on_hit
+        self.controller = ConcurrencyController(min(8, concurrency), concurrency)
+        self.hits: List[Hit] = []
+        self.stats = {"words": 0, "requests": 0, "responses": 0, "retries": 0, "connections": 0, "failed": 0}
+        self._words = iter(words)
+        self._paths = self._candidates()
+        self._retries: Deque[Tuple[str, int]] = deque()
+        self._throttles: Dict[str, int] = {}
+        self._wildcards: Set[Tuple[int, int]] = set()
+        self._transports: Set[asyncio.BaseTransport] = set()
+        self._cancelled = False
+        self._exhausted = False
+        self._in_flight = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ssl_context: Optional[ssl.SSLContext] = None
+        self._lock = threading.Lock()
+
+    def _candidates(self) -> Iterator[str]:
+        for word in self._words:
+            self.stats["words"] += 1
+            word = quote(word.lstrip("/"), safe=_SAFE_PATH_CHARACTERS)
+            yield f"{self.base_path}{word}{self.suffix}"
+            for extension in self.extensions:
+                yield f"{self.base_path}{word}{extension}{self.suffix}"
+
+    def cancel(self) -> None:
+        """Stop the scan (thread-safe); run() returns the hits found so far."""
+        with self._lock:
+            self._cancelled = True
+            loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._abort_connections)
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancel() was called."""
+        return self._cancelled
+
+    def _abort_connections(self) -> None:
+        for transport in list(self._transports):
+            transport.abort()
+
+    def _next_batch(self) -> List[Tuple[str, int]]:
+        """Take up to pipeline paths, retries first, with their attempt number."""
+        batch = []
+        while self._retries and len(batch) < self.pipeline:
+            batch.append(self._retries.popleft())
+        for path in itertools.islice(self._paths, self.pipeline - len(batch)):
+            batch.append((path, 1))
+        return batch
+
+    def _request(self, path: str) -> bytes:
+        return (
+            f"{self.method} {path} HTTP/1.1\r\n"
+            f"Host: {self.host_header}\r\n"
+            "User-Agent: Mozilla/5.0 (compatible; pyautoenum)\r\n"
+            "Accept: */*\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        ).encode("latin-1", "replace")
+
+    async def _connect(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        ssl_context = None
+        if self.scheme == "https":
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+                self._ssl_context.check_hostname = False
+                self._ssl_context.verify_mode = ssl.CERT_NONE
+            ssl_context = self._ssl_context
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(
+                self.host, self.port, ssl=ssl_context,
+                server_hostname=self.host if ssl_context else None,
+            ),
+            self.timeout,
+        )
+        self._transports.add(writer.transport)
+        self.stats["connections"] += 1
+        return reader, writer
+
+    def _close(self, writer: Optional[asyncio.StreamWriter]) -> None:
+        if writer is not None:
+            self._transports.discard(writer.transport)
+            writer.transport.abort()
+
+    async def _read_response(self, reader: asyncio.StreamReader) -> _Response:
+        """Read one response, counting and discarding its body."""
+        status_line = await reader.readuntil(b"\r\n")
+        fields = status_line.split(None, 2)
+        if len(fields) < 2 or not fields[0].startswith(b"HTTP/"):
+            raise ConnectionError(f"Invalid status line: {status_line[:80]!r}")
+        version, status = fields[0], int(fields[1])
+        headers: Dict[bytes, bytes] = {}
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.partition(b":")
+            headers[name.strip().lower()] = value.strip()
+        if status < 200:
+            # Interim response (100 Continue): the real one follows
+            return await self._read_response(reader)
+
+        connection = headers.get(b"connection", b"").lower()
+        keep_alive = connection != b"close" and (version != b"HTTP/1.0" or connection == b"keep-alive")
+        size = 0
+        if self.method == "HEAD" or status in _NO_BODY_STATUSES:
+            size = int(headers.get(b"content-length", b"0") or 0)
+        elif b"chunked" in headers.get(b"transfer-encoding", b"").lower():
+            while True:
+                length = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                if length == 0:
+                    # Trailers end with an empty line
+                    while await reader.readuntil(b"\r\n") != b"\r\n":
+                        pass
+                    break
+                await reader.readexactly(length + 2)
+                size += length
+        elif b"content-length" in headers:
+            remaining = int(headers[b"content-length"])
+            size = remaining
+            while remaining:
+                chunk = await reader.read(min(remaining, _READ_CHUNK))
+                if not chunk:
+                    raise asyncio.IncompleteReadError(b"", remaining)
+                remaining -= len(chunk)
+        else:
+            # Body ends with the connection
+            while True:
+                chunk = await reader.read(_READ_CHUNK)
+                if not chunk:
+                    break
+                size += len(chunk)
+            keep_alive = False
+        location = headers.get(b"location", b"").decode("latin-1")
+        return _Response(status, size, location, keep_alive)
+
+    def _report(self, path: str, response: _Response) -> None:
+        if self._throttles:
+            self._throttles.pop(path, None)
+        if response.status in self.hide_status or response.size in self.hide_sizes:
+            return
+        if (response.status, response.size) in self._wildcards:
+            return
+        hit = Hit(path, response.status, response.size, response.location)
+        self.hits.append(hit)
+        if self.on_hit is not None:
+            self.on_hit(hit)
+
+    async def _exchange(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        batch: List[Tuple[str, int]],
+        handle: Callable[[str, _Response], None],
+        fresh: bool = True,
+    ) -> bool:
+        """
+        Pipeline a batch on a connection and handle the responses in order.
+
+        Args:
+            reader: Stream of the connection
+            writer: Stream of the connection
+            batch: Paths and attempt numbers
+            handle: Called with every path and its response
+            fresh: Whether the connection has not been used before
+
+        Returns:
+            Whether the connection can be kept
+
+        Raises:
+            _Retry: With the number of answered requests, if the rest must be resent
+        """
+        loop = asyncio.get_running_loop()
+        # Aborting the transport makes a pending read fail
+        watchdog = loop.call_later(self.timeout, writer.transport.abort)
+        answered = 0
+        try:
+            writer.write(b"".join(self._request(path) for path, _ in batch))
+            self.stats["requests"] += len(batch)
+            await writer.drain()
+            for path, _ in batch:
+                response = await self._read_response(reader)
+                self.stats["responses"] += 1
+                answered += 1
+                if response.status == 429:
+                    raise _Retry(answered - 1, throttled=True)
+                handle(path, response)
+                if not response.keep_alive:
+                    if fresh and answered == 1:
+                        # One response per connection: pipelining only wastes requests
+                        self.pipeline = 1
+                    if answered < len(batch):
+                        raise _Retry(answered, closed=True)
+                    return False
+            return True
+        except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError) as e:
+            raise _Retry(answered) from e
+        finally:
+            watchdog.cancel()
+
+    def _requeue(self, batch: List[Tuple[str, int]], failed: bool, throttled: bool = False) -> None:
+        """
+        Send unanswered requests again.
+
+        Only the first one is charged an attempt if the connection failed:
+        the server may have choked on it, the rest were merely queued
+        behind it. Likewise only the request answered with a 429 is charged
+        when throttled, against MAX_THROTTLED instead of MAX_ATTEMPTS.
+        """
+        for index, (path, attempt) in enumerate(batch):
+            if throttled and index == 0:
+                throttles = self._throttles.get(path, 0) + 1
+                if throttles >= MAX_THROTTLED:
+                    self._throttles.pop(path, None)
+                    self.stats["failed"] += 1
+                    continue
+                self._throttles[path] = throttles
+            elif failed and index == 0:
+                if attempt >= MAX_ATTEMPTS:
+                    self.stats["failed"] += 1
+                    continue
+                attempt += 1
+            self.stats["retries"] += 1
+            self._retries.append((path, attempt))
+
+    async def _worker(self, index: int) -> None:
+        reader = writer = None
+        try:
+            while not self._cancelled:
+                if index >= self.controller.limit:
+                    # Parked until the limit grows again
+                    self._close(writer)
+                    reader = writer = None
+                    await asyncio.sleep(0.05)
+                    if not self._retries and self._exhausted:
+                        return
+                    continue
+                batch = self._next_batch()
+                if not batch:
+                    self._exhausted = True
+                    if not self._in_flight:
+                        return
+                    # Other workers may still requeue paths
+                    await asyncio.sleep(0.01)
+                    continue
+                self._in_flight += 1
+                fresh = writer is None
+                try:
+                    if fresh:
+                        reader, writer = await self._connect()
+                    keep = await self._exchange(reader, writer, batch, self._report, fresh)
+                    self.controller.record(True)
+                    if not keep:
+                        self._close(writer)
+                        reader = writer = None
+                except (_Retry, OSError, asyncio.TimeoutError) as e:
+                    self._close(writer)
+                    reader = writer = None
+                    retry = e if isinstance(e, _Retry) else _Retry(0)
+                    # A kept connection that fails at once was most likely closed while idle
+                    stale = not fresh and retry.answered == 0 and not retry.throttled
+                    failed = not (retry.closed or retry.throttled or stale)
+                    if not self._cancelled:
+                        self._requeue(batch[retry.answered:], failed, retry.throttled)
+                    if failed or retry.throttled:
+                        self.controller.record(False)
+                    if retry.throttled:
+                        await asyncio.sleep(THROTTLE_DELAY)
+                finally:
+                    self._in_flight -= 1
+        finally:
+            self._close(writer)
+
+    async def _calibrate(self) -> None:
+        """Learn the status and size of missing pages from random paths."""
+        probes = [uuid.uuid4().hex] + [uuid.uuid4().hex + extension for extension in self.extensions[:1]]
+        seen: List[Tuple[int, int]] = []
+
+        def record(path: str, response: _Response) -> None:
+            seen.append((response.status, response.size))
+
+        writer = None
+        try:
+            reader, writer = await self._connect()
+            batch = [(f"{self.base_path}{probe}{self.suffix}", 1) for probe in probes]
+            await self._exchange(reader, writer, batch, record)
+        except (_Retry, OSError, asyncio.TimeoutError):
+            pass
+        finally:
+            self._close(writer)
+        for status, size in seen:
+            if status not in self.hide_status:
+                self._wildcards.add((status, size))
+
+    async def run(self) -> List[Hit]:
+        """
+        Run the scan.
+
+        Returns:
+            Hits in the order they were found
+        """
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+        self._exhausted = False
+        self._in_flight = 0
+        start = time.monotonic()
+        workers = []
+        try:
+            if self.calibrate and not self._cancelled:
+                await self._calibrate()
+            workers = [asyncio.ensure_future(self._worker(index)) for index in range(self.controller.maximum)]
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            self._abort_connections()
+            with self._lock:
+                self._loop = None
+            self.stats["seconds"] = time.monotonic() - start
+        return self.hits
+
+    @property
+    def wildcards(self) -> Set[Tuple[int, int]]:
+        """(status, size) pairs hidden by calibration."""
+        return set(self._wildcards)
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Get scan counters.
+
+        Returns:
+            Dictionary with "words" (read so far), "requests", "responses", "retries",
+            "connections", "failed", "hits", "limit", "backoffs" and
+            (after run()) "seconds"
+        """
+        stats = dict(self.stats)
+        stats["hits"] = len(self.hits)
+        stats["limit"] = self.controller.limit
+        stats["backoffs"] = self.controller.backoffs
+        return stats
@@ -0,0 +1,244 @@
+"""
+Same-origin website crawler for PyAutoEnum.
+
+Crawler fetches pages with the pooled http_client from a bounded number
+of threads, following links breadth-first up to a depth and page budget
+without leaving the scheme/host/port of the start URL. Pages are
+tokenized while they are downloaded with the standard library's
+incremental HTMLParser (no DOM is built), and words are counted so the
+result can be ranked by frequency. Visited URLs are remembered as 64-bit
+hashes, and the word counter is pruned to its most frequent entries, so
+memory stays bounded however large the site is.
+"""
+
+import collections
+import hashlib
+import re
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from html.parser import HTMLParser
+from typing import Counter, Dict, List, Optional, Set, Tuple
+from urllib.parse import urldefrag, urljoin, urlsplit
+
+WORD_PATTERN = re.compile(r"\b[a-zA-Z0-9_-]{3,15}\b")
+
+# Attributes that point to other pages
+_LINK_ATTRIBUTES = {"a": "href", "area": "href", "frame": "src", "iframe": "src"}
+
+# Text of these elements is not page content
+_SKIPPED_ELEMENTS = {"script", "style", "noscript", "template"}
+
+# Bytes read from the network at a time
+_CHUNK_SIZE = 64 * 1024
+
+
+class _Tokenizer(HTMLParser):
+    """Incremental HTML tokenizer that counts words and collects links."""
+
+    def __init__(self, words: Counter):
+        super().__init__(convert_charrefs=True)
+        self.words = words
+        self.links: List[str] = []
+        self._skip_depth = 0
+        self._tail = ""
+
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        if tag in _SKIPPED_ELEMENTS:
+            self._skip_depth += 1
+            return
+        attribute = _LINK_ATTRIBUTES.get(tag)
+        if attribute:
+            for name, value in attrs:
+                if name == attribute and value:
+                    self.links.append(value)
+
+    def handle_endtag(self, tag):
+        if tag in _SKIPPED_ELEMENTS and self._skip_depth:
+            self._skip_depth -= 1
+        self._flush()
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        # A word may continue in the next chunk of data
+        text = self._tail + data
+        cut = len(text)
+        while cut and (text[cut - 1].isalnum() or text[cut - 1] in "_-"):
+            cut -= 1
+        self._tail = text[cut:]
+        self.words.update(WORD_PATTERN.findall(text, 0, cut))
+
+    def _flush(self):
+        if self._tail:
+            self.words.update(WORD_PATTERN.findall(self._tail))
+            self._tail = ""
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def _url_hash(url: str) -> int:
+    """64-bit hash of a URL, for the visited set."""
+    return int.from_bytes(hashlib.blake2b(url.encode("utf-8", "replace"), digest_size=8).digest(), "big")
+
+
+def _origin(url: str) -> Tuple[str, str]:
+    parts = urlsplit(url)
+    return parts.scheme.lower(), parts.netloc.lower()
+
+
+class Crawler:
+    """
+    Bounded, same-origin, breadth-first crawler that builds a word list.
+
+    Example:
+        crawler = Crawler("http://10.0.0.5:8080/", max_depth=2, max_pages=200)
+        words = crawler.crawl()
+    """
+
+    def __init__(
+        self,
+        start_url: str,
+        max_depth: int = 2,
+        max_pages: int = 200,
+        concurrency: int = 16,
+        max_words: int = 50000,
+        max_page_bytes: int = 2 * 1024 * 1024,
+        timeout: float = 10,
+        client=None,
+    ):
+        """
+        Initialize the crawler.
+
+        Args:
+            start_url: First page; its scheme, host and port define the scope
+            max_depth: Maximum number of links followed from the start page
+            max_pages: Maximum number of pages fetched
+            concurrency: Maximum number of pages fetched at once
+            max_words: Number of distinct words kept while crawling (the
+                least frequent ones are dropped beyond twice this number)
+            max_page_bytes: Bytes read from a single page at most
+            timeout: Seconds to wait for a page
+            client: HttpClient to use, default: the shared http_client
+        """
+        if client is None:
+            from pyautoenum.utils.network import http_client as client
+        self.start_url = urldefrag(start_url)[0]
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.concurrency = max(1, concurrency)
+        self.max_words = max_words
+        self.max_page_bytes = max_page_bytes
+        self.timeout = timeout
+        self.client = client
+        self.words: Counter = collections.Counter()
+        self.stats = {"pages": 0, "errors": 0, "skipped": 0, "bytes": 0}
+        self._origin = _origin(self.start_url)
+        self._visited: Set[int] = set()
+        self._cancel = threading.Event()
+
+    def in_scope(self, url: str) -> bool:
+        """Whether a URL has the scheme, host and port of the start URL."""
+        return _origin(url) == self._origin
+
+    def cancel(self) -> None:
+        """Stop crawling; pages being fetched are finished."""
+        self._cancel.set()
+
+    def _fetch(self, url: str) -> Tuple[Optional[Counter], List[str], int]:
+        """
+        Download and tokenize one page (runs in a worker thread).
+
+        Returns:
+            Word counts (None if the page could not be used), links and
+            the number of characters read
+        """
+        words: Counter = collections.Counter()
+        tokenizer = _Tokenizer(words)
+        received = 0
+        try:
+            with self.client.get(url, timeout=self.timeout, stream=True) as response:
+                content_type = response.headers.get("Content-Type", "text/html").lower()
+                if response.status_code >= 400 or "text" not in content_type and "html" not in content_type:
+                    return None, [], 0
+                base = response.url or url
+                if response.encoding is None:
+                    response.encoding = "utf-8"
+                for chunk in response.iter_content(_CHUNK_SIZE, decode_unicode=True):
+                    tokenizer.feed(chunk)
+                    received += len(chunk)
+                    if received >= self.max_page_bytes or self._cancel.is_set():
+                        break
+                tokenizer.close()
+        except Exception:
+            return None, [], received
+        return words, [urljoin(base, link) for link in tokenizer.links], received
+
+    def _prune(self) -> None:
+        """Keep only the most frequent words."""
+        if len(self.words) > 2 * self.max_words:
+            self.words = collections.Counter(dict(self.words.most_common(self.max_words)))
+
+    def crawl(self) -> List[str]:
+        """
+        Crawl the site and rank the words found.
+
+        Returns:
+            Words, most frequent first (ties in alphabetical order)
+        """
+        frontier: "collections.deque[Tuple[str, int]]" = collections.deque([(self.start_url, 0)])
+        self._visited.add(_url_hash(self.start_url))
+        fetched = 0
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="crawl") as executor:
+            in_flight: Dict = {}
+            while (frontier or in_flight) and not self._cancel.is_set():
+                while frontier and len(in_flight) < self.concurrency and fetched < self.max_pages:
+                    url, depth = frontier.popleft()
+                    in_flight[executor.submit(self._fetch, url)] = depth
+                    fetched += 1
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    depth = in_flight.pop(future)
+                    words, links, received = future.result()
+                    self.stats["bytes"] += received
+                    if words is None:
+                        self.stats["errors"] += 1
+                        continue
+                    self.stats["pages"] += 1
+                    self.words.update(words)
+                    self._prune()
+                    if depth >= self.max_depth:
+                        continue
+                    for link in links:
+                        link = urldefrag(link)[0]
+                        if not self.in_scope(link):
+                            continue
+                        key = _url_hash(link)
+                        if key in self._visited:
+                            continue
+                        # Never queue more pages than the budget allows
+                        if len(self._visited) >= self.max_pages:
+                            self.stats["skipped"] += 1
+                            continue
+                        self._visited.add(key)
+                        frontier.append((link, depth + 1))
+            for future in in_flight:
+                future.cancel()
+
+        return [word for word, _ in sorted(self.words.items(), key=lambda item: (-item[1], item[0]))]
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get crawl counters.
+
+        Returns:
+            Dictionary with "pages", "errors", "skipped", "bytes" (characters read) and "words"
+        """
+        stats = dict(self.stats)
+        stats["words"] = len(self.words)
+        return stats
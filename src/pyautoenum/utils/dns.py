@@ -0,0 +1,642 @@
+"""
+Concurrent DNS resolution over UDP for PyAutoEnum.
+
+DnsResolver sends raw DNS queries with asyncio, keeping hundreds of
+lookups in flight across a list of resolvers instead of blocking on
+socket.gethostbyname for every name. Only what brute forcing needs is
+implemented: A/AAAA/CNAME answers, one question per message, no TCP
+fallback and no EDNS.
+"""
+
+import asyncio
+import ipaddress
+import json
+import os
+import random
+import socket
+import string
+import struct
+import threading
+import time
+from typing import AsyncIterator, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+QTYPE_A = 1
+QTYPE_CNAME = 5
+QTYPE_AAAA = 28
+
+RCODE_NOERROR = 0
+RCODE_SERVFAIL = 2
+RCODE_NXDOMAIN = 3
+
+# Result statuses
+STATUS_OK = "ok"  # Name exists (addresses may be empty, e.g. no A record)
+STATUS_NXDOMAIN = "nxdomain"
+STATUS_ERROR = "error"  # Every attempt returned SERVFAIL/REFUSED/...
+STATUS_TIMEOUT = "timeout"
+
+DEFAULT_RESOLVERS = ("1.1.1.1", "8.8.8.8")
+
+# How long a name is remembered as non-existent, in seconds
+NEGATIVE_TTL = 6 * 3600
+
+# How long detected wildcard addresses are reused, in seconds
+WILDCARD_TTL = 600
+
+
+class DnsMessage(NamedTuple):
+    """Decoded DNS response."""
+    query_id: int
+    rcode: int
+    question: str
+    answers: List[Tuple[str, int, int, object]]  # (name, type, ttl, value)
+
+
+class DnsResult(NamedTuple):
+    """Outcome of resolving one name."""
+    name: str
+    status: str
+    addresses: Tuple[str, ...] = ()
+    ttl: int = 0
+
+
+def encode_query(query_id: int, name: str, qtype: int = QTYPE_A) -> bytes:
+    """
+    Build a recursive query message.
+
+    Args:
+        query_id: 16-bit message ID
+        name: Domain name to look up
+        qtype: Record type
+
+    Returns:
+        Wire-format query
+
+    Raises:
+        ValueError: If the name is not a valid domain name
+    """
+    labels = name.rstrip(".").split(".")
+    qname = bytearray()
+    for label in labels:
+        encoded = label.encode("idna") if not label.isascii() else label.encode("ascii")
+        if not 0 < len(encoded) < 64:
+            raise ValueError(f"Invalid domain name: {name}")
+        qname.append(len(encoded))
+        qname += encoded
+    qname.append(0)
+    if len(qname) > 255:
+        raise ValueError(f"Domain name too long: {name}")
+
+    # Header: ID, flags (RD), QDCOUNT=1, ANCOUNT, NSCOUNT, ARCOUNT
+    return struct.pack("!HHHHHH", query_id, 0x0100, 1, 0, 0, 0) + bytes(qname) + struct.pack("!HH", qtype, 1)
+
+
+def _read_name(data: bytes, offset: int) -> Tuple[str, int]:
+    """Read a possibly compressed name; return it and the offset after it."""
+    labels = []
+    end = None
+    for _ in range(128):  # Bound pointer chains
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            if end is None:
+                end = offset + 2
+            offset = ((length & 0x3F) << 8) | data[offset + 1]
+            continue
+        offset += 1
+        if length == 0:
+            break
+        labels.append(data[offset:offset + length].decode("ascii", "replace"))
+        offset += length
+    else:
+        raise ValueError("DNS name compression loop")
+    return ".".join(labels).lower(), end if end is not None else offset
+
+
+def decode_response(data: bytes) -> DnsMessage:
+    """
+    Decode a response message.
+
+    Args:
+        data: Wire-format message
+
+    Returns:
+        DnsMessage with the question and answer records
+
+    Raises:
+        ValueError: If the message is malformed
+    """
+    try:
+        query_id, flags, qdcount, ancount, _, _ = struct.unpack_from("!HHHHHH", data)
+        offset = 12
+        question = ""
+        for _ in range(qdcount):
+            question, offset = _read_name(data, offset)
+            offset += 4
+
+        answers = []
+        for _ in range(ancount):
+            name, offset = _read_name(data, offset)
+            rtype, _, ttl, rdlength = struct.unpack_from("!HHIH", data, offset)
+            offset += 10
+            rdata = data[offset:offset + rdlength]
+            if rtype == QTYPE_A and rdlength == 4:
+                value: object = socket.inet_ntop(socket.AF_INET, rdata)
+            elif rtype == QTYPE_AAAA and rdlength == 16:
+                value = socket.inet_ntop(socket.AF_INET6, rdata)
+            elif rtype == QTYPE_CNAME:
+                value = _read_name(data, offset)[0]
+            else:
+                value = rdata
+            answers.append((name, rtype, ttl, value))
+            offset += rdlength
+    except (struct.error, IndexError) as e:
+        raise ValueError(f"Malformed DNS message: {str(e)}")
+
+    return DnsMessage(query_id, flags & 0x000F, question, answers)
+
+
+def encode_response(query: bytes, addresses: Sequence[str] = (), rcode: int = RCODE_NOERROR, ttl: int = 60) -> bytes:
+    """
+    Build a response to a query, answering with A/AAAA records.
+
+    Used by local stand-in servers in tests and benchmarks.
+
+    Args:
+        query: Wire-format query
+        addresses: IPv4/IPv6 addresses to answer with
+        rcode: Response code
+        ttl: TTL of the records
+
+    Returns:
+        Wire-format response
+    """
+    query_id = struct.unpack_from("!H", query)[0]
+    _, offset = _read_name(query, 12)
+    question = query[12:offset + 4]
+
+    answers = bytearray()
+    for address in addresses:
+        packed = ipaddress.ip_address(address).packed
+        rtype = QTYPE_A if len(packed) == 4 else QTYPE_AAAA
+        # Name is a pointer to the question at offset 12
+        answers += struct.pack("!HHHIH", 0xC00C, rtype, 1, ttl, len(packed)) + packed
+
+    flags = 0x8180 | rcode  # QR, RD, RA
+    header = struct.pack("!HHHHHH", query_id, flags, 1, len(addresses), 0, 0)
+    return header + question + bytes(answers)
+
+
+def system_resolvers(path: str = "/etc/resolv.conf") -> List[str]:
+    """
+    Get the nameservers configured for the system.
+
+    Args:
+        path: resolv.conf to read
+
+    Returns:
+        List of nameserver addresses, or DEFAULT_RESOLVERS if none are configured
+    """
+    servers = []
+    try:
+        with open(path, "r") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0] == "nameserver":
+                    servers.append(parts[1])
+    except OSError:
+        pass
+    return servers or list(DEFAULT_RESOLVERS)
+
+
+def parse_resolver(value: str) -> Tuple[str, int]:
+    """
+    Parse a resolver address such as "1.1.1.1", "127.0.0.1:5353" or "[::1]:53".
+
+    Args:
+        value: Resolver address
+
+    Returns:
+        Tuple of (host, port)
+    """
+    value = value.strip()
+    if value.startswith("["):
+        host, _, port = value[1:].partition("]")
+        return host, int(port.lstrip(":") or 53)
+    if value.count(":") == 1:
+        host, port = value.split(":")
+        return host, int(port)
+    return value, 53
+
+
+class NegativeCache:
+    """
+    Names known not to exist (NXDOMAIN), shared by all lookups.
+
+    Brute forcing the same domain again (for another port, another module
+    or a later session) skips names that recently returned NXDOMAIN. The
+    cache can be saved to and loaded from a JSON file; entries expire
+    after their TTL.
+    """
+
+    def __init__(self, ttl: float = NEGATIVE_TTL, max_entries: int = 1_000_000):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds a name is remembered
+            max_entries: Entries kept; the ones expiring first are dropped beyond this
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._expiry: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._loaded_from: Optional[str] = None
+        self.hits = 0
+
+    def __contains__(self, name: str) -> bool:
+        expiry = self._expiry.get(name)
+        if expiry is None:
+            return False
+        if expiry < time.time():
+            with self._lock:
+                self._expiry.pop(name, None)
+            return False
+        self.hits += 1
+        return True
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+    def add(self, name: str) -> None:
+        """Remember that a name does not exist."""
+        with self._lock:
+            self._expiry[name] = time.time() + self.ttl
+            if len(self._expiry) > self.max_entries:
+                for old in sorted(self._expiry, key=self._expiry.get)[:len(self._expiry) // 10]:
+                    del self._expiry[old]
+
+    def discard(self, name: str) -> None:
+        """Forget a name, e.g. because it resolved after all."""
+        with self._lock:
+            self._expiry.pop(name, None)
+
+    def load(self, path: str) -> None:
+        """
+        Merge unexpired entries from a file saved with save(), once per path.
+
+        Args:
+            path: JSON file
+        """
+        if self._loaded_from == path:
+            return
+        self._loaded_from = path
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        with self._lock:
+            for name, expiry in saved.items():
+                if expiry > now and expiry > self._expiry.get(name, 0):
+                    self._expiry[name] = expiry
+
+    def save(self, path: str) -> None:
+        """
+        Write unexpired entries to a file.
+
+        Args:
+            path: JSON file
+        """
+        now = time.time()
+        with self._lock:
+            entries = {name: expiry for name, expiry in self._expiry.items() if expiry > now}
+        try:
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+
+# Shared by every resolver that is not given its own cache
+negative_cache = NegativeCache()
+
+
+class _UpstreamProtocol(asyncio.DatagramProtocol):
+    """Routes responses of one resolver socket to the waiting queries."""
+
+    def __init__(self, upstream: "_Upstream"):
+        self.upstream = upstream
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        try:
+            message = decode_response(data)
+        except ValueError:
+            return
+        pending = self.upstream.pending.get(message.query_id)
+        # Match the question too, so stray or spoofed answers are ignored
+        if pending and pending[0] == message.question and not pending[1].done():
+            pending[1].set_result(message)
+
+    def error_received(self, exc: Exception) -> None:
+        # ICMP errors (e.g. port unreachable); affected queries time out and retry
+        pass
+
+
+class _Upstream:
+    """One resolver: its socket, in-flight queries and rate limit."""
+
+    def __init__(self, address: Tuple[str, int], rate: Optional[float]):
+        self.address = address
+        self.rate = rate
+        self.tokens = 1.0
+        self.updated = 0.0
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        self.pending: Dict[int, Tuple[str, asyncio.Future]] = {}
+        self.sent = 0
+        self.timeouts = 0
+
+    async def open(self) -> None:
+        loop = asyncio.get_running_loop()
+        self.transport, _ = await loop.create_datagram_endpoint(
+            lambda: _UpstreamProtocol(self), remote_addr=self.address
+        )
+        self.updated = loop.time()
+
+    async def throttle(self) -> None:
+        """Wait for a token of the per-resolver rate limit (token bucket)."""
+        if not self.rate:
+            return
+        loop = asyncio.get_running_loop()
+        burst = max(1.0, self.rate / 10)
+        while True:
+            now = loop.time()
+            self.tokens = min(burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return
+            await asyncio.sleep((1.0 - self.tokens) / self.rate)
+
+    def new_query_id(self) -> int:
+        while True:
+            query_id = random.getrandbits(16)
+            if query_id not in self.pending:
+                return query_id
+
+
+class DnsResolver:
+    """
+    Asynchronous stub resolver with many queries in flight.
+
+    Lookups are spread round-robin over the resolvers. A lookup that
+    times out or gets SERVFAIL/REFUSED is retried on the next resolver
+    with an exponentially growing timeout. Each resolver has its own
+    rate limit, so a large wordlist does not flood a single server.
+
+    Usage::
+
+        async with DnsResolver(["127.0.0.1:5353"]) as resolver:
+            async for result in resolver.resolve_many(names):
+                ...
+    """
+
+    def __init__(
+        self,
+        resolvers: Optional[Sequence[str]] = None,
+        concurrency: int = 256,
+        rate: Optional[float] = 500.0,
+        timeout: float = 1.0,
+        retries: int = 3,
+        backoff: float = 2.0,
+        negative_cache: Optional[NegativeCache] = negative_cache,
+    ):
+        """
+        Initialize the resolver.
+
+        Args:
+            resolvers: Resolver addresses, defaults to the system resolvers
+            concurrency: Maximum number of lookups in flight
+            rate: Maximum queries per second per resolver, None for unlimited
+            timeout: Timeout of the first attempt in seconds
+            retries: Number of retries after the first attempt
+            backoff: Factor applied to the timeout on every retry
+            negative_cache: Cache of non-existent names, None to always query
+        """
+        addresses = [parse_resolver(r) for r in (resolvers or system_resolvers())]
+        self._upstreams = [_Upstream(address, rate) for address in addresses]
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.negative_cache = negative_cache
+        self._next = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def addresses(self) -> Tuple[Tuple[str, int], ...]:
+        """Addresses of the resolvers queried."""
+        return tuple(upstream.address for upstream in self._upstreams)
+
+    async def __aenter__(self) -> "DnsResolver":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    async def open(self) -> None:
+        """Open one UDP socket per resolver."""
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        for upstream in self._upstreams:
+            await upstream.open()
+
+    def close(self) -> None:
+        """Close the sockets; lookups still in flight time out."""
+        for upstream in self._upstreams:
+            if upstream.transport:
+                upstream.transport.close()
+                upstream.transport = None
+
+    async def resolve(self, name: str, qtype: int = QTYPE_A) -> DnsResult:
+        """
+        Resolve one name.
+
+        Args:
+            name: Domain name
+            qtype: Record type (QTYPE_A or QTYPE_AAAA)
+
+        Returns:
+            DnsResult with the addresses of the requested type
+        """
+        name = name.rstrip(".").lower()
+        try:
+            query_body = encode_query(0, name, qtype)[2:]
+        except ValueError:
+            return DnsResult(name, STATUS_ERROR)
+        if self.negative_cache is not None and name in self.negative_cache:
+            return DnsResult(name, STATUS_NXDOMAIN)
+
+        async with self._semaphore:
+            status = STATUS_TIMEOUT
+            first = self._next
+            self._next = (self._next + 1) % len(self._upstreams)
+            for attempt in range(self.retries + 1):
+                upstream = self._upstreams[(first + attempt) % len(self._upstreams)]
+                message = await self._query(upstream, name, query_body, self.timeout * self.backoff ** attempt)
+                if message is None:
+                    continue
+                if message.rcode == RCODE_NXDOMAIN:
+                    if self.negative_cache is not None:
+                        self.negative_cache.add(name)
+                    return DnsResult(name, STATUS_NXDOMAIN)
+                if message.rcode != RCODE_NOERROR:
+                    status = STATUS_ERROR
+                    continue
+                records = [(value, ttl) for _, rtype, ttl, value in message.answers if rtype == qtype]
+                return DnsResult(
+                    name, STATUS_OK,
+                    tuple(value for value, _ in records),
+                    min((ttl for _, ttl in records), default=0),
+                )
+            return DnsResult(name, status)
+
+    async def _query(self, upstream: _Upstream, name: str, query_body: bytes, timeout: float) -> Optional[DnsMessage]:
+        """Send one query and wait for the matching response, or None on timeout."""
+        await upstream.throttle()
+        if upstream.transport is None:
+            return None
+        query_id = upstream.new_query_id()
+        future = asyncio.get_running_loop().create_future()
+        upstream.pending[query_id] = (name, future)
+        try:
+            upstream.transport.sendto(struct.pack("!H", query_id) + query_body)
+            upstream.sent += 1
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            upstream.timeouts += 1
+            return None
+        finally:
+            upstream.pending.pop(query_id, None)
+
+    async def resolve_many(self, names: Iterable[str], qtype: int = QTYPE_A) -> AsyncIterator[DnsResult]:
+        """
+        Resolve names concurrently, yielding results as they complete.
+
+        Names are consumed lazily, so the iterable may be a large file.
+
+        Args:
+            names: Domain names
+            qtype: Record type
+
+        Yields:
+            DnsResult per name, in completion order
+        """
+        names = iter(names)
+        in_flight = set()
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(in_flight) < self.concurrency:
+                    name = next(names, None)
+                    if name is None:
+                        exhausted = True
+                        break
+                    in_flight.add(asyncio.ensure_future(self.resolve(name, qtype)))
+                if not in_flight:
+                    return
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get per-resolver counters.
+
+        Returns:
+            Dictionary of "host:port" to {"sent", "timeouts"}
+        """
+        return {
+            f"{host}:{port}": {"sent": upstream.sent, "timeouts": upstream.timeouts}
+            for upstream in self._upstreams
+            for host, port in [upstream.address]
+        }
+
+
+def random_label(length: int = 16) -> str:
+    """Get a random label that is practically certain not to exist."""
+    return "".join(random.choices(string.ascii_lowercase + string.digits, k=length))
+
+
+async def detect_wildcard(resolver: DnsResolver, domain: str, samples: int = 3) -> FrozenSet[str]:
+    """
+    Check whether a domain has wildcard DNS records.
+
+    Resolves A and AAAA records of random labels under the domain; any
+    answer means names that do not exist still resolve.
+
+    Args:
+        resolver: Open resolver
+        domain: Domain that will be brute forced
+        samples: Number of random labels to try
+
+    Returns:
+        Set of addresses the wildcard answers with (empty if there is none)
+    """
+    names = [f"{random_label()}.{domain}" for _ in range(samples)]
+    results = await asyncio.gather(*(
+        resolver.resolve(name, qtype) for name in names for qtype in (QTYPE_A, QTYPE_AAAA)
+    ))
+    return frozenset(address for result in results for address in result.addresses)
+
+
+class WildcardCache:
+    """
+    Wildcard DNS addresses per domain, detected once and shared.
+
+    Brute forcing the same domain for several ports reuses one detection.
+    Entries are scoped to the resolvers that answered (e.g. split-horizon
+    DNS gives different answers inside and outside a network) and expire
+    after their TTL, since wildcard records can change during a session.
+    """
+
+    def __init__(self, ttl: float = WILDCARD_TTL):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds a detection result is reused
+        """
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, Tuple[Tuple[str, int], ...]], Tuple[float, FrozenSet[str]]] = {}
+
+    async def detect(self, resolver: DnsResolver, domain: str) -> FrozenSet[str]:
+        """
+        Get the wildcard addresses of a domain, detecting them if not cached.
+
+        Args:
+            resolver: Open resolver
+            domain: Domain that will be brute forced
+
+        Returns:
+            Set of addresses the wildcard answers with (empty if there is none)
+        """
+        key = (domain.lower(), tuple(sorted(resolver.addresses)))
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.time():
+            return entry[1]
+        addresses = await detect_wildcard(resolver, domain)
+        self._entries[key] = (time.time() + self.ttl, addresses)
+        return addresses
+
+    def clear(self) -> None:
+        """Forget all detection results."""
+        self._entries.clear()
+
+
+# Shared by the brute force runs against every port
+wildcard_cache = WildcardCache()
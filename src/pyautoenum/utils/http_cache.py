@@ -0,0 +1,213 @@
+"""
+Per-scan HTTP response cache for PyAutoEnum.
+
+Several modules look at the same pages (most often the root page of a
+port). ResponseCache keeps responses keyed by method, URL, Host header
+and redirect handling, evicting the least recently used ones and
+expiring them after a TTL; concurrent requests for the same key wait
+for the one download in flight. parse_page() memoizes what modules
+extract from HTML (title, text, links, headers) by content hash, so a
+page is parsed with BeautifulSoup once no matter who asks; links are
+resolved against the URL of each response.
+"""
+
+import collections
+import hashlib
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+# Larger bodies are returned but not cached
+MAX_CACHED_BODY = 5 * 1024 * 1024
+
+
+class ParsedPage(NamedTuple):
+    """Artifacts extracted from an HTML page."""
+    title: str
+    text: str
+    links: Tuple[str, ...]  # Absolute URLs of <a href> and <link href>, in page order
+    headers: Dict[str, str]  # Response headers, names in lower case
+
+
+class _LruTtl:
+    """Thread-safe LRU mapping whose entries expire after ttl seconds."""
+
+    def __init__(self, max_entries: int, ttl: Optional[float]):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "collections.OrderedDict[Hashable, Tuple[float, Any]]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored, value = entry
+            if self.ttl is not None and time.monotonic() - stored > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ResponseCache:
+    """
+    LRU + TTL cache of HTTP responses and of pages parsed from them.
+
+    Only complete responses are cached; callers receive the same
+    response object, so they must not modify it.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: Optional[float] = 300.0, max_parsed: int = 256):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached responses
+            ttl: Seconds a response stays valid, None to keep it for the whole scan
+            max_parsed: Maximum number of parsed pages
+        """
+        self._responses = _LruTtl(max_entries, ttl)
+        self._parsed = _LruTtl(max_parsed, None)
+        self._in_flight: Dict[Hashable, threading.Event] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "parsed": 0, "parse_hits": 0}
+
+    @staticmethod
+    def key(method: str, url: str, headers: Optional[Dict[str, str]] = None, allow_redirects: bool = True) -> Tuple:
+        """
+        Build the cache key of a request.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            headers: Request headers (only Host is part of the key)
+            allow_redirects: Whether redirects are followed
+
+        Returns:
+            Hashable key
+        """
+        host = None
+        for name, value in (headers or {}).items():
+            if name.lower() == "host":
+                host = value
+        return method.upper(), url, host or urlparse(url).netloc, allow_redirects
+
+    def fetch(self, key: Hashable, fetcher: Callable[[], Any]) -> Any:
+        """
+        Get a cached response, or fetch and cache it.
+
+        If another thread is fetching the same key, this waits for it
+        instead of sending the request again.
+
+        Args:
+            key: Key from key()
+            fetcher: Sends the request and returns the response
+
+        Returns:
+            The response
+        """
+        while True:
+            response = self._responses.get(key)
+            if response is not None:
+                with self._lock:
+                    self.stats["hits"] += 1
+                return response
+            with self._lock:
+                waiter = self._in_flight.get(key)
+                if waiter is None:
+                    waiter = self._in_flight[key] = threading.Event()
+                    self.stats["misses"] += 1
+                    break
+            waiter.wait()
+            if self._responses.get(key) is None:
+                # The other request failed or was not cacheable: do our own
+                with self._lock:
+                    self.stats["misses"] += 1
+                return fetcher()
+
+        try:
+            response = fetcher()
+            if len(response.content) <= MAX_CACHED_BODY:
+                self._responses.put(key, response)
+            return response
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            waiter.set()
+
+    def parse_page(self, response: Any) -> ParsedPage:
+        """
+        Get the parsed artifacts of a response, parsing it only once per content.
+
+        Args:
+            response: requests.Response
+
+        Returns:
+            ParsedPage
+        """
+        content = response.content or b""
+        content_key = hashlib.sha1(content).hexdigest()
+        headers = {name.lower(): value for name, value in response.headers.items()}
+        base = getattr(response, "url", "") or ""
+        # The same body may be served at other URLs (default pages, catch-all
+        # 404s): the raw hrefs are cached and resolved for every response
+        entry = self._parsed.get(content_key)
+        if entry is not None:
+            with self._lock:
+                self.stats["parse_hits"] += 1
+        else:
+            from bs4 import BeautifulSoup
+
+            soup = BeautifulSoup(content, "html.parser")
+            hrefs = tuple(tag["href"] for tag in soup.find_all(["a", "link"], href=True))
+            entry = (soup.title.get_text(strip=True) if soup.title else "", soup.get_text(), hrefs)
+            self._parsed.put(content_key, entry)
+            with self._lock:
+                self.stats["parsed"] += 1
+        title, text, hrefs = entry
+        return ParsedPage(
+            title=title,
+            text=text,
+            links=tuple(dict.fromkeys(urljoin(base, href) for href in hrefs)),
+            headers=headers,
+        )
+
+    def clear(self) -> None:
+        """Drop all cached responses and pages, e.g. when a new scan starts."""
+        self._responses.clear()
+        self._parsed.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with "hits", "misses", "parsed", "parse_hits",
+            "responses" and "pages"
+        """
+        with self._lock:
+            stats = dict(self.stats)
+        stats["responses"] = len(self._responses)
+        stats["pages"] = len(self._parsed)
+        return stats
+
+
+# Shared by all modules of a scan
+response_cache = ResponseCache()
@@ -0,0 +1,215 @@
+"""
+Host liveness checks for PyAutoEnum.
+
+Many hosts drop ICMP echo requests, so waiting for a ping alone often
+costs the whole timeout. probe_host() sends an ICMP echo and TCP
+connects to a few common ports at the same time and returns as soon as
+any of them shows the host is up: an echo reply, an accepted connect or
+a refused one (a reset also comes from a live host). sweep() checks
+many hosts with bounded concurrency, e.g. a whole subnet.
+"""
+
+import asyncio
+import concurrent.futures
+import errno
+import ipaddress
+import socket
+import time
+from typing import AsyncIterator, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+# Ports that are open or at least answer with a reset on most hosts
+DEFAULT_PORTS = (80, 443, 22, 445, 3389, 135, 139, 21, 25, 8080)
+
+# Largest network sweep() accepts as a single target
+MAX_SWEEP_HOSTS = 65536
+
+_icmp_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+
+class Liveness(NamedTuple):
+    """Outcome of a liveness check."""
+    host: str
+    alive: bool
+    method: str = ""  # "icmp" or "tcp/<port>"
+    rtt: float = 0.0  # Seconds until the first answer
+
+
+def expand_targets(spec: str) -> Iterator[str]:
+    """
+    Expand a target specification into hosts.
+
+    Args:
+        spec: Comma-separated hosts, IP networks ("10.0.0.0/24") or
+            last-octet ranges ("10.0.0.1-20")
+
+    Yields:
+        Host names and addresses
+
+    Raises:
+        ValueError: If a network is larger than MAX_SWEEP_HOSTS
+    """
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "/" in part:
+            network = ipaddress.ip_network(part, strict=False)
+            if network.num_addresses > MAX_SWEEP_HOSTS:
+                raise ValueError(f"Network too large to sweep: {part}")
+            hosts = list(network.hosts()) or [network.network_address]
+            yield from (str(host) for host in hosts)
+            continue
+        base, sep, last = part.rpartition("-")
+        if sep and last.isdigit() and base.count(".") == 3:
+            try:
+                first = ipaddress.IPv4Address(base)
+            except ValueError:
+                yield part
+                continue
+            prefix, _, start = str(first).rpartition(".")
+            for octet in range(int(start), min(int(last), 255) + 1):
+                yield f"{prefix}.{octet}"
+            continue
+        yield part
+
+
+def _ping(host: str, timeout: float) -> bool:
+    """Send one ICMP echo request with ping3 (blocking)."""
+    try:
+        from ping3 import ping
+        # ping3 returns the delay in seconds, None on timeout and False on errors
+        return isinstance(ping(host, timeout=timeout), float)
+    except Exception:
+        return False
+
+
+async def _icmp(host: str, timeout: float) -> bool:
+    """Run a ping in a thread of a dedicated pool (never awaited at loop shutdown)."""
+    global _icmp_executor
+    if _icmp_executor is None:
+        _icmp_executor = concurrent.futures.ThreadPoolExecutor(max_workers=64, thread_name_prefix="icmp")
+    return await asyncio.get_running_loop().run_in_executor(_icmp_executor, _ping, host, timeout)
+
+
+async def _tcp(address: Tuple, family: int) -> bool:
+    """Connect to a port; accepted or refused both mean the host is up."""
+    loop = asyncio.get_running_loop()
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setblocking(False)
+    try:
+        await loop.sock_connect(sock, address)
+        return True
+    except ConnectionRefusedError:
+        return True
+    except OSError as e:
+        return e.errno == errno.ECONNREFUSED
+    finally:
+        sock.close()
+
+
+async def probe_host(
+    host: str,
+    ports: Sequence[int] = DEFAULT_PORTS,
+    timeout: float = 2.0,
+    icmp: bool = True,
+) -> Liveness:
+    """
+    Check whether a host is up, with all probes sent at once.
+
+    Args:
+        host: Hostname or IP address
+        ports: TCP ports to connect to
+        timeout: Seconds to wait for any answer
+        icmp: Also send an ICMP echo request (may need privileges)
+
+    Returns:
+        Liveness of the host, naming the first probe that answered
+    """
+    loop = asyncio.get_running_loop()
+    start = time.monotonic()
+    try:
+        infos = await asyncio.wait_for(loop.getaddrinfo(host, None, type=socket.SOCK_STREAM), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return Liveness(host, False)
+    family, _, _, _, sockaddr = infos[0]
+
+    probes = {}
+    for port in ports:
+        address = (sockaddr[0], int(port)) + tuple(sockaddr[2:])
+        probes[asyncio.ensure_future(_tcp(address, family))] = f"tcp/{port}"
+    if icmp:
+        probes[asyncio.ensure_future(_icmp(sockaddr[0], timeout))] = "icmp"
+
+    pending = set(probes)
+    try:
+        deadline = start + timeout
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if not task.cancelled() and task.exception() is None and task.result():
+                    return Liveness(host, True, probes[task], time.monotonic() - start)
+    finally:
+        for task in pending:
+            task.cancel()
+    return Liveness(host, False)
+
+
+async def sweep(
+    hosts: Iterable[str],
+    ports: Sequence[int] = DEFAULT_PORTS,
+    timeout: float = 2.0,
+    icmp: bool = True,
+    concurrency: int = 64,
+) -> AsyncIterator[Liveness]:
+    """
+    Check many hosts, yielding results as they complete.
+
+    Args:
+        hosts: Hosts to check (consumed lazily)
+        ports: TCP ports to connect to on each host
+        timeout: Seconds to wait for each host
+        icmp: Also send ICMP echo requests
+        concurrency: Maximum number of hosts probed at once
+
+    Yields:
+        Liveness per host, in completion order
+    """
+    hosts = iter(hosts)
+    in_flight = set()
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(in_flight) < concurrency:
+                host = next(hosts, None)
+                if host is None:
+                    exhausted = True
+                    break
+                in_flight.add(asyncio.ensure_future(probe_host(host, ports, timeout, icmp)))
+            if not in_flight:
+                return
+            done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in in_flight:
+            task.cancel()
+
+
+def live_hosts(spec: str, **kwargs) -> List[str]:
+    """
+    Sweep a target specification and return the hosts that are up.
+
+    Args:
+        spec: Targets, see expand_targets()
+        **kwargs: Arguments of sweep()
+
+    Returns:
+        Live hosts, sorted
+    """
+    async def collect() -> List[str]:
+        return [result.host async for result in sweep(expand_targets(spec), **kwargs) if result.alive]
+
+    return sorted(asyncio.run(collect()))
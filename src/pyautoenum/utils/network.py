@@ -1,14 +1,236 @@
-"""Network utility functions for PyAutoEnum."""
+"""
+Network utility functions for PyAutoEnum.
 
+requests, BeautifulSoup and ping3 are imported inside the functions that
+use them, so importing this module (e.g. for is_ip_address during
+argument handling) stays cheap.
+
+All HTTP requests of the built-in modules go through ``http_client``,
+which keeps connections alive and reuses TLS sessions.
+"""
+
+import hashlib
 import re
 import shutil
-import socket
+import ssl
+import threading
+import weakref
+from typing import Any, Dict, NamedTuple, Optional, Tuple
 from urllib.parse import urlparse
 
-import requests
-import urllib3
-from bs4 import BeautifulSoup
-from ping3 import ping
+from pyautoenum.utils.http_cache import response_cache
+
+_ssl_warnings_disabled = False
+
+
+def disable_ssl_warnings():
+    """Silence urllib3 warnings about unverified HTTPS requests (once)."""
+    global _ssl_warnings_disabled
+    if not _ssl_warnings_disabled:
+        import urllib3
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        _ssl_warnings_disabled = True
+
+
+class _ResumingSSLContext(ssl.SSLContext):
+    """
+    Client SSLContext that resumes TLS sessions per server.
+
+    The session of the last connection to a server is offered when the
+    next connection to it is made, so new pooled connections get an
+    abbreviated handshake. The live socket is asked first because TLS 1.3
+    session tickets only arrive after the handshake.
+    """
+
+    def __init__(self, *args, **kwargs):
+        # SSLContext is set up in __new__
+        self._sessions: Dict[Tuple[Any, ...], Tuple[Any, Optional[ssl.SSLSession]]] = {}
+        self._sessions_lock = threading.Lock()
+        self.handshakes = 0
+        self.resumed = 0
+
+    def wrap_socket(self, sock, *args, server_hostname=None, session=None, **kwargs):
+        try:
+            key = (server_hostname, sock.getpeername())
+        except OSError:
+            key = None
+        if session is None and key is not None:
+            session = self._session_for(key)
+
+        try:
+            ssl_sock = super().wrap_socket(sock, *args, server_hostname=server_hostname, session=session, **kwargs)
+        except ssl.SSLError:
+            # The socket is gone; forget the session so the next connection does a full handshake
+            if session is not None and key is not None:
+                with self._sessions_lock:
+                    self._sessions.pop(key, None)
+            raise
+
+        with self._sessions_lock:
+            self.handshakes += 1
+            self.resumed += bool(ssl_sock.session_reused)
+            if key is not None:
+                self._sessions[key] = (weakref.ref(ssl_sock), ssl_sock.session)
+        return ssl_sock
+
+    def _session_for(self, key: Tuple[Any, ...]) -> Optional[ssl.SSLSession]:
+        with self._sessions_lock:
+            entry = self._sessions.get(key)
+        if entry is None:
+            return None
+        sock_ref, session = entry
+        sock = sock_ref()
+        try:
+            live_session = sock.session if sock is not None else None
+        except (OSError, ValueError, AttributeError):
+            live_session = None
+        return live_session or session
+
+
+class HttpClient:
+    """
+    Shared, thread-safe HTTP client with keep-alive connection pools.
+
+    Connections are pooled per (scheme, host, port) by urllib3; at most
+    ``pool_maxsize`` connections per pool are open at once (further
+    requests wait for a free one) and ``pool_connections`` pools are
+    kept. TLS sessions are resumed when a new connection to a known
+    server is needed. Each thread gets its own requests.Session (cookies
+    are not shared), all mounted on the same adapter and thus the same
+    pools.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 64,
+        pool_maxsize: int = 16,
+        timeout: float = 5,
+        verify: bool = False,
+    ):
+        """
+        Initialize the client. requests is imported on first use.
+
+        Args:
+            pool_connections: Number of (scheme, host, port) pools kept
+            pool_maxsize: Maximum connections per pool
+            timeout: Default timeout in seconds
+            verify: Verify TLS certificates
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.verify = verify
+        self.requests = 0
+        self._adapter = None
+        self._ssl_context: Optional[_ResumingSSLContext] = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _get_adapter(self):
+        """Create the shared adapter (and TLS context) once."""
+        with self._lock:
+            if self._adapter is None:
+                from requests.adapters import HTTPAdapter
+
+                context = _ResumingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+                if self.verify:
+                    context.load_default_certs()
+                else:
+                    context.check_hostname = False
+                    context.verify_mode = ssl.CERT_NONE
+                self._ssl_context = context
+
+                class _Adapter(HTTPAdapter):
+                    def init_poolmanager(self, *args, **kwargs):
+                        kwargs["ssl_context"] = context
+                        super().init_poolmanager(*args, **kwargs)
+
+                self._adapter = _Adapter(
+                    pool_connections=self.pool_connections,
+                    pool_maxsize=self.pool_maxsize,
+                    pool_block=True,
+                )
+            return self._adapter
+
+    @property
+    def session(self):
+        """The calling thread's requests.Session."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            import requests
+
+            if not self.verify:
+                disable_ssl_warnings()
+            adapter = self._get_adapter()
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._local.session = session
+        return session
+
+    def request(self, method: str, url: str, cache: bool = False, **kwargs):
+        """
+        Send a request on a pooled connection.
+
+        Args:
+            method: HTTP method
+            url: URL to request
+            cache: Answer GET/HEAD requests from the per-scan response_cache
+                (the returned response is shared and must not be modified)
+            **kwargs: Arguments of requests.Session.request (timeout and
+                verify default to the client settings)
+
+        Returns:
+            requests.Response
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        # Passed per request, or REQUESTS_CA_BUNDLE would override session.verify
+        kwargs.setdefault("verify", self.verify)
+
+        def send():
+            with self._lock:
+                self.requests += 1
+            return self.session.request(method, url, **kwargs)
+
+        if cache and method.upper() in ("GET", "HEAD") and not kwargs.get("stream"):
+            key = response_cache.key(
+                method, url, kwargs.get("headers"), kwargs.get("allow_redirects", True)
+            )
+            return response_cache.fetch(key, send)
+        return send()
+
+    def get(self, url: str, **kwargs):
+        """Send a GET request (see request())."""
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs):
+        """Send a HEAD request (see request())."""
+        kwargs.setdefault("allow_redirects", False)
+        return self.request("HEAD", url, **kwargs)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get request and TLS handshake counters.
+
+        Returns:
+            Dictionary with "requests", "tls_handshakes" and "tls_resumed"
+        """
+        context = self._ssl_context
+        return {
+            "requests": self.requests,
+            "tls_handshakes": context.handshakes if context else 0,
+            "tls_resumed": context.resumed if context else 0,
+        }
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        with self._lock:
+            if self._adapter is not None:
+                self._adapter.close()
+
+
+# Shared client used by all built-in modules
+http_client = HttpClient()
 
 
 def get_hostname_from_header(ip, port, protocol="http"):
@@ -25,7 +247,7 @@ def get_hostname_from_header(ip, port, protocol="http"):
     """
     try:
         url = f"{protocol}://{ip}:{port}"
-        response = requests.head(url, timeout=1, verify=False)
+        response = http_client.head(url, timeout=1, cache=True)
         if "location" in response.headers:
             location = response.headers["location"]
             parsed_url = urlparse(location)
@@ -49,23 +271,28 @@ def get_hostname_from_url(url):
     return parsed_url.hostname if parsed_url.hostname else None
 
 
-def check_target_up(ip):
+def check_target_up(ip, ports=None, timeout=2.0):
     """
-    Check if a target responds to ping.
+    Check if a target is up.
+    
+    An ICMP echo request and TCP connects to common ports are sent at
+    once; the first answer wins (see pyautoenum.utils.liveness).
     
     Args:
-        ip: IP address to check
+        ip: IP address or hostname to check
+        ports: TCP ports to probe (default: liveness.DEFAULT_PORTS)
+        timeout: Seconds to wait for any answer
         
     Returns:
         Boolean indicating if target responded
     """
+    import asyncio
+
+    from pyautoenum.utils.liveness import DEFAULT_PORTS, probe_host
     
     try:
-        response = ping(ip, timeout=5)
-        
-        return response is not None
-    except Exception as e:
-        
+        return asyncio.run(probe_host(ip, ports or DEFAULT_PORTS, timeout)).alive
+    except Exception:
         return False
 
 
@@ -106,18 +333,74 @@ def check_http_connection(protocol, ip, port, timeout=5):
         timeout: Connection timeout in seconds
         
     Returns:
-        Boolean indicating if connection succeeded
+        Boolean indicating if an HTTP response (of any status) was received
     """
+    import requests
+    
     try:
         url = f"{protocol}://{ip}:{port}"
-        response = requests.get(url, timeout=timeout, verify=False)
-        # Consider any 2xx status code as a successful response
-        return response.ok
+        http_client.get(url, timeout=timeout, cache=True)
+        # Any HTTP status means an HTTP server answered
+        return True
     except (requests.ConnectionError, requests.Timeout, requests.RequestException):
         pass
     return False
 
 
+class HttpSignature(NamedTuple):
+    """Coarse fingerprint of an HTTP response, for spotting catch-all responses."""
+    status: int
+    length: int
+    digest: str
+
+    def matches(self, other: Optional["HttpSignature"]) -> bool:
+        """
+        Check whether two responses are most likely the same page.
+
+        Same status and either the same body, or a body length within 2%
+        (pages that embed e.g. a timestamp or request ID).
+
+        Args:
+            other: Signature to compare with
+
+        Returns:
+            Boolean indicating if the responses match
+        """
+        if other is None or self.status != other.status:
+            return False
+        if self.digest == other.digest:
+            return True
+        return abs(self.length - other.length) <= max(16, self.length // 50)
+
+
+def http_response_signature(protocol, host, port, timeout=5) -> Optional[HttpSignature]:
+    """
+    Fetch the root page of a host and fingerprint the response.
+    
+    The host name is removed from the body first, so catch-all pages
+    that echo the requested name still produce the same signature.
+    
+    Args:
+        protocol: Protocol to use (http/https)
+        host: Hostname or IP address
+        port: Port number
+        timeout: Connection timeout in seconds
+        
+    Returns:
+        HttpSignature, or None if the request failed
+    """
+    import requests
+    
+    try:
+        response = http_client.get(
+            f"{protocol}://{host}:{port}", timeout=timeout, allow_redirects=False, cache=True
+        )
+    except requests.RequestException:
+        return None
+    body = response.content.replace(host.encode("utf-8"), b"")
+    return HttpSignature(response.status_code, len(body), hashlib.sha1(body).hexdigest())
+
+
 def truncate_value(value, width):
     """
     Truncate a string to fit within a given width.
@@ -159,8 +442,8 @@ def is_default_page(response):
         Boolean indicating if it's likely a default page
     """
     try:
-        soup = BeautifulSoup(response.content, "html.parser")
-        headers = response.headers
+        page = response_cache.parse_page(response)
+        headers = page.headers
         
         # Common keywords in default pages
         default_page_keywords = [
@@ -169,21 +452,20 @@ def is_default_page(response):
         ]
         
         # Check page title
-        title = soup.title.text.lower() if soup.title else ""
+        title = page.title.lower()
         if any(keyword in title for keyword in default_page_keywords):
             return True
             
         # Check common server headers
-        server = headers.get("Server", "").lower()
-        if server and not any(cms in server.lower() for cms in ["wordpress", "drupal", "joomla"]):
-            body_text = soup.get_text().lower()
+        body_text = page.text.lower()
+        server = headers.get("server", "").lower()
+        if server and not any(cms in server for cms in ["wordpress", "drupal", "joomla"]):
             if any(keyword in body_text for keyword in default_page_keywords):
                 return True
                 
         # Check for minimal content
-        content_length = int(headers.get("Content-Length", "0"))
+        content_length = int(headers.get("content-length", "0"))
         if content_length < 1000:  # Small pages are often default pages
-            body_text = soup.get_text().lower()
             word_count = len(body_text.split())
             if word_count < 50:  # Few words often indicates a default page
                 return True
@@ -0,0 +1,635 @@
+"""
+Streaming nmap runs for PyAutoEnum.
+
+nmap is started with XML output on a pipe, verbose interactive output
+on stdout (``-v``) and periodic progress reports (``--stats-every``).
+Both streams are read while nmap runs, instead of waiting for the
+process to exit and parsing the whole document:
+
+- every "Discovered open port" line of the interactive output is handed
+  to the caller right away, as nmap finds the port
+- the XML is parsed incrementally; a ``<port>`` with the service details
+  is handed out when nmap writes it (when its host is finished), and
+  ``<taskprogress>`` reports become a progress percentage
+"""
+
+import collections
+import concurrent.futures
+import contextlib
+import os
+import re
+import selectors
+import shutil
+import subprocess
+import tempfile
+import threading
+import xml.etree.ElementTree as ElementTree
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+# nmap task names of the service/version detection phase
+SERVICE_SCAN_TASKS = ("Service scan",)
+
+# Options that enable version detection
+VERSION_OPTIONS = ("-sV", "-A")
+
+# Interactive output line of a port found during the scan, e.g.
+# "Discovered open port 22/tcp on 10.0.0.1" or "... on host.lan (10.0.0.1)"
+_DISCOVERED = re.compile(r"^Discovered (\S+) port (\d+)/(\w+) on (?:\S+ \()?([^\s()]+)\)?\s*$")
+
+# Verbosity options ("-v", "-vv", ...)
+_VERBOSE = re.compile(r"^-v+$")
+
+# How often a running scan checks whether it should stop, in seconds
+STOP_POLL_INTERVAL = 0.5
+
+# nmap processes that are still running, for terminate_running()
+_processes: Set[subprocess.Popen] = set()
+_processes_lock = threading.Lock()
+
+
+def terminate_running() -> None:
+    """
+    Terminate all nmap processes started by run_nmap that are still running.
+
+    run_nmap then sees the end of the output and returns what it got so far.
+    """
+    with _processes_lock:
+        processes = list(_processes)
+    for process in processes:
+        if process.poll() is None:
+            try:
+                process.terminate()
+            except OSError:
+                pass
+
+
+def parse_port(element: ElementTree.Element) -> Optional[Dict[str, Any]]:
+    """
+    Convert a ``<port>`` element into port data.
+
+    Args:
+        element: The port element
+
+    Returns:
+        Dictionary with "port", "transport", "state", "reason", "protocol",
+        "product", "version" and "method" ("probed" if version detection
+        identified the service), or None if the element is incomplete
+    """
+    number = element.get("portid")
+    state = element.find("state")
+    if number is None or state is None:
+        return None
+    service = element.find("service")
+    service_attrs = service.attrib if service is not None else {}
+    name = service_attrs.get("name", "")
+    if service_attrs.get("tunnel") == "ssl" and name == "http":
+        name = "https"
+    return {
+        "port": number,
+        "transport": element.get("protocol", "tcp"),
+        "state": state.get("state", ""),
+        "reason": state.get("reason", ""),
+        "protocol": name,
+        "product": service_attrs.get("product", ""),
+        "version": service_attrs.get("version", ""),
+        "method": service_attrs.get("method", ""),
+    }
+
+
+def parse_discovered(line: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Convert a "Discovered open port" line of nmap's interactive output.
+
+    Args:
+        line: Line of nmap's verbose output
+
+    Returns:
+        (host address, port data) with the same keys as parse_port() but
+        no service details yet, or None for other lines
+    """
+    match = _DISCOVERED.match(line)
+    if not match:
+        return None
+    state, number, transport, address = match.groups()
+    return address, {
+        "port": number,
+        "transport": transport,
+        "state": state,
+        "reason": "",
+        "protocol": "",
+        "product": "",
+        "version": "",
+        "method": "",
+    }
+
+
+class NmapProgress:
+    """
+    Overall progress from nmap's per-phase ``<taskprogress>`` reports.
+
+    Every phase reports its own 0-100%. With version detection, the port
+    scan counts as the first half and the service scan as the second;
+    other phases (host discovery, DNS, scripts) are not counted. The
+    result never goes backwards.
+    """
+
+    def __init__(self, arguments: Sequence[str]):
+        """
+        Initialize the tracker.
+
+        Args:
+            arguments: nmap arguments of the run
+        """
+        self.version_detection = any(arg in VERSION_OPTIONS for arg in arguments)
+        self.percent = 0.0
+
+    def update(self, task: str, percent: float) -> float:
+        """
+        Account for a progress report.
+
+        Args:
+            task: nmap task name, e.g. "SYN Stealth Scan"
+            percent: Percentage of that task done
+
+        Returns:
+            Overall percentage
+        """
+        if task in SERVICE_SCAN_TASKS:
+            overall = 50.0 + percent / 2 if self.version_detection else None
+        elif task.endswith(" Scan") and "Ping" not in task:
+            overall = percent / 2 if self.version_detection else percent
+        else:
+            overall = None
+        if overall is not None:
+            self.percent = max(self.percent, min(99.0, overall))
+        return self.percent
+
+
+def run_nmap(
+    target: str,
+    arguments: Sequence[str],
+    on_port: Callable[[str, Dict[str, Any]], None],
+    on_progress: Optional[Callable[[float], None]] = None,
+    stats_every: str = "5s",
+    on_extraports: Optional[Callable[[str, str, int, Dict[str, int]], None]] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> List[str]:
+    """
+    Run nmap and stream its results.
+
+    An open port is usually reported twice: as soon as nmap finds it
+    (from the verbose output, without service details) and again with
+    the details from the XML output.
+
+    Args:
+        target: Host(s) to scan
+        arguments: nmap arguments (output options are added)
+        on_port: Called with (host address, port data) for every port
+        on_progress: Called with the overall percentage on progress reports
+        stats_every: Interval of nmap's progress reports
+        on_extraports: Called with (host address, state, count, reason counts)
+            for ports nmap summarizes instead of listing them
+        should_stop: Polled while nmap runs; nmap is terminated once it returns True
+
+    Returns:
+        Lines nmap wrote to stderr (warnings and errors)
+
+    Raises:
+        FileNotFoundError: If nmap is not installed
+    """
+    executable = shutil.which("nmap")
+    if not executable:
+        raise FileNotFoundError("nmap")
+
+    verbose = [] if any(_VERBOSE.match(argument) for argument in arguments) else ["-v"]
+    # XML goes to a pipe of its own, stdout carries the interactive output
+    xml_read, xml_write = os.pipe()
+    argv = [
+        executable, *arguments, *verbose,
+        "-oX", f"/dev/fd/{xml_write}", "--stats-every", stats_every, target,
+    ]
+    progress = NmapProgress(arguments)
+    parser = ElementTree.XMLPullParser(events=("end",))
+    address = target
+
+    def handle_xml() -> None:
+        nonlocal address
+        for _, element in parser.read_events():
+            tag = element.tag
+            if tag == "address" and element.get("addrtype") in ("ipv4", "ipv6"):
+                address = element.get("addr", address)
+            elif tag == "port":
+                port_data = parse_port(element)
+                if port_data:
+                    on_port(address, port_data)
+                element.clear()
+            elif tag == "extraports" and on_extraports:
+                reasons = {
+                    reason.get("reason", ""): int(reason.get("count", "0"))
+                    for reason in element.iter("extrareasons")
+                }
+                on_extraports(address, element.get("state", ""), int(element.get("count", "0")), reasons)
+            elif tag == "taskprogress" and on_progress:
+                try:
+                    percent = float(element.get("percent", "0"))
+                except ValueError:
+                    continue
+                on_progress(progress.update(element.get("task", ""), percent))
+            elif tag == "host":
+                # Ports were handed out already; keep memory flat on big runs
+                element.clear()
+
+    # stderr goes to a file, so a chatty nmap cannot block on a full pipe
+    error_file = tempfile.TemporaryFile()
+    try:
+        process = subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=error_file, pass_fds=(xml_write,))
+    except BaseException:
+        os.close(xml_read)
+        error_file.close()
+        raise
+    finally:
+        os.close(xml_write)
+    with _processes_lock:
+        _processes.add(process)
+    selector = selectors.DefaultSelector()
+    selector.register(process.stdout.fileno(), selectors.EVENT_READ, False)
+    selector.register(xml_read, selectors.EVENT_READ, True)
+    text = b""
+    try:
+        while selector.get_map():
+            if should_stop and should_stop() and process.poll() is None:
+                process.terminate()
+            for key, _ in selector.select(STOP_POLL_INTERVAL if should_stop else None):
+                chunk = os.read(key.fd, 65536)
+                if not chunk:
+                    selector.unregister(key.fd)
+                elif key.data:
+                    parser.feed(chunk)
+                    handle_xml()
+                else:
+                    *lines, text = (text + chunk).split(b"\n")
+                    for line in lines:
+                        discovered = parse_discovered(line.decode("utf-8", "replace"))
+                        if discovered:
+                            on_port(*discovered)
+        try:
+            parser.close()
+        except ElementTree.ParseError:
+            # A terminated nmap leaves its XML unfinished
+            if process.wait() >= 0:
+                raise
+        handle_xml()
+    finally:
+        selector.close()
+        os.close(xml_read)
+        process.stdout.close()
+        if process.poll() is None:
+            # Left early (callback error or interrupt): nmap must not outlive us
+            process.terminate()
+        process.wait()
+        with _processes_lock:
+            _processes.discard(process)
+        error_file.seek(0)
+        errors = error_file.read().decode("utf-8", "replace").splitlines()
+        error_file.close()
+    return errors
+
+
+# Shards are never smaller than this many ports
+MIN_SHARD_PORTS = 256
+
+# Chunks per parallel shard, so the number of shards can change during a scan
+CHUNKS_PER_SHARD = 4
+
+
+class ScanBudget:
+    """
+    Limits shared by all nmap processes of PyAutoEnum.
+
+    At most ``processes`` nmap processes run at once, whichever module
+    started them. Processes with a packet rate limit also share one rate
+    budget: nmap cannot change --max-rate while it runs, so a process gets
+    its share when it starts, an equal part of the budget among the
+    processes running at that moment (or that its caller runs at once),
+    and waits while the running ones use up too much of it.
+    """
+
+    def __init__(self, processes: Optional[int] = None, max_rate: Optional[int] = None):
+        """
+        Initialize the budget.
+
+        Args:
+            processes: Maximum number of nmap processes, defaults to the CPU count
+            max_rate: Packets per second of all nmap processes together, unlimited by default
+        """
+        self.processes = processes or os.cpu_count() or 1
+        self.max_rate = max_rate
+        self._slots = threading.BoundedSemaphore(self.processes)
+        self._rates: List[int] = []
+        self._rates_changed = threading.Condition()
+
+    @property
+    def rates(self) -> List[int]:
+        """Packet rates of the running rate-limited processes."""
+        with self._rates_changed:
+            return list(self._rates)
+
+    def _take_rate(self, max_rate: int, parallel: int) -> int:
+        with self._rates_changed:
+            while True:
+                fair = max(1, max_rate // max(len(self._rates) + 1, parallel))
+                share = min(fair, max_rate - sum(self._rates))
+                # A sliver of the budget is not worth starting with
+                if not self._rates or share >= max(1, fair // 2):
+                    break
+                self._rates_changed.wait()
+            share = max(1, share)
+            self._rates.append(share)
+            return share
+
+    def _release_rate(self, share: int) -> None:
+        with self._rates_changed:
+            self._rates.remove(share)
+            self._rates_changed.notify_all()
+
+    @contextlib.contextmanager
+    def slot(self, max_rate: Optional[int] = None, parallel: int = 1) -> Iterator[Optional[int]]:
+        """
+        Hold one process slot and, if the rate is limited, a share of the rate budget.
+
+        Args:
+            max_rate: Packets per second of the caller's processes together,
+                limited further by the budget's own max_rate
+            parallel: Number of processes the caller runs at once
+
+        Yields:
+            Packets per second the process may send, or None if unlimited
+        """
+        limits = [rate for rate in (self.max_rate, max_rate) if rate]
+        with self._slots:
+            if not limits:
+                yield None
+                return
+            share = self._take_rate(min(limits), parallel)
+            try:
+                yield share
+            finally:
+                self._release_rate(share)
+
+
+nmap_budget = ScanBudget()
+
+
+class ShardController:
+    """
+    Number of nmap shards run at once, adapted to observed packet loss.
+
+    Ports that got no response at all are counted per shard. The lowest
+    no-response ratio seen so far is the baseline (the target's really
+    filtered ports); a shard well above it suggests probes or replies
+    were dropped because too much was sent at once, so the number of
+    parallel shards is halved and the shard is scanned again.
+
+    Like TCP slow start, the first shard runs alone so the baseline is
+    measured without competition, and the limit doubles with every clean
+    shard until the first loss; after that it grows by one per clean
+    shard, up to the maximum.
+    """
+
+    # A shard is lossy above baseline + LOSS_MARGIN and twice the baseline
+    LOSS_MARGIN = 0.05
+
+    def __init__(self, max_shards: int):
+        """
+        Initialize the controller.
+
+        Args:
+            max_shards: Maximum number of shards run at once
+        """
+        self.max_shards = max(1, max_shards)
+        self.limit = 1
+        self.baseline: Optional[float] = None
+        self.losses = 0
+        self._lock = threading.Lock()
+
+    def record(self, ports: int, no_response: int) -> bool:
+        """
+        Account for a finished shard.
+
+        Args:
+            ports: Number of ports the shard scanned
+            no_response: Number of those that got no response
+
+        Returns:
+            True if the shard looks lossy and should be scanned again
+        """
+        ratio = no_response / max(1, ports)
+        with self._lock:
+            if self.baseline is None or ratio < self.baseline:
+                self.baseline = ratio
+                lossy = False
+            else:
+                lossy = ratio > self.baseline + self.LOSS_MARGIN and ratio > 2 * self.baseline
+            if lossy:
+                self.losses += 1
+                self.limit = max(1, self.limit // 2)
+            elif self.losses:
+                self.limit = min(self.max_shards, self.limit + 1)
+            else:
+                self.limit = min(self.max_shards, self.limit * 2)
+        return lossy
+
+
+def format_ports(ports: Sequence[int]) -> str:
+    """Format sorted ports as an nmap -p list, collapsing runs ("1-1024,8080")."""
+    parts = []
+    start = previous = None
+    for port in ports:
+        if previous is not None and port == previous + 1:
+            previous = port
+            continue
+        if start is not None:
+            parts.append(str(start) if start == previous else f"{start}-{previous}")
+        start = previous = port
+    if start is not None:
+        parts.append(str(start) if start == previous else f"{start}-{previous}")
+    return ",".join(parts)
+
+
+def split_port_option(arguments: Sequence[str]) -> Tuple[Optional[str], List[str]]:
+    """
+    Take the -p option out of nmap arguments.
+
+    Args:
+        arguments: nmap arguments
+
+    Returns:
+        (port specification or None, remaining arguments)
+    """
+    spec = None
+    remaining: List[str] = []
+    arguments = list(arguments)
+    index = 0
+    while index < len(arguments):
+        argument = arguments[index]
+        if argument == "-p" and index + 1 < len(arguments):
+            spec = arguments[index + 1]
+            index += 2
+            continue
+        if argument.startswith("-p") and len(argument) > 2:
+            # "-p22,80" or "-p-" (all ports)
+            spec = argument[2:]
+        else:
+            remaining.append(argument)
+        index += 1
+    return spec, remaining
+
+
+def split_output_option(arguments: Sequence[str]) -> Tuple[Optional[str], List[str]]:
+    """
+    Take the -oN (normal output file) option out of nmap arguments.
+
+    Args:
+        arguments: nmap arguments
+
+    Returns:
+        (output file or None, remaining arguments)
+    """
+    path = None
+    remaining: List[str] = []
+    arguments = list(arguments)
+    index = 0
+    while index < len(arguments):
+        argument = arguments[index]
+        if argument == "-oN" and index + 1 < len(arguments):
+            path = arguments[index + 1]
+            index += 2
+            continue
+        if argument.startswith("-oN") and len(argument) > 3:
+            path = argument[3:]
+        else:
+            remaining.append(argument)
+        index += 1
+    return path, remaining
+
+
+def run_sharded_nmap(
+    target: str,
+    arguments: Sequence[str],
+    ports: Sequence[int],
+    on_port: Callable[[str, Dict[str, Any]], None],
+    on_progress: Optional[Callable[[float], None]] = None,
+    max_shards: Optional[int] = None,
+    max_rate: Optional[int] = None,
+    budget: ScanBudget = nmap_budget,
+    normal_output: Optional[str] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> List[str]:
+    """
+    Scan ports with parallel nmap processes, each on a shard of the ports.
+
+    The ports are split into chunks that are scanned by up to max_shards
+    nmap processes at once (see ShardController for how that number
+    adapts), each holding a slot and a share of the packet rate of the
+    global budget. Results of every
+    shard are streamed through on_port as they arrive; a chunk that
+    looked lossy is scanned once more.
+
+    Args:
+        target: Host to scan
+        arguments: nmap arguments without -p
+        ports: Ports to scan
+        on_port: Called with (host address, port data) for every port
+        on_progress: Called with the overall percentage
+        max_shards: Maximum number of parallel shards, defaults to the budget's processes
+        max_rate: Packets per second for the whole scan, shared with all other
+            rate-limited nmap processes through the budget
+        normal_output: File receiving nmap's normal output (-oN); every chunk
+            writes its own part, joined in port order at the end
+        should_stop: Polled while scanning; once it returns True running
+            shards are terminated and no further chunks are started
+
+    Returns:
+        Lines the nmap processes wrote to stderr
+    """
+    ports = sorted(set(ports))
+    max_shards = max(1, min(max_shards or budget.processes, len(ports) // MIN_SHARD_PORTS or 1))
+    chunk_count = 1 if max_shards == 1 else min(max_shards * CHUNKS_PER_SHARD, max(1, len(ports) // MIN_SHARD_PORTS))
+    chunk_size = -(-len(ports) // chunk_count)
+    pending = collections.deque(
+        (number, ports[start:start + chunk_size], False)
+        for number, start in enumerate(range(0, len(ports), chunk_size))
+    )
+    controller = ShardController(max_shards)
+    chunk_progress: Dict[int, float] = {}
+    progress_lock = threading.Lock()
+    reported = [0.0]
+    errors: List[str] = []
+
+    def report(number: int, percent: float) -> None:
+        if not on_progress:
+            return
+        with progress_lock:
+            chunk_progress[number] = percent
+            sizes = [(len(chunk), chunk_progress.get(chunk_number, 0.0)) for chunk_number, chunk in chunks.items()]
+            overall = sum(size * done for size, done in sizes) / max(1, len(ports))
+            reported[0] = max(reported[0], min(99.0, overall))
+            value = reported[0]
+        on_progress(value)
+
+    def run_chunk(number: int, chunk: List[int]) -> Tuple[bool, List[str]]:
+        no_response = [0]
+
+        def count_port(address: str, port_data: Dict[str, Any]) -> None:
+            if port_data.get("reason") == "no-response":
+                no_response[0] += 1
+            on_port(address, port_data)
+
+        def count_extraports(address: str, state: str, count: int, reasons: Dict[str, int]) -> None:
+            no_response[0] += reasons.get("no-response", 0)
+
+        shard_arguments = list(arguments) + ["-p", format_ports(chunk)]
+        if normal_output:
+            shard_arguments += ["-oN", f"{normal_output}.{number}"]
+        with budget.slot(max_rate, controller.limit) as rate:
+            if rate:
+                shard_arguments += ["--max-rate", str(rate)]
+            chunk_errors = run_nmap(
+                target, shard_arguments, count_port,
+                lambda percent: report(number, percent),
+                on_extraports=count_extraports,
+                should_stop=should_stop,
+            )
+        return controller.record(len(chunk), no_response[0]), chunk_errors
+
+    chunks = {number: chunk for number, chunk, _ in pending}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_shards) as executor:
+        running: Dict[concurrent.futures.Future, Tuple[int, List[int], bool]] = {}
+        while pending or running:
+            if should_stop and should_stop():
+                pending.clear()
+            while pending and len(running) < controller.limit:
+                number, chunk, retried = pending.popleft()
+                running[executor.submit(run_chunk, number, chunk)] = (number, chunk, retried)
+            done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                number, chunk, retried = running.pop(future)
+                lossy, chunk_errors = future.result()
+                errors.extend(chunk_errors)
+                if lossy and not retried and not (should_stop and should_stop()):
+                    # Scan it again with fewer shards in parallel
+                    pending.append((number, chunk, True))
+                else:
+                    report(number, 100.0)
+
+    if normal_output:
+        with open(normal_output, "wb") as output:
+            for number in sorted(chunks):
+                part = f"{normal_output}.{number}"
+                try:
+                    with open(part, "rb") as f:
+                        shutil.copyfileobj(f, output)
+                    os.unlink(part)
+                except OSError:
+                    continue
+    return errors
@@ -0,0 +1,258 @@
+"""
+Asynchronous TCP connect scanning for PyAutoEnum.
+
+ConnectScanner keeps thousands of non-blocking connects in flight with
+asyncio and yields open ports as soon as they accept, so modules can
+start on a port while the rest of the range is still being scanned.
+Connect timeouts adapt to the round-trip times measured on the target
+(accepted and refused connects both count), and connects that time out
+are retried, as a lost SYN looks just like a filtered port.
+"""
+
+import asyncio
+import errno
+import os
+import socket
+import struct
+import time
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+ALL_PORTS = "1-65535"
+
+# Errors that mean the local host ran out of sockets, not that the port is closed
+_RESOURCE_ERRNOS = {errno.EMFILE, errno.ENFILE, errno.EADDRNOTAVAIL, errno.ENOBUFS}
+
+
+def parse_ports(spec: str) -> List[int]:
+    """
+    Parse a port specification such as "22,80,8000-8100".
+
+    Args:
+        spec: Comma-separated ports and ranges
+
+    Returns:
+        Sorted list of unique ports
+
+    Raises:
+        ValueError: If a port is not a number between 1 and 65535
+    """
+    ports = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, sep, last = part.partition("-")
+        start = int(first) if first else 1
+        end = (int(last) if last else 65535) if sep else start
+        if not 1 <= start <= end <= 65535:
+            raise ValueError(f"Invalid port range: {part}")
+        ports.update(range(start, end + 1))
+    return sorted(ports)
+
+
+def service_name(port: int) -> str:
+    """Get the conventional service name of a TCP port (e.g. "ssh"), or ""."""
+    try:
+        return socket.getservbyport(int(port), "tcp")
+    except (OSError, OverflowError):
+        return ""
+
+
+def _descriptor_limit() -> Optional[int]:
+    """Get the soft limit of open file descriptors, or None if unknown."""
+    try:
+        import resource
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    except (ImportError, OSError, ValueError):
+        return None
+    return None if soft == resource.RLIM_INFINITY else soft
+
+
+def _resolve(waiter: asyncio.Future, timed_out: bool) -> None:
+    """Complete a connect waiter once (writable socket or timer)."""
+    if not waiter.done():
+        waiter.set_result(timed_out)
+
+
+class ConnectScanner:
+    """
+    Concurrent TCP connect scanner.
+
+    The connect timeout follows the smoothed round-trip time like TCP's
+    retransmission timer (srtt + 4 * rttvar), clamped to
+    [min_timeout, max_timeout]; until the first answer it is
+    initial_timeout. The number of connects in flight is limited by
+    ``concurrency`` and by the file descriptor limit.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 2000,
+        retries: int = 1,
+        initial_timeout: float = 1.0,
+        min_timeout: float = 0.1,
+        max_timeout: float = 3.0,
+    ):
+        """
+        Initialize the scanner.
+
+        Args:
+            concurrency: Maximum number of connects in flight
+            retries: Extra attempts for connects that time out
+            initial_timeout: Connect timeout before any RTT was measured
+            min_timeout: Lower bound of the adaptive timeout
+            max_timeout: Upper bound of the adaptive timeout
+        """
+        limit = _descriptor_limit()
+        if limit is not None:
+            # Leave room for log files, the UI and the attack threads
+            concurrency = max(1, min(concurrency, limit - 128))
+        self.concurrency = concurrency
+        self.retries = retries
+        self.initial_timeout = initial_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.srtt: Optional[float] = None
+        self.rttvar = 0.0
+        self.stats = {"attempts": 0, "open": 0, "closed": 0, "filtered": 0, "retries": 0}
+
+    @property
+    def timeout(self) -> float:
+        """Current connect timeout in seconds."""
+        if self.srtt is None:
+            return self.initial_timeout
+        return min(self.max_timeout, max(self.min_timeout, self.srtt + 4 * self.rttvar))
+
+    def _sample_rtt(self, rtt: float) -> None:
+        """Update the smoothed RTT (RFC 6298 gains)."""
+        if self.srtt is None:
+            self.srtt, self.rttvar = rtt, rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+
+    async def _connect(self, address: Tuple, family: int, timeout: float) -> Optional[bool]:
+        """
+        Try one connect.
+
+        The socket's writability is watched directly on the event loop,
+        which is much cheaper per connect than sock_connect plus wait_for.
+
+        Returns:
+            True if the port accepted, False if it refused, None on timeout
+        """
+        loop = asyncio.get_running_loop()
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        start = time.monotonic()
+        try:
+            error = sock.connect_ex(address)
+            if error in (errno.EINPROGRESS, errno.EAGAIN):
+                waiter = loop.create_future()
+                fd = sock.fileno()
+                loop.add_writer(fd, _resolve, waiter, False)
+                timer = loop.call_later(timeout, _resolve, waiter, True)
+                try:
+                    if await waiter:
+                        return None
+                finally:
+                    loop.remove_writer(fd)
+                    timer.cancel()
+                error = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+
+            if error == 0:
+                # Reset instead of a FIN handshake, so no TIME_WAIT piles up
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+                result = True
+            elif error == errno.ECONNREFUSED:
+                result = False
+            else:
+                raise OSError(error, os.strerror(error))
+        finally:
+            sock.close()
+        self._sample_rtt(time.monotonic() - start)
+        return result
+
+    async def probe(self, address: Tuple, family: int) -> bool:
+        """
+        Check whether a port is open, retrying connects that time out.
+
+        Args:
+            address: Socket address (host, port[, ...])
+            family: Address family of the address
+
+        Returns:
+            True if the port accepted a connection
+        """
+        attempt = 0
+        while attempt <= self.retries:
+            try:
+                result = await self._connect(address, family, self.timeout)
+            except OSError as e:
+                if e.errno in _RESOURCE_ERRNOS:
+                    # Out of local ports or descriptors: wait, this attempt does not count
+                    await asyncio.sleep(0.05)
+                    continue
+                # Unreachable host or network
+                self.stats["attempts"] += 1
+                self.stats["filtered"] += 1
+                return False
+            self.stats["attempts"] += 1
+            if result is not None:
+                self.stats["open" if result else "closed"] += 1
+                return result
+            attempt += 1
+            if attempt <= self.retries:
+                self.stats["retries"] += 1
+        self.stats["filtered"] += 1
+        return False
+
+    async def scan(self, host: str, ports: Iterable[int]) -> AsyncIterator[int]:
+        """
+        Scan ports of a host, yielding open ports as they answer.
+
+        Args:
+            host: Hostname or IP address (resolved once)
+            ports: Ports to scan
+
+        Yields:
+            Open port numbers, in the order they were found
+        """
+        loop = asyncio.get_running_loop()
+        infos = await loop.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+        family, _, _, _, sockaddr = infos[0]
+
+        async def check(port: int) -> Tuple[int, bool]:
+            return port, await self.probe((sockaddr[0], port) + tuple(sockaddr[2:]), family)
+
+        ports = iter(ports)
+        in_flight = set()
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(in_flight) < self.concurrency:
+                    port = next(ports, None)
+                    if port is None:
+                        exhausted = True
+                        break
+                    in_flight.add(asyncio.ensure_future(check(port)))
+                if not in_flight:
+                    return
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    port, is_open = task.result()
+                    if is_open:
+                        yield port
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Get scan counters and the current timeout.
+
+        Returns:
+            Dictionary with "attempts", "open", "closed", "filtered",
+            "retries" and "timeout"
+        """
+        return dict(self.stats, timeout=self.timeout)
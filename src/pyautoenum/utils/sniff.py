@@ -0,0 +1,239 @@
+"""
+Protocol sniffing for open ports.
+
+Instead of full HTTP and then HTTPS requests one after the other, each
+port gets two probes at once: a plain connection that sends a minimal
+HTTP request and looks at the first bytes of the answer, and a TLS
+connection whose handshake (ClientHello/ServerHello) shows whether the
+service speaks TLS, followed by the same request. Any HTTP status line
+counts as HTTP, so servers answering 401 or 404 are detected too. All
+ports of a target are sniffed concurrently; SniffBatcher gathers the
+per-port requests of concurrent tasks into one such batch.
+"""
+
+import asyncio
+import ssl
+import threading
+import time
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from pyautoenum.core.admission import POLL_INTERVAL
+
+PROTOCOL_HTTP = "http"
+PROTOCOL_HTTPS = "https"
+PROTOCOL_TLS = "tls"  # TLS service that did not answer HTTP
+
+# A batch stays open until no port joined for this long, so the tasks the
+# attack pool admits over consecutive rounds end up in the same batch
+BATCH_WINDOW = 2 * POLL_INTERVAL
+
+# Longest a batch stays open
+BATCH_MAX_WAIT = 2.0
+
+# Bytes read from the service to classify it
+PEEK_BYTES = 16
+
+
+def _build_request(host: str) -> bytes:
+    """Build the minimal HTTP request sent by both probes."""
+    return f"GET / HTTP/1.0\r\nHost: {host}\r\nUser-Agent: pyautoenum\r\n\r\n".encode("utf-8", "replace")
+
+
+def classify(first_bytes: bytes) -> Optional[str]:
+    """
+    Classify a service by the first bytes it sent in reply to a plain HTTP request.
+
+    Args:
+        first_bytes: Start of the reply
+
+    Returns:
+        PROTOCOL_HTTP for an HTTP status line, PROTOCOL_TLS for a TLS record
+        (e.g. an alert about the plaintext request), otherwise None
+    """
+    if first_bytes.startswith(b"HTTP/"):
+        return PROTOCOL_HTTP
+    # TLS record header: content type (alert or handshake), major version 3
+    if len(first_bytes) >= 2 and first_bytes[0] in (0x15, 0x16) and first_bytes[1] == 0x03:
+        return PROTOCOL_TLS
+    return None
+
+
+_tls_context: Optional[ssl.SSLContext] = None
+
+
+def _get_tls_context() -> ssl.SSLContext:
+    """Client TLS context accepting any certificate (created once)."""
+    global _tls_context
+    if _tls_context is None:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        _tls_context = context
+    return _tls_context
+
+
+async def _exchange(host: str, port: int, request: bytes, tls: bool) -> bytes:
+    """Connect, send the request and return the first bytes of the reply."""
+    if tls:
+        reader, writer = await asyncio.open_connection(host, port, ssl=_get_tls_context())
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(request)
+        await writer.drain()
+        return await reader.read(PEEK_BYTES)
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except (OSError, ssl.SSLError):
+            pass
+
+
+async def _probe(host: str, port: int, request: bytes, tls: bool, timeout: float) -> Optional[str]:
+    """Run one probe and classify the reply, None on failure."""
+    try:
+        reply = await asyncio.wait_for(_exchange(host, port, request, tls), timeout)
+    except (OSError, ssl.SSLError, asyncio.TimeoutError, EOFError):
+        return None
+    if tls:
+        # The handshake completed, so this is TLS whatever the reply is
+        return PROTOCOL_HTTPS if classify(reply) == PROTOCOL_HTTP else PROTOCOL_TLS
+    return classify(reply)
+
+
+async def sniff_protocol(host: str, port: int, timeout: float = 3.0) -> Optional[str]:
+    """
+    Detect whether a port serves HTTP or HTTPS.
+
+    Args:
+        host: Hostname or IP address
+        port: Port number
+        timeout: Timeout of each probe in seconds
+
+    Returns:
+        PROTOCOL_HTTPS, PROTOCOL_HTTP, PROTOCOL_TLS or None
+    """
+    request = _build_request(host)
+    plain, tls = await asyncio.gather(
+        _probe(host, int(port), request, False, timeout),
+        _probe(host, int(port), request, True, timeout),
+    )
+    # HTTPS servers often answer plaintext requests with an HTTP error too
+    if tls is not None:
+        return tls
+    return plain if plain == PROTOCOL_HTTP else None
+
+
+async def sniff_protocols(
+    host: str,
+    ports: Iterable[int],
+    timeout: float = 3.0,
+    concurrency: int = 128,
+) -> Dict[str, Optional[str]]:
+    """
+    Sniff the protocols of many ports concurrently.
+
+    Args:
+        host: Hostname or IP address
+        ports: Port numbers
+        timeout: Timeout of each probe in seconds
+        concurrency: Maximum number of ports probed at once (each uses two connections)
+
+    Returns:
+        Dictionary of port (as string) to the result of sniff_protocol
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def sniff(port: int) -> Tuple[str, Optional[str]]:
+        async with semaphore:
+            return str(port), await sniff_protocol(host, port, timeout)
+
+    results = await asyncio.gather(*(sniff(int(port)) for port in ports))
+    return dict(results)
+
+
+class _Batch:
+    """Ports of one host waiting to be sniffed together."""
+
+    def __init__(self):
+        self.ports: Set[int] = set()
+        self.last_join = time.monotonic()
+        self.done = threading.Event()
+        self.results: Dict[str, Optional[str]] = {}
+        self.error: Optional[BaseException] = None
+
+
+class SniffBatcher:
+    """
+    Sniffs the ports requested by concurrent callers in shared batches.
+
+    The first caller for a host keeps the batch open while more ports
+    join (e.g. the check_for_http tasks the scheduler starts for every
+    new port, admitted over several rounds), until none joined for
+    ``window`` seconds or ``max_wait`` passed, and then runs one
+    sniff_protocols() for all of them; the other callers wait for its
+    results.
+    """
+
+    def __init__(self, window: float = BATCH_WINDOW, max_wait: float = BATCH_MAX_WAIT):
+        """
+        Initialize the batcher.
+
+        Args:
+            window: Seconds without a new port after which a batch is sniffed
+            max_wait: Seconds after which a batch is sniffed anyway
+        """
+        self.window = window
+        self.max_wait = max_wait
+        self._open: Dict[str, _Batch] = {}
+        self._lock = threading.Lock()
+
+    def sniff(self, host: str, port: int, timeout: float = 3.0, concurrency: int = 128) -> Optional[str]:
+        """
+        Sniff one port, batched with the ports other threads ask for.
+
+        Args:
+            host: Hostname or IP address
+            port: Port number
+            timeout: Timeout of each probe in seconds (of the batch's first caller)
+            concurrency: Maximum number of ports probed at once
+
+        Returns:
+            PROTOCOL_HTTPS, PROTOCOL_HTTP, PROTOCOL_TLS or None
+        """
+        with self._lock:
+            batch = self._open.get(host)
+            leader = batch is None
+            if leader:
+                batch = self._open[host] = _Batch()
+            batch.ports.add(int(port))
+            batch.last_join = time.monotonic()
+
+        if leader:
+            deadline = time.monotonic() + self.max_wait
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    wait = min(batch.last_join + self.window, deadline) - now
+                    if wait <= 0:
+                        # Later callers start the next batch
+                        del self._open[host]
+                        break
+                time.sleep(wait)
+            try:
+                batch.results = asyncio.run(sniff_protocols(host, sorted(batch.ports), timeout, concurrency))
+            except BaseException as e:
+                batch.error = e
+            finally:
+                batch.done.set()
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+        return batch.results.get(str(int(port)))
+
+
+# Shared by all check_for_http tasks
+sniff_batcher = SniffBatcher()
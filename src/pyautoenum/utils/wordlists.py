@@ -0,0 +1,313 @@
+"""
+Shared, memory-mapped wordlists for PyAutoEnum.
+
+Wordlists such as the seclists files are large and full of duplicates.
+The wordlist service maps every file into memory once per process and
+builds an index of the offsets of its unique words (empty lines and
+"#" comments skipped, first occurrence kept). The index is stored in the
+cache directory under the file's BLAKE2 hash and is itself memory-mapped
+when it is loaded again, so a list is only scanned the first time it is
+ever used.
+
+Wordlist.shards() splits the index into contiguous ranges (modules take
+one with their "shard=<number>/<count>" option). A shard is a
+view on the shared mapping: handing it to a thread copies nothing, and
+pickling it for a worker process only sends the path, hash and range
+(the process maps the file and the cached index itself, sharing the
+page cache with everyone else).
+"""
+
+import array
+import hashlib
+import mmap
+import os
+import re
+import sys
+import threading
+from operator import add
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from pyautoenum.config.catalog import default_cache_dir
+
+# Bump when the layout of cached indexes changes
+INDEX_CACHE_VERSION = 1
+
+_INDEX_MAGIC = b"PAEWLIDX"
+_HEADER_SIZE = 16  # magic, entry count
+_LINE = re.compile(rb"[^\r\n]+")
+_WHITESPACE = b" \t\f\v"
+_SPECIAL = _WHITESPACE + b"#"
+
+
+def _offsets(positions: Dict[bytes, int]) -> Tuple[array.array, array.array]:
+    """Start and end offsets of the words of a word -> start mapping."""
+    return array.array("Q", positions.values()), array.array("Q", map(add, positions.values(), map(len, positions)))
+
+
+def _build_index_slow(data) -> Tuple[array.array, array.array]:
+    """Index builder for files with CR line ends, one line at a time."""
+    positions: Dict[bytes, int] = {}
+    for match in _LINE.finditer(data):
+        start, end = match.span()
+        while start < end and data[start] in _WHITESPACE:
+            start += 1
+        while end > start and data[end - 1] in _WHITESPACE:
+            end -= 1
+        if start < end and data[start] != 0x23:  # "#"
+            positions.setdefault(data[start:end], start)
+    return _offsets(positions)
+
+
+def _build_index(data) -> Tuple[array.array, array.array]:
+    """
+    Find the unique words of a mapped file.
+
+    Line ends are located with data.find() on the mapping itself, so the
+    file is never copied as a whole; only the lines are.
+
+    Returns:
+        Start and end offsets of every unique word, in the order of
+        first occurrence
+    """
+    if data.find(b"\r") != -1:
+        return _build_index_slow(data)
+    positions: Dict[bytes, int] = {}
+    size = len(data)
+    start = 0
+    while start < size:
+        end = data.find(b"\n", start)
+        if end == -1:
+            end = size
+        line = data[start:end]
+        if line and line[0] not in _SPECIAL and line[-1] not in _WHITESPACE:
+            positions.setdefault(line, start)
+        else:
+            # Drop empty lines and comments, strip padded words
+            word = line.strip(_WHITESPACE)
+            if word and word[0] != 0x23:  # "#"
+                positions.setdefault(word, start + line.index(word))
+        start = end + 1
+    return _offsets(positions)
+
+
+class WordlistShard:
+    """Contiguous range of the words of a Wordlist, without copying them."""
+
+    def __init__(self, wordlist: "Wordlist", start: int, stop: int):
+        """
+        Initialize the shard.
+
+        Args:
+            wordlist: Wordlist the shard belongs to
+            start: Index of the first word
+            stop: Index after the last word
+        """
+        self.wordlist = wordlist
+        self.start = start
+        self.stop = stop
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __iter__(self) -> Iterator[str]:
+        return self.wordlist.iter_words(self.start, self.stop)
+
+    def iter_bytes(self) -> Iterator[memoryview]:
+        """Iterate over the words as views on the mapped file."""
+        return self.wordlist.iter_bytes(self.start, self.stop)
+
+    def __reduce__(self):
+        # Worker processes open the file (and its cached index) themselves
+        return _open_shard, (self.wordlist.path, self.wordlist.digest, self.start, self.stop)
+
+    def __repr__(self) -> str:
+        return f"WordlistShard({self.wordlist.path!r}, {self.start}, {self.stop})"
+
+
+def _open_shard(path: str, digest: str, start: int, stop: int) -> WordlistShard:
+    wordlist = wordlist_service.open(path)
+    if wordlist.digest != digest:
+        raise ValueError(f"Wordlist changed since the shard was created: {path}")
+    return WordlistShard(wordlist, start, stop)
+
+
+class Wordlist:
+    """
+    Memory-mapped wordlist with a deduplicated index.
+
+    Use WordlistService.open() (or wordlist_service.open()) rather than
+    creating instances directly, so every file is mapped once.
+    """
+
+    def __init__(self, path: str, cache_dir: Optional[str] = None):
+        """
+        Map a wordlist file and load or build its index.
+
+        Args:
+            path: Wordlist file
+            cache_dir: Directory for cached indexes, defaults to default_cache_dir()
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        self.path = os.path.realpath(path)
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.index_loaded = False  # Whether the index came from the cache
+        self._index_map: Optional[mmap.mmap] = None
+        with open(self.path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            self.mtime_ns, self.size = stat.st_mtime_ns, stat.st_size
+            # mmap cannot map empty files
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b""
+        self._view = memoryview(self._map)
+        self.digest = hashlib.blake2b(self._view, digest_size=16).hexdigest()
+        self._starts, self._ends = self._load_index() or self._store_index(*_build_index(self._map))
+
+    @property
+    def index_path(self) -> str:
+        """Path of the cached index of this file's content."""
+        return os.path.join(self.cache_dir, "wordlists", f"{self.digest}.v{INDEX_CACHE_VERSION}.idx")
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "rb") as f:
+                index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        count = int.from_bytes(index_map[8:_HEADER_SIZE], "little")
+        if index_map[:8] != _INDEX_MAGIC or len(index_map) != _HEADER_SIZE + 16 * count:
+            index_map.close()
+            return None
+        self._index_map = index_map
+        self.index_loaded = True
+        offsets = memoryview(index_map)[_HEADER_SIZE:].cast("Q")
+        return offsets[:count], offsets[count:]
+
+    def _store_index(self, starts: array.array, ends: array.array):
+        if starts.itemsize != 8 or sys.byteorder != "little":
+            # The cache format is little-endian 64-bit; keep the index in memory only
+            return starts, ends
+        path = self.index_path
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(temp_path, "wb") as f:
+                f.write(_INDEX_MAGIC + len(starts).to_bytes(8, "little"))
+                starts.tofile(f)
+                ends.tofile(f)
+            os.replace(temp_path, path)
+        except OSError:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+        return starts, ends
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def word_bytes(self, index: int) -> memoryview:
+        """Get a word as a view on the mapped file."""
+        return self._view[self._starts[index]:self._ends[index]]
+
+    def __getitem__(self, index: int) -> str:
+        return bytes(self.word_bytes(index)).decode("utf-8", "replace")
+
+    def iter_bytes(self, start: int = 0, stop: Optional[int] = None) -> Iterator[memoryview]:
+        """Iterate over words start..stop as views on the mapped file."""
+        view, starts, ends = self._view, self._starts, self._ends
+        for index in range(start, len(starts) if stop is None else stop):
+            yield view[starts[index]:ends[index]]
+
+    def iter_words(self, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+        """Iterate over words start..stop, decoded."""
+        data, starts, ends = self._map, self._starts, self._ends
+        for index in range(start, len(starts) if stop is None else stop):
+            yield data[starts[index]:ends[index]].decode("utf-8", "replace")
+
+    def __iter__(self) -> Iterator[str]:
+        return self.iter_words()
+
+    def shards(self, count: int) -> List[WordlistShard]:
+        """
+        Split the words into contiguous shards of (nearly) equal size.
+
+        Args:
+            count: Number of shards (fewer if there are fewer words)
+
+        Returns:
+            List of shards covering every word once
+        """
+        total = len(self)
+        count = max(1, min(count, total))
+        bounds = [total * i // count for i in range(count + 1)]
+        return [WordlistShard(self, bounds[i], bounds[i + 1]) for i in range(count)]
+
+    def is_current(self) -> bool:
+        """Whether the file still has the size and mtime it had when it was mapped."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        return (stat.st_mtime_ns, stat.st_size) == (self.mtime_ns, self.size)
+
+    def close(self) -> None:
+        """Release the mappings; the wordlist cannot be used afterwards."""
+        try:
+            self._view.release()
+        except BufferError:
+            pass
+        self._starts = self._ends = array.array("Q")
+        for mapping in (self._map, self._index_map):
+            if isinstance(mapping, mmap.mmap):
+                try:
+                    mapping.close()
+                except BufferError:
+                    # Views handed out to callers still use the mapping
+                    pass
+
+
+class WordlistService:
+    """Opens every wordlist file once per process and shares it."""
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Initialize the service.
+
+        Args:
+            cache_dir: Directory for cached indexes, defaults to default_cache_dir()
+        """
+        self.cache_dir = cache_dir
+        self._wordlists: Dict[str, Wordlist] = {}
+        self._lock = threading.Lock()
+
+    def open(self, path: str) -> Wordlist:
+        """
+        Get the shared Wordlist of a file, mapping it on first use.
+
+        A file that changed since it was mapped is mapped again.
+
+        Args:
+            path: Wordlist file
+
+        Returns:
+            Wordlist
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        key = os.path.realpath(path)
+        with self._lock:
+            wordlist = self._wordlists.get(key)
+            if wordlist is None or not wordlist.is_current():
+                wordlist = self._wordlists[key] = Wordlist(key, self.cache_dir)
+            return wordlist
+
+    def clear(self) -> None:
+        """Forget all open wordlists (mappings stay valid while referenced)."""
+        with self._lock:
+            self._wordlists.clear()
+
+
+# Shared by all modules of the process
+wordlist_service = WordlistService()
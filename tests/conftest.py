@@ -25,3 +25,68 @@ def sample_target_info():
     
     config = ConfigManager()
     return TargetInfo(config, ip="192.168.1.1", hostname="example.com")
+
+
+@pytest.fixture
+def wordlist_cache(tmp_path, monkeypatch):
+    """Keep the indexes of the shared wordlist service in a temporary cache directory."""
+    from pyautoenum.utils.wordlists import wordlist_service
+
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(wordlist_service, "cache_dir", str(cache_dir))
+    yield cache_dir
+    wordlist_service.clear()
+
+
+@pytest.fixture
+def dns_server():
+    """
+    Start a stand-in DNS server on loopback.
+
+    Yields an object with ``address`` ("127.0.0.1:PORT"), a ``records``
+    dictionary of name to addresses (other names get NXDOMAIN, or the
+    ``wildcard`` addresses if set), a ``drop_first`` set of names whose
+    first query is ignored, and the ``queries`` received so far.
+    """
+    import socket
+    import threading
+    from types import SimpleNamespace
+
+    from pyautoenum.utils.dns import RCODE_NXDOMAIN, _read_name, encode_response
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(0.1)
+    server = SimpleNamespace(
+        address=f"127.0.0.1:{sock.getsockname()[1]}",
+        records={},
+        wildcard=[],
+        drop_first=set(),
+        queries=[],
+    )
+    stop = threading.Event()
+
+    def serve():
+        while not stop.is_set():
+            try:
+                query, client = sock.recvfrom(512)
+            except socket.timeout:
+                continue
+            name = _read_name(query, 12)[0]
+            server.queries.append(name)
+            if name in server.drop_first:
+                server.drop_first.discard(name)
+                continue
+            if name in server.records:
+                sock.sendto(encode_response(query, server.records[name]), client)
+            elif server.wildcard:
+                sock.sendto(encode_response(query, server.wildcard), client)
+            else:
+                sock.sendto(encode_response(query, rcode=RCODE_NXDOMAIN), client)
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield server
+    stop.set()
+    thread.join()
+    sock.close()
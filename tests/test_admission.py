@@ -0,0 +1,53 @@
+"""
+Tests for resource-weighted admission control.
+"""
+
+import pytest
+
+from pyautoenum.core.admission import AdmissionController
+from pyautoenum.data.models import ModuleResources
+
+HEAVY = ModuleResources(cpu=1.0, net=1.0, memory=200, max_parallel=1)
+MEDIUM = ModuleResources(cpu=0.5, net=0.5)
+PROBE = ModuleResources(cpu=0.05, net=0.05)
+
+
+def test_heavy_tasks_are_limited_but_probes_get_through():
+    """Budgets and max_parallel hold heavy scans back; cheap probes still start."""
+    admission = AdmissionController(cpu=4, net=1.5, memory=1024)
+
+    assert admission.fits("wfuzz", HEAVY)
+    admission.acquire("wfuzz", HEAVY)
+    assert not admission.fits("wfuzz", HEAVY)  # max_parallel
+    assert not admission.fits("nikto", ModuleResources(cpu=0.5, net=1.0))  # net budget
+    assert admission.fits("nikto", MEDIUM)
+    admission.acquire("nikto", MEDIUM)
+    assert not admission.fits("whatweb", ModuleResources(cpu=0.2, net=0.2))
+    assert admission.fits("check_for_http", PROBE)
+
+    admission.release("wfuzz", HEAVY)
+    assert admission.fits("wfuzz", HEAVY)
+    assert admission.get_load()["net"] == {"used": 0.5, "capacity": 1.5}
+
+
+def test_reservation_and_oversized_demand():
+    """A starving task's reservation blocks others; oversized demands run alone."""
+    admission = AdmissionController(cpu=2, net=1.0, memory=None)
+    admission.acquire("nikto", MEDIUM)
+
+    assert admission.fits("whatweb", MEDIUM)
+    assert not admission.fits("whatweb", MEDIUM, reserved=HEAVY)
+    assert admission.fits("check_for_http", PROBE, reserved=HEAVY)
+
+    admission.release("nikto", MEDIUM)
+    assert admission.fits("huge", ModuleResources(cpu=16, net=8))
+
+
+def test_module_resources_validation():
+    """Unknown or negative hints are rejected."""
+    assert ModuleResources.from_dict(None) == ModuleResources()
+    assert ModuleResources.from_dict({"max_parallel": "2"}).max_parallel == 2
+    with pytest.raises(ValueError):
+        ModuleResources.from_dict({"gpu": 1})
+    with pytest.raises(ValueError):
+        ModuleResources.from_dict({"cpu": -1})
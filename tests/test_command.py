@@ -0,0 +1,41 @@
+"""
+Tests for compiled command templates and pipelines.
+"""
+
+import shutil
+
+import pytest
+
+from pyautoenum.core.command import SwitchTemplate, run_pipeline
+
+VALUES = {"protocol": "https", "hostname": "example com", "port": "443", "outfile": "/tmp/out"}
+
+
+def test_switch_template_tokenizes_once():
+    """Switches split into arguments; placeholders never split an argument."""
+    template = SwitchTemplate([
+        "-c",
+        "-z file,/usr/share/wordlist.txt",
+        "'[protocol]://[hostname]:[port]/FUZZ'",
+        "-oN '[outfile]'",
+    ])
+    assert template.render(VALUES) == [
+        "-c", "-z", "file,/usr/share/wordlist.txt",
+        "https://example com:443/FUZZ", "-oN", "/tmp/out",
+    ]
+
+
+@pytest.mark.skipif(not (shutil.which("printf") and shutil.which("tr")), reason="coreutils missing")
+def test_run_pipeline_streams_last_stage(tmp_path):
+    """Processes are chained with pipes and the last output lands in the file."""
+    output_file = tmp_path / "out.txt"
+    lines = []
+    output = run_pipeline(
+        [[shutil.which("printf"), "a|b\\nc\\n"], [shutil.which("tr"), "a-z", "A-Z"]],
+        str(output_file),
+        lines.append,
+    )
+    assert output == "A|B\nC\n"
+    assert output_file.read_text() == output
+    assert lines == ["A|B\n", "C\n"]
+    assert not (tmp_path / "out.txt.stderr").exists()
@@ -0,0 +1,130 @@
+"""
+Tests for PyAutoEnum configuration loading.
+"""
+
+import os
+
+from pyautoenum.config.catalog import ModuleCatalogCache, build_catalog
+
+MODULES_YML = """
+- name: check_for_http
+  command: check_for_http
+  requires:
+    - port
+- name: missing_tool
+  command: /nonexistent/bin/missing_tool
+"""
+
+
+def test_module_catalog_cache_round_trip(tmp_path):
+    """A stored catalog is reused until modules.yml really changes."""
+    config_file = tmp_path / "modules.yml"
+    config_file.write_text(MODULES_YML)
+    cache = ModuleCatalogCache(cache_dir=str(tmp_path / "cache"))
+
+    assert cache.load(str(config_file)) is None
+
+    catalog = build_catalog([
+        {"name": "check_for_http", "command": "check_for_http", "requires": ["Port"]},
+        {"name": "missing_tool", "command": "/nonexistent/bin/missing_tool"},
+    ])
+    assert [m["name"] for m in catalog["modules"]] == ["check_for_http"]
+    assert catalog["modules"][0]["requirements"] == ["port"]
+    assert catalog["failed"] == ["missing_tool (/nonexistent/bin/missing_tool)"]
+
+    cache.store(str(config_file), catalog)
+    assert cache.load(str(config_file))["modules"] == catalog["modules"]
+
+    # Touching the file without changing it keeps the cache valid
+    os.utime(config_file, ns=(0, 0))
+    assert cache.load(str(config_file)) is not None
+
+    # Changing the content invalidates it
+    config_file.write_text(MODULES_YML + "\n# changed\n")
+    assert cache.load(str(config_file)) is None
+
+
+def test_module_registry_dispatch():
+    """Registered functions resolve into a dispatch entry with their analyzer."""
+    from pyautoenum.modules.registry import EXECUTOR_PYTHON, ModuleRegistry
+
+    registry = ModuleRegistry()
+    registry._loaded = True  # Skip built-ins and entry points
+
+    @registry.register
+    def probe(target_info, port, switches):
+        return "probe"
+
+    @registry.register(name="analyse_probe")
+    def analyse(target_info, port, output):
+        return None
+
+    dispatch = registry.build_dispatch("probe", "analyse_probe")
+    assert dispatch.executor == EXECUTOR_PYTHON
+    assert dispatch.func is probe
+    assert dispatch.analyzer is analyse
+    assert registry.build_dispatch("no_such_command_xyz") is None
+
+
+def test_reload_modules_diffs_definitions(tmp_path, monkeypatch):
+    """Reloading keeps unchanged modules and reports added, changed and removed ones."""
+    from pyautoenum.config.manager import ConfigManager
+
+    monkeypatch.setattr(ConfigManager, "module_catalog_cache", ModuleCatalogCache(str(tmp_path / "cache")))
+    monkeypatch.setattr(ConfigManager, "modules", [])
+    monkeypatch.setattr(ConfigManager, "modules_file", None)
+    config_file = tmp_path / "modules.yml"
+    config_file.write_text(
+        "- name: check_for_http\n  command: check_for_http\n"
+        "- name: custom_created_wordlist\n  command: create_wordlist_from_website\n"
+    )
+    manager = ConfigManager()
+    manager.load_modules(str(config_file))
+    unchanged = ConfigManager.modules[0]
+    assert not manager.modules_file_changed()
+
+    config_file.write_text(
+        "- name: check_for_http\n  command: check_for_http\n"
+        "- name: subdomain_enum_brute\n  command: subdomain_enum_brute\n  switches:\n    - words.txt\n"
+    )
+    assert manager.modules_file_changed()
+    changes = manager.reload_modules()
+
+    assert changes == {
+        "added": ["subdomain_enum_brute"],
+        "changed": [],
+        "removed": ["custom_created_wordlist"],
+    }
+    assert ConfigManager.modules[0] is unchanged
+    assert not manager.modules_file_changed()
+
+
+def test_cached_catalog_dispatches_without_searching_path(tmp_path, monkeypatch):
+    """Modules loaded from a cached catalog use its resolved binaries."""
+    import shutil
+
+    from pyautoenum.config.manager import ConfigManager
+    from pyautoenum.modules.registry import EXECUTOR_EXTERNAL
+
+    monkeypatch.setattr(ConfigManager, "module_catalog_cache", ModuleCatalogCache(str(tmp_path / "cache")))
+    monkeypatch.setattr(ConfigManager, "modules", [])
+    monkeypatch.setattr(ConfigManager, "modules_file", None)
+    config_file = tmp_path / "modules.yml"
+    config_file.write_text(
+        "- name: listing\n  command: ls\n  switches:\n    - \"-l\"\n"
+        "  pipeline:\n    - command: sort\n"
+    )
+    ConfigManager().load_modules(str(config_file))
+    first = ConfigManager.modules[0]
+    expected = [stage.executable for stage in first.stages]
+
+    def no_which(*args, **kwargs):
+        raise AssertionError("PATH searched on a cache hit")
+
+    monkeypatch.setattr(shutil, "which", no_which)
+    ConfigManager().load_modules(str(config_file))
+
+    module = ConfigManager.modules[0]
+    assert module is not first
+    assert module.dispatch.executor == EXECUTOR_EXTERNAL
+    assert [stage.executable for stage in module.stages] == expected
@@ -0,0 +1,150 @@
+"""
+Tests for the built-in web content discovery engine.
+"""
+
+import asyncio
+import http.server
+import threading
+import time
+
+import pytest
+
+from pyautoenum.utils.content_discovery import ContentDiscovery
+
+PAGES = {"/admin": b"admin panel", "/login.php": b"login form", "/backup/": b"index of"}
+
+
+def _make_handler(version="HTTP/1.1", catch_all=False, delay=0.0, throttle=False):
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = version
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            time.sleep(delay)
+            if throttle:
+                status, body = 429, b"slow down"
+            elif self.path in PAGES:
+                status, body = 200, PAGES[self.path]
+            elif self.path == "/old":
+                status, body = 301, b""
+            elif catch_all:
+                status, body = 200, b"welcome to the home page"
+            else:
+                status, body = 404, b"not found"
+            self.send_response(status)
+            if status == 301:
+                self.send_header("Location", "/new")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(**kwargs):
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(**kwargs))
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}/"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+WORDS = ["admin", "login", "old", "backup"] + [f"missing{i}" for i in range(500)]
+
+
+@pytest.mark.parametrize("version", ["HTTP/1.1", "HTTP/1.0"])
+def test_hits_and_filters(serve, version):
+    engine = ContentDiscovery(serve(version=version), WORDS, extensions=[".php"], hide_sizes=[10], concurrency=8)
+    hits = asyncio.run(engine.run())
+
+    # /login.php is hidden by its size
+    assert sorted((hit.path, hit.status, hit.location) for hit in hits) == [("/admin", 200, ""), ("/old", 301, "/new")]
+    stats = engine.get_stats()
+    assert stats["responses"] >= 2 * len(WORDS)
+    assert stats["failed"] == 0
+
+
+def test_catch_all_pages_are_calibrated_away(serve):
+    engine = ContentDiscovery(serve(catch_all=True), WORDS, suffix="/")
+    hits = asyncio.run(engine.run())
+    assert [hit.path for hit in hits] == ["/backup/"]
+    assert engine.wildcards == {(200, 24)}
+
+
+def test_cancel_from_another_thread(serve):
+    engine = ContentDiscovery(serve(delay=0.01), (f"w{i}" for i in range(100000)), concurrency=4)
+    threading.Timer(0.3, engine.cancel).start()
+    start = time.monotonic()
+    asyncio.run(engine.run())
+    assert time.monotonic() - start < 2.0
+    assert engine.cancelled
+    assert engine.get_stats()["words"] < 100000
+
+
+def test_always_throttled_paths_are_given_up(serve, monkeypatch):
+    from pyautoenum.utils import content_discovery
+
+    monkeypatch.setattr(content_discovery, "THROTTLE_DELAY", 0.01)
+    engine = ContentDiscovery(serve(throttle=True), ["admin", "login", "backup"], concurrency=2)
+    hits = asyncio.run(asyncio.wait_for(engine.run(), 10.0))
+
+    assert hits == []
+    stats = engine.get_stats()
+    assert stats["failed"] == 3
+    assert stats["responses"] >= 3 * content_discovery.MAX_THROTTLED
+
+
+def test_module_stores_hits_in_port_infos(serve, wordlist_cache, tmp_path):
+    from pyautoenum.config.manager import ConfigManager
+    from pyautoenum.data.models import TargetInfo
+    from pyautoenum.modules.custom import discover_web_content
+
+    url = serve()
+    port = url.rstrip("/").rsplit(":", 1)[1]
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("# comment\nadmin\n\nnothing\nold\n")
+    target_info = TargetInfo(ConfigManager(), ip="127.0.0.1")
+    target_info.merge({port: {"protocol": "http"}})
+    target_info.update_information(port, "web_files", {"/earlier": "200 1 bytes"})
+
+    found = discover_web_content(target_info, port, [f"wordlist={wordlist}", "column=web_files"])
+
+    assert sorted(found) == ["/admin", "/old"]
+    assert target_info.get_port(port).infos["web_files"] == {
+        "/earlier": "200 1 bytes",
+        "/admin": "200 11 bytes",
+        "/old": "301 0 bytes -> /new",
+    }
+
+
+def test_module_scans_one_shard_of_the_wordlist(serve, wordlist_cache, tmp_path):
+    from pyautoenum.config.manager import ConfigManager
+    from pyautoenum.data.models import TargetInfo
+    from pyautoenum.modules.custom import discover_web_content
+
+    url = serve()
+    port = url.rstrip("/").rsplit(":", 1)[1]
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("admin\nnothing\nold\nmissing\n")
+    target_info = TargetInfo(ConfigManager(), ip="127.0.0.1")
+    target_info.merge({port: {"protocol": "http"}})
+
+    found = [
+        discover_web_content(target_info, port, [f"wordlist={wordlist}", f"shard={shard}"])
+        for shard in ("1/2", "2/2", "5/5", "3/2")
+    ]
+
+    assert found == [["/admin"], ["/old"], [], []]
+    assert any(wordlist_cache.rglob("*.idx"))
@@ -0,0 +1,78 @@
+"""
+Tests for the website crawler behind create_wordlist_from_website.
+"""
+
+import collections
+import http.server
+import threading
+
+import pytest
+
+from pyautoenum.utils.crawler import Crawler, _Tokenizer
+from pyautoenum.utils.network import HttpClient
+
+SITE = {
+    "/": '<title>Home</title><a href="/a">alpha</a> <a href="/b#x">beta</a> <a href="http://other.test/">out</a>',
+    "/a": '<p>alpha alpha gamma</p><a href="/">home</a><a href="/b">beta</a><a href="/deep">deeper</a>',
+    "/b": "<p>alpha beta</p><script>hidden words here</script><a href='/a'>again</a>",
+    "/deep": "<p>toodeep</p>",
+}
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.paths.append(self.path)
+        body = SITE.get(self.path)
+        self.send_response(200 if body is not None else 404)
+        data = (body or "").encode()
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.paths = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_crawl_is_bounded_deduplicated_and_ranked(site):
+    url = f"http://127.0.0.1:{site.server_address[1]}/"
+    crawler = Crawler(url, max_depth=1, concurrency=4, client=HttpClient())
+
+    words = crawler.crawl()
+
+    # Each page once, nothing beyond depth 1 or off-site
+    assert sorted(site.paths) == ["/", "/a", "/b"]
+    assert words[:3] == ["alpha", "beta", "Home"]
+    assert "toodeep" not in words
+    assert "hidden" not in words
+    assert crawler.get_stats()["pages"] == 3
+
+
+def test_page_budget(site):
+    url = f"http://127.0.0.1:{site.server_address[1]}/"
+    crawler = Crawler(url, max_depth=5, max_pages=2, concurrency=1, client=HttpClient())
+    crawler.crawl()
+    assert len(site.paths) == 2
+
+
+def test_tokenizer_joins_words_split_across_chunks():
+    words = collections.Counter()
+    tokenizer = _Tokenizer(words)
+    for chunk in ("<p>pass", "word sec", "ret</p><a href='/x'>lin", "k</a>"):
+        tokenizer.feed(chunk)
+    tokenizer.close()
+    assert words == {"password": 1, "secret": 1, "link": 1}
+    assert tokenizer.links == ["/x"]
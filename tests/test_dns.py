@@ -0,0 +1,219 @@
+"""
+Tests for the concurrent DNS resolver.
+"""
+
+import asyncio
+
+import pytest
+
+from pyautoenum.utils import dns
+from pyautoenum.utils.dns import (
+    QTYPE_A,
+    STATUS_NXDOMAIN,
+    STATUS_OK,
+    STATUS_TIMEOUT,
+    DnsResolver,
+    NegativeCache,
+    WildcardCache,
+    decode_response,
+    encode_query,
+    encode_response,
+)
+
+
+@pytest.fixture
+def dns_caches(monkeypatch):
+    """Give the subdomain module fresh negative and wildcard caches."""
+    monkeypatch.setattr(dns, "negative_cache", NegativeCache())
+    monkeypatch.setattr(dns, "wildcard_cache", WildcardCache())
+
+
+def test_query_response_round_trip():
+    """Encoded responses decode to the question and address records."""
+    query = encode_query(0x1234, "WWW.Example.com", QTYPE_A)
+    message = decode_response(encode_response(query, ["10.0.0.1", "::1"], ttl=30))
+
+    assert message.query_id == 0x1234
+    assert message.question == "www.example.com"
+    assert [(rtype, ttl, value) for _, rtype, ttl, value in message.answers] == [
+        (1, 30, "10.0.0.1"), (28, 30, "::1"),
+    ]
+
+
+def test_resolve_many_against_loopback_server(dns_server):
+    """Many lookups run concurrently; lost queries are retried."""
+    dns_server.records = {f"host{i}.example.test": [f"10.0.0.{i}"] for i in range(50)}
+    dns_server.drop_first = {"host7.example.test"}
+    names = [f"host{i}.example.test" for i in range(100)]
+
+    async def run():
+        async with DnsResolver([dns_server.address], concurrency=32, rate=None, timeout=0.2,
+                               negative_cache=NegativeCache()) as resolver:
+            return [result async for result in resolver.resolve_many(names)]
+
+    results = {result.name: result for result in asyncio.run(run())}
+
+    assert len(results) == 100
+    assert results["host7.example.test"].status == STATUS_OK
+    assert results["host7.example.test"].addresses == ("10.0.0.7",)
+    assert results["host70.example.test"].status == STATUS_NXDOMAIN
+    assert dns_server.queries.count("host7.example.test") == 2
+
+
+def test_unreachable_resolver_times_out():
+    """Lookups give up after the configured retries."""
+    async def run():
+        async with DnsResolver(["127.0.0.1:9"], rate=None, timeout=0.05, retries=1,
+                               negative_cache=NegativeCache()) as resolver:
+            return await resolver.resolve("nothing.example.test")
+
+    assert asyncio.run(run()).status == STATUS_TIMEOUT
+
+
+def test_subdomain_enum_brute_checks_resolved_names(dns_server, dns_caches, wordlist_cache, sample_target_info,
+                                                   tmp_path, monkeypatch):
+    """Only names that resolve reach the HTTP stage; live ones become hostnames."""
+    from pyautoenum.modules import custom
+
+    dns_server.records = {"www.example.com": ["10.0.0.1"], "dev.example.com": ["10.0.0.2"]}
+    wordlist = tmp_path / "subdomains.txt"
+    wordlist.write_text("# comment\nwww\nmail\ndev\n\nftp\n")
+    checked = []
+
+    def fake_check(protocol, host, port):
+        checked.append(host)
+        return host == "www.example.com"
+
+    monkeypatch.setattr(custom, "check_http_connection", fake_check)
+    sample_target_info.set_protocol(80, "http")
+
+    output = custom.subdomain_enum_brute(
+        sample_target_info, "80", [str(wordlist), f"resolvers={dns_server.address}", "timeout=0.2"]
+    )
+
+    assert sorted(output) == [("dev.example.com", "10.0.0.2"), ("www.example.com", "10.0.0.1")]
+    assert sorted(checked) == ["dev.example.com", "www.example.com"]
+    assert "www.example.com" in sample_target_info.get_port(80).hostnames
+
+
+def test_wildcard_matches_are_judged_over_http(dns_server, dns_caches, wordlist_cache, sample_target_info,
+                                              tmp_path, monkeypatch):
+    """Names resolving to the wildcard addresses are kept only if they answer unlike a random name."""
+    from pyautoenum.modules import custom
+    from pyautoenum.utils import network
+    from pyautoenum.utils.network import HttpSignature
+
+    dns_server.records = {
+        "www.example.com": ["10.0.0.1"],
+        "admin.example.com": ["10.0.0.2"],
+        "shop.example.com": ["10.0.0.9"],
+        "blog.example.com": ["10.0.0.9"],
+    }
+    dns_server.wildcard = ["10.0.0.9"]
+    wordlist = tmp_path / "subdomains.txt"
+    wordlist.write_text("www\nshop\nmail\nadmin\nblog\n")
+    checked = []
+
+    def fake_signature(protocol, host, port, timeout=5):
+        checked.append(host)
+        if host == "www.example.com":
+            return HttpSignature(200, 5000, "real")
+        if host == "admin.example.com":
+            # An error page that differs from the catch-all still means a real host
+            return HttpSignature(403, 300, "forbidden")
+        if host == "blog.example.com":
+            # A virtual host on the wildcard address
+            return HttpSignature(200, 8000, "blog")
+        return HttpSignature(200, 100, "catch-all")
+
+    monkeypatch.setattr(network, "http_response_signature", fake_signature)
+    sample_target_info.set_protocol(80, "http")
+
+    output = custom.subdomain_enum_brute(
+        sample_target_info, "80", [str(wordlist), f"resolvers={dns_server.address}", "timeout=0.2"]
+    )
+
+    assert sorted(output) == [
+        ("admin.example.com", "10.0.0.2"), ("blog.example.com", "10.0.0.9"), ("www.example.com", "10.0.0.1"),
+    ]
+    # checked[0] probes the wildcard
+    assert sorted(checked[1:]) == [f"{name}.example.com" for name in ("admin", "blog", "mail", "shop", "www")]
+    assert set(sample_target_info.get_port(80).hostnames) == {
+        "admin.example.com", "blog.example.com", "www.example.com",
+    }
+
+
+def test_negative_cache_is_saved_in_the_output_path(dns_server, dns_caches, wordlist_cache, sample_target_info,
+                                                   tmp_path, monkeypatch):
+    """After init_config, names that do not exist are written to dns_negative_cache.json."""
+    from pyautoenum.config.log_pipeline import LogPipeline
+    from pyautoenum.config.manager import ConfigManager
+    from pyautoenum.modules import custom
+
+    config = ConfigManager()
+    monkeypatch.setattr(config, "path", config.path)
+    monkeypatch.setattr(ConfigManager, "log_pipeline", LogPipeline())
+    output = tmp_path / "output"
+    config.init_config(str(output))
+    wordlist = tmp_path / "subdomains.txt"
+    wordlist.write_text("mail\nftp\n")
+    monkeypatch.setattr(custom, "check_http_connection", lambda protocol, host, port: False)
+
+    try:
+        custom.subdomain_enum_brute(
+            sample_target_info, "80", [str(wordlist), f"resolvers={dns_server.address}", "timeout=0.2"]
+        )
+    finally:
+        ConfigManager.log_pipeline.close()
+
+    saved = (output / "dns_negative_cache.json").read_text()
+    assert "mail.example.com" in saved and "ftp.example.com" in saved
+
+
+def test_wildcard_cache_is_scoped_and_expires(dns_server):
+    """Wildcard detection is reused per domain and resolver set until it expires."""
+    dns_server.wildcard = ["10.0.0.9"]
+    cache = WildcardCache(ttl=60)
+
+    async def detect(resolvers, cache=cache):
+        async with DnsResolver(resolvers, rate=None, timeout=0.2, negative_cache=None) as resolver:
+            return await cache.detect(resolver, "example.com")
+
+    assert asyncio.run(detect([dns_server.address])) == {"10.0.0.9"}
+    queries = len(dns_server.queries)
+    assert asyncio.run(detect([dns_server.address])) == {"10.0.0.9"}
+    assert len(dns_server.queries) == queries
+
+    # Another resolver set detects again
+    assert asyncio.run(detect(["127.0.0.1:9"])) == frozenset()
+
+    # Expired entries are detected again
+    expiring = WildcardCache(ttl=0)
+    assert asyncio.run(detect([dns_server.address], expiring)) == {"10.0.0.9"}
+    dns_server.wildcard = []
+    assert asyncio.run(detect([dns_server.address], expiring)) == frozenset()
+
+
+def test_negative_cache_skips_known_names(dns_server, tmp_path):
+    """NXDOMAIN answers are remembered across runs and can be persisted."""
+    from pyautoenum.utils.dns import NegativeCache
+
+    dns_server.records = {"www.example.test": ["10.0.0.1"]}
+    names = ["www.example.test", "mail.example.test", "ftp.example.test"]
+    cache = NegativeCache()
+
+    async def run():
+        async with DnsResolver([dns_server.address], rate=None, timeout=0.2, negative_cache=cache) as resolver:
+            return [result async for result in resolver.resolve_many(names)]
+
+    asyncio.run(run())
+    results = asyncio.run(run())
+
+    assert {r.name: r.status for r in results}["mail.example.test"] == STATUS_NXDOMAIN
+    assert dns_server.queries.count("mail.example.test") == 1
+    assert dns_server.queries.count("www.example.test") == 2
+
+    cache.save(str(tmp_path / "negative.json"))
+    restored = NegativeCache()
+    restored.load(str(tmp_path / "negative.json"))
+    assert "ftp.example.test" in restored and "www.example.test" not in restored
@@ -0,0 +1,48 @@
+"""
+Tests for the parallel host liveness checks.
+"""
+
+import asyncio
+import socket
+import time
+
+from pyautoenum.utils.liveness import expand_targets, live_hosts, probe_host
+
+
+def _closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_expand_targets():
+    assert list(expand_targets("10.0.0.0/30")) == ["10.0.0.1", "10.0.0.2"]
+    assert list(expand_targets("10.0.0.5-7, example.test")) == ["10.0.0.5", "10.0.0.6", "10.0.0.7", "example.test"]
+    assert list(expand_targets("10.0.0.9/32")) == ["10.0.0.9"]
+    assert list(expand_targets("my-host-1")) == ["my-host-1"]
+
+
+def test_first_answer_wins():
+    with socket.socket() as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+        # A refused connect answers as fast as an accepted one
+        ports = [_closed_port(), server.getsockname()[1]]
+
+        start = time.monotonic()
+        result = asyncio.run(probe_host("127.0.0.1", ports, timeout=5.0, icmp=False))
+
+    assert result.alive
+    assert result.method.startswith("tcp/")
+    assert time.monotonic() - start < 1.0
+
+
+def test_unresolvable_host_is_down():
+    result = asyncio.run(probe_host("does-not-exist.invalid", [80], timeout=1.0, icmp=False))
+    assert not result.alive
+
+
+def test_sweep_range_with_bounded_concurrency():
+    port = _closed_port()
+    hosts = live_hosts("127.0.0.1-6", ports=[port], timeout=2.0, icmp=False, concurrency=2)
+    assert hosts == [f"127.0.0.{octet}" for octet in range(1, 7)]
@@ -0,0 +1,222 @@
+"""
+Tests for the PyAutoEnum logging layer.
+"""
+
+from pyautoenum.config.log_limiter import LogRateLimiter
+from pyautoenum.config.log_pipeline import LogPipeline
+from pyautoenum.config.log_record import LogLevel, LogRecord
+from pyautoenum.config.log_store import LogFileIndex, LogRingBuffer
+
+
+def test_log_pipeline_batches_and_flushes(tmp_path):
+    """Queued lines reach the file in order once flushed."""
+    log_file = tmp_path / "logs.txt"
+    pipeline = LogPipeline(flush_interval=60)
+    pipeline.submit("[*] queued before start")
+    pipeline.start(str(log_file))
+    for i in range(10):
+        pipeline.submit(f"[*] line {i}")
+    pipeline.close()
+
+    lines = log_file.read_text().splitlines()
+    assert lines[0] == "[*] queued before start"
+    assert lines[-1] == "[*] line 9"
+    stats = pipeline.get_stats()
+    assert stats["written"] == 11
+    assert stats["queued"] == 0
+
+
+def test_log_pipeline_counts_dropped_records(tmp_path):
+    """A full queue drops new lines instead of blocking the caller."""
+    pipeline = LogPipeline(max_queue=3)
+    results = [pipeline.submit(f"line {i}") for i in range(5)]
+
+    assert results == [True, True, True, False, False]
+    assert pipeline.get_stats()["dropped"] == 2
+
+
+def test_log_pipeline_keeps_lines_of_failed_writes(tmp_path):
+    """Lines of a batch whose write failed are written by the next drain."""
+    log_file = tmp_path / "logs.txt"
+    pipeline = LogPipeline(flush_interval=60)
+    pipeline.start(str(log_file))
+    real_file = pipeline._file
+
+    class FullDisk:
+        def write(self, data):
+            raise OSError(28, "No space left on device")
+
+    pipeline._file = FullDisk()
+    pipeline.submit("first")
+    try:
+        pipeline.flush()
+    except OSError:
+        pass
+    pipeline._file = real_file
+    pipeline.submit("second")
+    pipeline.close()
+
+    assert log_file.read_text().splitlines() == ["first", "second"]
+    assert pipeline.get_stats()["written"] == 2
+
+
+def test_log_ring_buffer_is_bounded():
+    """The ring buffer keeps only the newest entries and pages back through them."""
+    buffer = LogRingBuffer(capacity=5)
+    for i in range(12):
+        buffer.append(i)
+
+    assert len(buffer) == 5
+    assert buffer.total == 12
+    assert buffer.tail(3) == [9, 10, 11]
+    assert buffer.tail(2, skip=2) == [8, 9]
+    assert buffer.tail() == [7, 8, 9, 10, 11]
+
+
+def test_log_pipeline_rotates_and_reads_history(tmp_path):
+    """Rotated files stay readable through the offset index."""
+    log_file = tmp_path / "logs.txt"
+    pipeline = LogPipeline(flush_interval=60, max_bytes=200, backup_count=3)
+    pipeline.start(str(log_file))
+    for i in range(40):
+        pipeline.submit(f"line {i:03d}")
+        pipeline.flush()
+
+    assert (tmp_path / "logs.1.txt").exists()
+    assert pipeline.read_history(0, 3) == ["line 037", "line 038", "line 039"]
+    assert pipeline.read_history(20, 2) == ["line 018", "line 019"]
+    pipeline.close()
+
+    # A fresh index rebuilt from the files on disk gives the same answer
+    index = LogFileIndex(str(log_file), backup_count=3, interval=4)
+    assert index.read(20, 2) == ["line 018", "line 019"]
+
+
+def test_log_record_formats_lazily():
+    """Templates are only formatted when the message is read."""
+    calls = []
+
+    class Tracked:
+        def __format__(self, spec):
+            calls.append(spec)
+            return "tracked"
+
+    record = LogRecord(LogLevel.SUCCESS, "Found {}", (Tracked(),), module="demo", port=80)
+    assert calls == []
+    assert str(record) == "[+] Found tracked"
+
+    restored = LogRecord.from_json(record.to_json())
+    assert restored.level == LogLevel.SUCCESS
+    assert restored.module == "demo"
+    assert restored.message == "Found tracked"
+
+
+def test_min_log_level_skips_records():
+    """Records below the minimum level are never created."""
+    from pyautoenum.config.manager import ConfigManager
+
+    previous = ConfigManager.min_log_level
+    try:
+        ConfigManager.set_log_level("warning")
+        ConfigManager.log_info("hidden {}", 1, module="demo")
+        ConfigManager.log_error("shown {}", 2, module="demo")
+        ConfigManager.log_warning("other module", module="other")
+    finally:
+        ConfigManager.min_log_level = previous
+
+    demo_logs = ConfigManager.get_logs(10, module="demo")
+    assert [record.message for record in demo_logs][-1:] == ["shown 2"]
+    assert all(record.message != "hidden 1" for record in ConfigManager.get_logs())
+    errors = ConfigManager.get_logs(1, min_level=LogLevel.ERROR)
+    assert errors[0].message == "shown 2"
+
+
+def test_rate_limiter_summarizes_repeats_and_floods():
+    """Repeats and over-limit records are held back and summarized."""
+    limiter = LogRateLimiter(window=10.0, level_limits={LogLevel.INFO: 3},
+                             module_limits={"quiet": 1}, dedupe_levels=[LogLevel.ERROR])
+
+    repeat = [limiter.check(LogRecord(LogLevel.ERROR, "timeout on {}", ("a",)), now=0.0)[0]
+              for _ in range(5)]
+    assert repeat == [True, False, False, False, False]
+
+    flood = [limiter.check(LogRecord(LogLevel.INFO, "found {}", (i,)), now=1.0)[0]
+             for i in range(10)]
+    assert flood.count(True) == 3
+
+    quiet = [limiter.check(LogRecord(LogLevel.INFO, "x {}", (i,), module="quiet"), now=1.0)[0]
+             for i in range(3)]
+    assert quiet == [True, False, False]
+
+    allowed, summaries = limiter.check(LogRecord(LogLevel.ERROR, "timeout on {}", ("a",)), now=11.0)
+    messages = sorted(summary.message for summary in summaries)
+    assert allowed
+    assert '"timeout on a" repeated 4 times in the last 10s' in messages
+    assert 'Suppressed 7 messages like "found 9" in the last 10s' in messages
+    assert limiter.suppressed_total == 13
+
+
+def test_rate_limiter_only_limits_opted_in_sites():
+    """Without configuration only call sites that ask for a limit are limited."""
+    limiter = LogRateLimiter(window=10.0)
+
+    errors = [limiter.check(LogRecord(LogLevel.ERROR, "failed {}", (i,)), now=0.0)[0] for i in range(100)]
+    found = [limiter.check(LogRecord(LogLevel.SUCCESS, "found {}", (i,)), now=0.0)[0] for i in range(100)]
+    noisy = [limiter.check(LogRecord(LogLevel.INFO, "hit {}", (i,)), now=0.0, limit=5)[0] for i in range(100)]
+    assert all(errors) and all(found)
+    assert noisy.count(True) == 5
+
+    # Configured limits take precedence over the call site's
+    limiter.configure(level_limits={LogLevel.INFO: 50})
+    more = [limiter.check(LogRecord(LogLevel.INFO, "hit {}", (i,)), now=11.0, limit=5)[0] for i in range(100)]
+    assert more.count(True) == 50
+
+
+def test_rate_limiter_dedupes_opted_in_sites_and_reports_when_the_window_ends():
+    """Repeats are only dropped where asked for, and summarized without waiting for another record."""
+    import threading
+
+    summaries = []
+    summarized = threading.Event()
+
+    def on_summary(record):
+        summaries.append(record.message)
+        summarized.set()
+
+    limiter = LogRateLimiter(window=0.2, on_summary=on_summary)
+    plain = [limiter.check(LogRecord(LogLevel.ERROR, "timeout on {}", ("a",)))[0] for _ in range(3)]
+    assert plain == [True, True, True]
+
+    noisy = [limiter.check(LogRecord(LogLevel.INFO, "hit {}", ("a",)), limit=100)[0] for _ in range(4)]
+    assert noisy == [True, False, False, False]
+
+    assert summarized.wait(2.0)
+    assert summaries == ['"hit a" repeated 3 times in the last 1s']
+    assert limiter.flush() == []
+
+
+def test_filtered_log_pages_continue_on_disk(tmp_path, monkeypatch):
+    """A level filter counts matching records only, across the memory/disk boundary."""
+    from pyautoenum.config.manager import ConfigManager
+
+    monkeypatch.setattr(ConfigManager, "logs", LogRingBuffer(capacity=10))
+    monkeypatch.setattr(ConfigManager, "log_pipeline", LogPipeline(formatter=LogRecord.to_json))
+    ConfigManager.log_pipeline.start(str(tmp_path / "logs.jsonl"))
+    for i in range(30):
+        ConfigManager._emit_log(LogRecord(LogLevel.ERROR if i % 3 == 0 else LogLevel.INFO, "record {}", (i,)))
+
+    def page(number):
+        return [record.message for record in ConfigManager.get_log_page(number, 2, min_level=LogLevel.ERROR)]
+
+    try:
+        # 21, 24 and 27 are still in memory; 18 and older only on disk
+        assert page(0) == ["record 24", "record 27"]
+        assert page(1) == ["record 18", "record 21"]
+        assert page(2) == ["record 12", "record 15"]
+        assert page(4) == ["record 0", "record 3"]
+        assert page(5) == []
+        assert [record.message for record in ConfigManager.get_log_page(2, 4)] == [
+            f"record {i}" for i in range(18, 22)
+        ]
+    finally:
+        ConfigManager.log_pipeline.close()
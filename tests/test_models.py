@@ -0,0 +1,130 @@
+"""
+Tests for the PyAutoEnum data models.
+"""
+
+import json
+
+import pytest
+
+from pyautoenum.data.models import OrderedSet, PortData
+
+
+def test_ordered_set_keeps_insertion_order():
+    """OrderedSet drops duplicates but keeps first-seen order."""
+    items = OrderedSet(["b", "a", "b"])
+    items.add("c")
+    items.append("a")
+    items.update(["d", "c", "e"])
+
+    assert list(items) == ["b", "a", "c", "d", "e"]
+    assert "d" in items
+    assert len(items) == 5
+
+
+def test_port_data_serializes_sets_as_lists():
+    """PortData.to_dict emits plain JSON lists for hostnames and modules."""
+    port_data = PortData(hostnames=["a.example.com"], modules=["check_for_http"])
+    port_data.update({"hostnames": ["b.example.com", "a.example.com"]})
+
+    data = json.loads(json.dumps(port_data.to_dict()))
+    assert data["hostnames"] == ["a.example.com", "b.example.com"]
+    assert data["modules"] == ["check_for_http"]
+
+
+def test_target_info_merge(sample_target_info):
+    """Merging a scan result creates new ports and updates known ones."""
+    sample_target_info.mark_module_as_run(80, "check_for_http")
+    sample_target_info.merge({
+        "80": {"protocol": "http", "modules": ["Nikto"], "hostnames": []},
+        "22": {"protocol": "ssh", "product": "OpenSSH"},
+    })
+
+    assert sample_target_info.get_port(80).protocol == "http"
+    assert list(sample_target_info.get_port(80).modules) == ["check_for_http", "Nikto"]
+    assert sample_target_info.get_port(22).product == "OpenSSH"
+    assert sample_target_info.check_module_finished(80, "Nikto")
+
+
+def test_snapshot_is_versioned_and_immutable(sample_target_info):
+    """Writers publish new snapshots; old snapshots stay untouched."""
+    before = sample_target_info.snapshot()
+    sample_target_info.add_hostname(443, "www.example.com", "https")
+    after = sample_target_info.snapshot()
+
+    assert after.version > before.version
+    assert "443" not in before.ports
+    assert after.get_port(443).hostnames == ("www.example.com",)
+    assert after.to_dict() == sample_target_info.to_dict()
+
+    # Snapshots handed out by get_port() are deeply immutable
+    sample_target_info.add_information(443, "paths", {"/admin": [200]})
+    infos = sample_target_info.get_port(443).infos
+    with pytest.raises(TypeError):
+        infos["paths"]["/login"] = [200]
+    assert infos["paths"]["/admin"] == (200,)
+    assert sample_target_info.to_dict()["ports"]["443"]["infos"] == {"paths": {"/admin": [200]}}
+    after = sample_target_info.snapshot()
+
+    # No-op writes do not publish a new version
+    sample_target_info.add_hostname(443, "www.example.com", "https")
+    assert sample_target_info.version == after.version
+
+
+def test_apply_rescan_only_invalidates_changed_services(sample_target_info):
+    """A re-scan keeps results on stable services and forgets the rest."""
+    sample_target_info.merge({
+        "22": {"protocol": "ssh", "product": "OpenSSH", "version": "8.9"},
+        "80": {"protocol": "http", "product": "nginx", "version": "1.18"},
+    })
+    sample_target_info.mark_module_as_run(22, "ssh_audit")
+    sample_target_info.mark_module_as_run(80, "Nikto")
+
+    invalidated = sample_target_info.apply_rescan({
+        "22": {"protocol": "ssh", "product": "OpenSSH", "version": "8.9"},
+        "80": {"protocol": "http", "product": "nginx", "version": "1.24"},
+        "443": {"protocol": "https"},
+    })
+
+    assert invalidated == {"80": ["Nikto"]}
+    assert sample_target_info.check_module_finished(22, "ssh_audit")
+    assert not sample_target_info.check_module_finished(80, "Nikto")
+    assert sample_target_info.get_port(80).version == "1.24"
+    assert sample_target_info.snapshot().get_port(443).protocol == "https"
+
+
+def test_apply_rescan_expires_old_results(sample_target_info):
+    """Module results older than max_age are scheduled again."""
+    sample_target_info.merge({"22": {"protocol": "ssh"}})
+    sample_target_info.mark_module_as_run(22, "ssh_audit")
+    sample_target_info.ports["22"].module_runs["ssh_audit"]["time"] -= 7200
+
+    invalidated = sample_target_info.apply_rescan({"22": {"protocol": "ssh"}}, max_age=3600)
+
+    assert invalidated == {"22": ["ssh_audit"]}
+
+
+def test_forget_module_keeps_running_ports(sample_target_info):
+    """Forgetting a module re-queues it everywhere except the kept ports."""
+    for port in ("22", "80"):
+        sample_target_info.ensure_port(port)
+        sample_target_info.mark_module_as_run(port, "Nikto")
+
+    assert sample_target_info.forget_module("Nikto", keep_ports=["80"]) == ["22"]
+    assert not sample_target_info.check_module_finished(22, "Nikto")
+    assert sample_target_info.check_module_finished(80, "Nikto")
+
+
+def test_snapshots_share_unchanged_ports(sample_target_info):
+    """Publishing a change replaces only the changed port in the snapshot."""
+    for port in range(1, 201):
+        sample_target_info.ensure_port(port)
+    before = sample_target_info.snapshot()
+    for port in range(1, 101):
+        sample_target_info.add_information(port, "banner", f"service {port}")
+    after = sample_target_info.snapshot()
+
+    assert list(after.ports) == list(before.ports)
+    assert len(after.ports) == len(sample_target_info.ports)
+    assert after.ports["150"] is before.ports["150"]
+    assert after.get_port(7).infos["banner"] == "service 7"
+    assert "banner" not in before.get_port(7).infos
@@ -0,0 +1,115 @@
+"""
+Tests for the pooled HTTP client and the response cache.
+"""
+
+import http.server
+import threading
+
+import pytest
+
+from pyautoenum.utils.http_cache import ResponseCache
+from pyautoenum.utils.network import HttpClient
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.requests += 1
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _CountingServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    connections = 0
+    requests = 0
+
+    def get_request(self):
+        self.connections += 1
+        return super().get_request()
+
+
+@pytest.fixture
+def http_server():
+    """Keep-alive HTTP server on loopback that counts accepted connections."""
+    server = _CountingServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_client_reuses_connections(http_server):
+    client = HttpClient(pool_maxsize=2)
+    url = f"http://127.0.0.1:{http_server.server_address[1]}/"
+
+    for _ in range(10):
+        assert client.get(url).text == "ok"
+    assert http_server.connections == 1
+
+    # Threads share the pool, bounded by pool_maxsize
+    threads = [threading.Thread(target=lambda: [client.get(url) for _ in range(5)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    client.close()
+
+    assert http_server.connections <= 2
+    assert client.get_stats()["requests"] == 30
+
+
+def test_cached_requests_are_sent_once(http_server, monkeypatch):
+    from pyautoenum.utils import network
+
+    cache = ResponseCache(max_entries=2)
+    monkeypatch.setattr(network, "response_cache", cache)
+    client = HttpClient()
+    url = f"http://127.0.0.1:{http_server.server_address[1]}/"
+
+    threads = [threading.Thread(target=client.get, args=(url,), kwargs={"cache": True}) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert http_server.requests == 1
+
+    # Host header and redirect handling are part of the key
+    client.get(url, cache=True, headers={"Host": "vhost.test"})
+    client.get(url, cache=True, allow_redirects=False)
+    assert http_server.requests == 3
+    # Only two entries fit: the first one was evicted
+    client.get(url, cache=True)
+    assert http_server.requests == 4
+    assert cache.get_stats()["hits"] == 7
+
+
+def test_parse_page_is_memoized_by_content():
+    class Response:
+        url = "http://example.test/dir/"
+        headers = {"Server": "nginx"}
+        content = b"<html><title> It works </title><a href='a.html'>A</a><a href='/b'>B</a></html>"
+
+    cache = ResponseCache(ttl=None)
+    page = cache.parse_page(Response())
+    again = cache.parse_page(Response())
+
+    assert page.title == "It works"
+    assert page.links == ("http://example.test/dir/a.html", "http://example.test/b")
+    assert again.headers == {"server": "nginx"}
+    assert cache.get_stats()["parsed"] == 1
+    assert cache.get_stats()["parse_hits"] == 1
+
+    # The same body at another host resolves its links against that host
+    class Elsewhere(Response):
+        url = "http://other.test/x/"
+
+    assert cache.parse_page(Elsewhere()).links == ("http://other.test/x/a.html", "http://other.test/b")
+    assert cache.get_stats()["parsed"] == 1
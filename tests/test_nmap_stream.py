@@ -0,0 +1,356 @@
+"""
+Tests for streaming nmap XML ingestion, using a stand-in nmap executable.
+"""
+
+import os
+import stat
+import sys
+import textwrap
+import time
+
+import pytest
+
+from pyautoenum.utils.nmap_stream import (
+    NmapProgress,
+    ScanBudget,
+    ShardController,
+    format_ports,
+    run_nmap,
+    run_sharded_nmap,
+    split_output_option,
+    split_port_option,
+    terminate_running,
+)
+
+FAKE_NMAP = textwrap.dedent('''\
+    #!{python}
+    import sys, time
+    args = sys.argv[1:]
+    out = open(args[args.index("-oX") + 1], "w")
+    def emit(text):
+        out.write(text)
+        out.flush()
+    def say(text):
+        print(text, flush=True)
+    say("Discovered open port 22/tcp on 127.0.0.1")
+    emit('<?xml version="1.0"?>\\n<!DOCTYPE nmaprun>\\n<nmaprun scanner="nmap" args="%s">\\n' % " ".join(sys.argv[1:]))
+    emit('<taskprogress task="Connect Scan" time="1" percent="40.00" remaining="10"/>\\n')
+    emit('<host><address addr="127.0.0.1" addrtype="ipv4"/><ports>'
+         '<port protocol="tcp" portid="22"><state state="open"/><service name="ssh" product="OpenSSH" version="9.6"/></port>'
+         '<port protocol="tcp" portid="25"><state state="closed"/></port>'
+         '</ports></host>\\n')
+    say("Discovered open port 443/tcp on localhost (127.0.0.1)")
+    time.sleep(1.0)
+    emit('<taskprogress task="Service scan" time="2" percent="50.00" remaining="5"/>\\n')
+    emit('<host><address addr="127.0.0.1" addrtype="ipv4"/><ports>'
+         '<port protocol="tcp" portid="443"><state state="open"/><service name="http" tunnel="ssl" product="nginx"/></port>'
+         '</ports></host>\\n')
+    emit('<runstats><finished time="3"/></runstats></nmaprun>\\n')
+    sys.stderr.write("Warning: stand-in nmap\\n")
+''')
+
+# Stand-in for sharded runs: ports in $FAKE_OPEN are open, the others closed.
+# The shard starting at $FAKE_LOSSY gets no responses at all the first time.
+FAKE_SHARD_NMAP = textwrap.dedent('''\
+    #!{python}
+    import os, sys
+    args = sys.argv[1:]
+    spec = args[args.index("-p") + 1]
+    ports = []
+    for part in spec.split(","):
+        first, _, last = part.partition("-")
+        ports.extend(range(int(first), int(last or first) + 1))
+    with open(os.environ["FAKE_LOG"], "a") as log:
+        log.write(spec + "\\n")
+    marker = os.environ["FAKE_LOG"] + ".lossy"
+    lossy = str(ports[0]) == os.environ.get("FAKE_LOSSY") and not os.path.exists(marker)
+    if lossy:
+        open(marker, "w").close()
+    opened = [] if lossy else [p for p in ports if str(p) in os.environ["FAKE_OPEN"].split(",")]
+    state, reason = ("filtered", "no-response") if lossy else ("closed", "reset")
+    if "-oN" in args:
+        with open(args[args.index("-oN") + 1], "w") as report:
+            report.write("ports %s\\n" % spec)
+    out = ['<?xml version="1.0"?><nmaprun><host><address addr="127.0.0.1" addrtype="ipv4"/><ports>']
+    out.append('<extraports state="%s" count="%d"><extrareasons reason="%s" count="%d"/></extraports>'
+               % (state, len(ports) - len(opened), reason, len(ports) - len(opened)))
+    for p in opened:
+        out.append('<port protocol="tcp" portid="%d"><state state="open" reason="syn-ack"/></port>' % p)
+    out.append("</ports></host></nmaprun>")
+    with open(args[args.index("-oX") + 1], "w") as xml:
+        xml.write("".join(out))
+''')
+
+# Version scan stand-in: every port asked for runs $FAKE_PRODUCT/$FAKE_VERSION
+FAKE_VERSION_NMAP = textwrap.dedent('''\
+    #!{python}
+    import os, sys
+    args = sys.argv[1:]
+    ports = args[args.index("-p") + 1].split(",")
+    out = ['<?xml version="1.0"?><nmaprun><host><address addr="127.0.0.1" addrtype="ipv4"/><ports>']
+    for p in ports:
+        out.append('<port protocol="tcp" portid="%s"><state state="open"/><service name="ssh" product="%s" '
+                   'version="%s" method="probed"/></port>' % (p, os.environ["FAKE_PRODUCT"], os.environ["FAKE_VERSION"]))
+    out.append("</ports></host></nmaprun>")
+    with open(args[args.index("-oX") + 1], "w") as xml:
+        xml.write("".join(out))
+''')
+
+# Stand-in that finds its first port and then hangs until it is killed
+FAKE_HANGING_NMAP = textwrap.dedent('''\
+    #!{python}
+    import sys, time
+    args = sys.argv[1:]
+    first = args[args.index("-p") + 1].split(",")[0].split("-")[0]
+    print("Discovered open port %s/tcp on 127.0.0.1" % first, flush=True)
+    time.sleep(60)
+''')
+
+
+def _install(tmp_path, monkeypatch, script):
+    path = tmp_path / "nmap"
+    path.write_text(script.format(python=sys.executable))
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ.get('PATH', '')}")
+    return path
+
+
+@pytest.fixture
+def fake_nmap(tmp_path, monkeypatch):
+    """Put a stand-in nmap that finds two ports and writes their hosts one second apart first on PATH."""
+    return _install(tmp_path, monkeypatch, FAKE_NMAP)
+
+
+def test_ports_are_streamed_before_nmap_exits(fake_nmap):
+    seen = []
+    progress = []
+
+    def on_port(address, port_data):
+        seen.append((time.monotonic(), address, port_data))
+
+    errors = run_nmap("127.0.0.1", ["-Pn", "-sV", "-p", "22,25,443"], on_port, progress.append)
+    finished = time.monotonic()
+
+    events = {}
+    for when, address, data in seen:
+        events.setdefault(data["port"], []).append((when, address, data["state"], data["product"]))
+    # Found ports come first from the verbose output, then with their details from the XML
+    assert {port: [event[1:] for event in port_events] for port, port_events in events.items()} == {
+        "22": [("127.0.0.1", "open", ""), ("127.0.0.1", "open", "OpenSSH")],
+        "25": [("127.0.0.1", "closed", "")],
+        "443": [("127.0.0.1", "open", ""), ("127.0.0.1", "open", "nginx")],
+    }
+    assert seen[-1][2]["protocol"] == "https"
+    # 443 was reported while the stand-in was still sleeping, its details only after
+    assert finished - events["443"][0][0] > 0.5
+    assert events["443"][1][0] - events["443"][0][0] > 0.5
+    assert progress == [20.0, 75.0]
+    assert errors == ["Warning: stand-in nmap"]
+
+
+def test_progress_is_monotonic_and_phase_weighted():
+    progress = NmapProgress(["-sS"])
+    assert progress.update("SYN Stealth Scan", 30.0) == 30.0
+    assert progress.update("Ping Scan", 90.0) == 30.0
+    assert progress.update("SYN Stealth Scan", 10.0) == 30.0
+    assert progress.update("SYN Stealth Scan", 100.0) == 99.0
+
+
+def test_check_open_ports_merges_streamed_ports(fake_nmap):
+    from pyautoenum.config.manager import ConfigManager
+    from pyautoenum.data.models import TargetInfo
+    from pyautoenum.modules.custom import check_open_ports
+
+    target_info = TargetInfo(ConfigManager(), ip="127.0.0.1")
+    target_info.merge({"443": {"protocol": "https"}, "22": {"protocol": ""}})
+
+    discovered = check_open_ports(target_info, None, ["-Pn", "-sV"])
+
+    assert sorted(discovered) == ["22", "443"]
+    ports = target_info.snapshot().ports
+    assert ports["22"].protocol == "ssh"
+    assert ports["22"].product == "OpenSSH"
+    assert ports["443"].product == "nginx"
+
+
+def test_port_option_helpers():
+    assert split_port_option(["-Pn", "-p", "1-100", "-sV"]) == ("1-100", ["-Pn", "-sV"])
+    assert split_port_option(["-p-", "-Pn"]) == ("-", ["-Pn"])
+    assert split_port_option(["-p22,80"]) == ("22,80", [])
+    assert split_port_option(["-Pn"]) == (None, ["-Pn"])
+    assert split_output_option(["-oN", "out.txt", "-sV"]) == ("out.txt", ["-sV"])
+    assert split_output_option(["-oNout.txt"]) == ("out.txt", [])
+    assert format_ports([1, 2, 3, 7, 9, 10]) == "1-3,7,9-10"
+
+
+def test_shard_controller_slow_start_and_backoff():
+    controller = ShardController(8)
+    assert controller.limit == 1
+    assert not controller.record(256, 0)
+    assert controller.limit == 2
+    assert not controller.record(256, 1)
+    assert controller.limit == 4
+    assert controller.record(256, 128)
+    assert controller.limit == 2
+    assert not controller.record(256, 0)
+    assert controller.limit == 3
+
+
+def test_scan_budget_shares_the_packet_rate_between_running_processes():
+    """Rate shares are settled as processes start and never exceed the budget together."""
+    import threading
+
+    budget = ScanBudget(processes=8, max_rate=1000)
+    with budget.slot() as rate:
+        assert rate == 1000
+    with budget.slot(max_rate=400, parallel=2) as rate:
+        assert rate == 200
+
+    first = budget.slot(parallel=2)
+    second = budget.slot(parallel=2)
+    assert (first.__enter__(), second.__enter__()) == (500, 500)
+
+    # A third process waits until a running one leaves room for its share
+    shares = []
+    third = threading.Thread(target=lambda: shares.append(budget._take_rate(1000, 3)))
+    third.start()
+    third.join(0.2)
+    assert third.is_alive()
+    first.__exit__(None, None, None)
+    third.join(2.0)
+    assert shares == [333]
+    assert sum(budget.rates) <= 1000
+    second.__exit__(None, None, None)
+    budget._release_rate(shares[0])
+    assert budget.rates == []
+
+
+def test_sharded_scan_merges_all_shards_and_rescans_lossy_ones(tmp_path, monkeypatch):
+    _install(tmp_path, monkeypatch, FAKE_SHARD_NMAP)
+    log = tmp_path / "shards.log"
+    open_ports = [5, 300, 1000, 1800, 2047]
+    monkeypatch.setenv("FAKE_LOG", str(log))
+    monkeypatch.setenv("FAKE_OPEN", ",".join(map(str, open_ports)))
+    # The fourth chunk of 256 ports
+    monkeypatch.setenv("FAKE_LOSSY", "769")
+    found = []
+    progress = []
+
+    report = tmp_path / "report.txt"
+
+    run_sharded_nmap(
+        "127.0.0.1", ["-Pn"], range(1, 2049),
+        lambda address, data: found.append(int(data["port"])), progress.append, max_shards=4,
+        normal_output=str(report),
+    )
+
+    specs = log.read_text().split()
+    assert len(specs) == 9  # eight chunks, one scanned twice
+    assert specs.count("769-1024") == 2
+    assert sorted(found) == open_ports
+    assert progress[-1] == 99.0
+    # The chunks' normal output is joined in port order
+    assert report.read_text().split("\n")[:2] == ["ports 1-256", "ports 257-512"]
+    assert len(report.read_text().splitlines()) == 8
+    assert not list(tmp_path.glob("report.txt.*"))
+
+
+def test_version_scan_fingerprints_ports_found_by_discovery(tmp_path, monkeypatch):
+    """full_nmap fingerprints discovered ports; a re-scan re-runs it and reacts to changes."""
+    import socket
+
+    from pyautoenum.config.manager import ConfigManager
+    from pyautoenum.core.scan import ScanManager
+    from pyautoenum.data.models import Module, TargetInfo
+    from pyautoenum.modules.custom import check_open_ports
+
+    _install(tmp_path, monkeypatch, FAKE_VERSION_NMAP)
+    monkeypatch.setenv("FAKE_PRODUCT", "OpenSSH")
+    monkeypatch.setenv("FAKE_VERSION", "9.6")
+    sockets = {}
+    for _ in range(2):
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        sock.listen(8)
+        sockets[str(sock.getsockname()[1])] = sock
+    first, second = sorted(sockets, key=int)
+    full_nmap = Module("full_nmap", "", "check_open_ports", requirements=["discovery_complete"])
+    target_info = TargetInfo(ConfigManager(), ip="127.0.0.1")
+    monkeypatch.setattr(ConfigManager, "target_info", target_info)
+    monkeypatch.setattr(ConfigManager, "modules", [full_nmap])
+
+    manager = ScanManager(ports=f"{first},{second}")
+    manager._target = "127.0.0.1"
+    manager._run_discovery(has_session=False)
+    assert target_info.get_port(first).fingerprint == ""
+
+    check_open_ports(target_info, None, ["-Pn", "-sV"])
+    target_info.mark_module_as_run("target", "full_nmap")
+    for port in (first, second):
+        target_info.mark_module_as_run(port, "ssh_audit")
+    fingerprint = target_info.get_port(first).fingerprint
+    assert fingerprint
+    assert target_info.get_port(first).product == "OpenSSH"
+    assert target_info.get_port(first).module_runs["ssh_audit"]["service"] == fingerprint
+
+    # Re-scan: the second port closed and the first one got upgraded
+    sockets.pop(second).close()
+    manager = ScanManager(rescan=True, ports=f"{first},{second}")
+    manager._target = "127.0.0.1"
+    manager._run_discovery(has_session=True)
+    assert list(target_info.snapshot().ports) == [first, "target"]
+    assert not target_info.check_module_finished("target", "full_nmap")
+    assert target_info.check_module_finished(first, "ssh_audit")
+
+    monkeypatch.setenv("FAKE_VERSION", "9.7")
+    check_open_ports(target_info, None, ["-Pn", "-sV"])
+    assert target_info.get_port(first).version == "9.7"
+    assert target_info.get_port(first).fingerprint != fingerprint
+    assert not target_info.check_module_finished(first, "ssh_audit")
+    sockets[first].close()
+
+
+def test_stopping_terminates_running_shards_and_frees_the_budget(tmp_path, monkeypatch):
+    import threading
+
+    _install(tmp_path, monkeypatch, FAKE_HANGING_NMAP)
+    budget = ScanBudget(processes=4, max_rate=1000)
+    stop = threading.Event()
+    found = []
+    scan = threading.Thread(target=lambda: run_sharded_nmap(
+        "127.0.0.1", ["-Pn"], range(1, 2049), lambda address, data: found.append(data["port"]),
+        max_shards=2, max_rate=1000, budget=budget, should_stop=stop.is_set,
+    ))
+    scan.start()
+    deadline = time.monotonic() + 10
+    while not found and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert found
+
+    stop.set()
+    scan.join(5.0)
+    assert not scan.is_alive()
+    # No further chunks were started and every share was given back
+    assert len(found) <= 2
+    assert budget.rates == []
+    for _ in range(4):
+        assert budget._slots.acquire(blocking=False)
+
+
+def test_terminate_running_ends_nmap_processes(tmp_path, monkeypatch):
+    import threading
+
+    _install(tmp_path, monkeypatch, FAKE_HANGING_NMAP)
+    found = []
+    scan = threading.Thread(target=lambda: run_nmap(
+        "127.0.0.1", ["-p", "80"], lambda address, data: found.append(data["port"]),
+    ))
+    scan.start()
+    deadline = time.monotonic() + 10
+    while not found and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    terminate_running()
+    scan.join(5.0)
+    assert not scan.is_alive()
+    assert found == ["80"]
@@ -0,0 +1,106 @@
+"""
+Tests for the TCP connect scanner against loopback listeners.
+"""
+
+import asyncio
+import socket
+
+import pytest
+
+from pyautoenum.utils.portscan import ConnectScanner, parse_ports
+
+
+@pytest.fixture
+def listeners():
+    """Open three listening sockets on loopback and return their ports."""
+    sockets = []
+    for _ in range(3):
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        sock.listen(64)
+        sockets.append(sock)
+    yield sorted(sock.getsockname()[1] for sock in sockets)
+    for sock in sockets:
+        sock.close()
+
+
+def test_parse_ports():
+    """Port specs accept lists, ranges and open ends, and reject bad ports."""
+    assert parse_ports("80, 22,8000-8002,80") == [22, 80, 8000, 8001, 8002]
+    assert parse_ports("65534-") == [65534, 65535]
+    with pytest.raises(ValueError):
+        parse_ports("0-10")
+    with pytest.raises(ValueError):
+        parse_ports("http")
+
+
+def test_scanner_streams_open_ports(listeners):
+    """Open ports are yielded among closed neighbours and the timeout adapts."""
+    scanner = ConnectScanner(concurrency=500)
+    # Closed neighbours around every listener, scanned together
+    ports = sorted({p + offset for p in listeners for offset in range(-200, 200) if 0 < p + offset < 65536})
+
+    async def collect():
+        return [port async for port in scanner.scan("127.0.0.1", ports)]
+
+    found = asyncio.run(collect())
+
+    assert sorted(found) == listeners
+    stats = scanner.get_stats()
+    assert stats["open"] == 3
+    assert stats["closed"] == len(ports) - 3
+    # Loopback answers in microseconds, so the timeout shrinks to its floor
+    assert stats["timeout"] == scanner.min_timeout
+
+
+def test_discovery_merges_ports_into_target(listeners, monkeypatch):
+    """Discovery adds open ports without guessing their protocol."""
+    from pyautoenum.config.manager import ConfigManager
+    from pyautoenum.core.scan import ScanManager
+    from pyautoenum.data.models import TargetInfo
+
+    target_info = TargetInfo(ConfigManager(), ip="127.0.0.1")
+    monkeypatch.setattr(ConfigManager, "target_info", target_info)
+    manager = ScanManager(ports=",".join(str(port) for port in listeners))
+    manager._target = "127.0.0.1"
+
+    manager._run_discovery(has_session=False)
+
+    assert sorted(int(port) for port in target_info.snapshot().ports) == listeners
+    assert all(port.protocol == "" for port in target_info.snapshot().ports.values())
+    assert manager._discovery_complete
+
+
+def test_version_scan_replaces_empty_discovery_protocol(sample_target_info):
+    """A port added by discovery takes the protocol nmap reports later."""
+    sample_target_info.merge({"2222": {"protocol": "", "product": "", "version": ""}})
+    sample_target_info.merge({"2222": {"protocol": "ssh", "product": "OpenSSH", "version": "9.6"}})
+
+    assert sample_target_info.get_port(2222).protocol == "ssh"
+
+
+def test_rescan_without_open_ports_removes_closed_ports(monkeypatch):
+    """A re-scan that finds nothing open still removes the stored ports it checked."""
+    from pyautoenum.config.manager import ConfigManager
+    from pyautoenum.core.scan import ScanManager
+    from pyautoenum.data.models import TargetInfo
+
+    # Ports that were open last time and are closed now
+    closed = []
+    for _ in range(2):
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        closed.append(sock.getsockname()[1])
+        sock.close()
+    target_info = TargetInfo(ConfigManager(), ip="127.0.0.1")
+    target_info.merge({str(port): {"protocol": "http"} for port in closed})
+    target_info.mark_module_as_run(str(closed[0]), "nikto")
+    monkeypatch.setattr(ConfigManager, "target_info", target_info)
+    monkeypatch.setattr(ConfigManager, "modules", [])
+    manager = ScanManager(rescan=True, ports=",".join(str(port) for port in closed))
+    manager._target = "127.0.0.1"
+
+    manager._run_discovery(has_session=True)
+
+    assert not any(str(port) in target_info.snapshot().ports for port in closed)
+    assert manager._discovery_complete
@@ -0,0 +1,184 @@
+"""
+Tests for protocol sniffing against loopback services.
+"""
+
+import asyncio
+import os
+import shutil
+import socket
+import ssl
+import subprocess
+import threading
+import time
+
+import pytest
+
+from pyautoenum.utils.sniff import PROTOCOL_HTTP, PROTOCOL_HTTPS, classify, sniff_protocols
+
+
+def _serve(reply, tls_context=None, banner=None):
+    """Accept connections on loopback and answer each with reply (after a request) or banner."""
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(16)
+
+    def handle(conn):
+        try:
+            if tls_context is not None:
+                conn = tls_context.wrap_socket(conn, server_side=True)
+            if banner is not None:
+                conn.sendall(banner)
+            if reply is not None:
+                conn.recv(1024)
+                conn.sendall(reply)
+            conn.recv(1024)
+        except (OSError, ssl.SSLError):
+            pass
+        finally:
+            conn.close()
+
+    def run():
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                return
+            threading.Thread(target=handle, args=(conn,), daemon=True).start()
+
+    threading.Thread(target=run, daemon=True).start()
+    return listener
+
+
+def test_classify_first_bytes():
+    assert classify(b"HTTP/1.1 401 Unauthorized") == PROTOCOL_HTTP
+    assert classify(b"\x15\x03\x01\x00\x02") == "tls"
+    assert classify(b"SSH-2.0-OpenSSH_9.6") is None
+    assert classify(b"") is None
+
+
+def test_sniff_protocols_checks_all_ports(tmp_path):
+    listeners = {
+        "http_404": _serve(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n"),
+        "ssh": _serve(None, banner=b"SSH-2.0-OpenSSH_9.6\r\n"),
+        "silent": _serve(None),
+    }
+    if shutil.which("openssl"):
+        cert, key = os.path.join(tmp_path, "cert.pem"), os.path.join(tmp_path, "key.pem")
+        subprocess.run(
+            ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+             "-subj", "/CN=localhost", "-keyout", key, "-out", cert],
+            check=True, capture_output=True,
+        )
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert, key)
+        listeners["https"] = _serve(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n", tls_context=context)
+
+    ports = {name: listener.getsockname()[1] for name, listener in listeners.items()}
+    try:
+        results = asyncio.run(sniff_protocols("127.0.0.1", ports.values(), timeout=0.5))
+    finally:
+        for listener in listeners.values():
+            listener.close()
+
+    assert results[str(ports["http_404"])] == PROTOCOL_HTTP
+    assert results[str(ports["ssh"])] is None
+    assert results[str(ports["silent"])] is None
+    if "https" in ports:
+        assert results[str(ports["https"])] == PROTOCOL_HTTPS
+
+
+def test_check_for_http_sets_protocol_of_discovered_ports():
+    from pyautoenum.config.manager import ConfigManager
+    from pyautoenum.data.models import TargetInfo
+    from pyautoenum.modules.custom import check_for_http
+
+    http = _serve(b"HTTP/1.0 500 Internal Server Error\r\n\r\n")
+    other = _serve(None, banner=b"220 ftp ready\r\n")
+    http_port, other_port = http.getsockname()[1], other.getsockname()[1]
+    target_info = TargetInfo(ConfigManager(), ip="127.0.0.1")
+    target_info.merge({str(http_port): {"protocol": "unknown"}, str(other_port): {"protocol": "ftp"}})
+    try:
+        assert check_for_http(target_info, None, ["timeout=0.5"])
+    finally:
+        http.close()
+        other.close()
+
+    ports = target_info.snapshot().ports
+    assert ports[str(http_port)].protocol == PROTOCOL_HTTP
+    assert ports[str(other_port)].protocol == "ftp"
+
+
+def test_per_port_checks_started_together_share_a_batch(monkeypatch):
+    """Checks started at once are sniffed in one batch, a later one in its own."""
+    from pyautoenum.config.manager import ConfigManager
+    from pyautoenum.data.models import TargetInfo
+    from pyautoenum.modules.custom import check_for_http
+    from pyautoenum.utils import sniff
+
+    batches = []
+    real_sniff_protocols = sniff.sniff_protocols
+
+    async def counting_sniff_protocols(host, ports, *args, **kwargs):
+        batches.append(sorted(ports))
+        return await real_sniff_protocols(host, ports, *args, **kwargs)
+
+    monkeypatch.setattr(sniff, "sniff_protocols", counting_sniff_protocols)
+    monkeypatch.setattr(sniff, "sniff_batcher", sniff.SniffBatcher(window=0.2))
+    listeners = [_serve(b"HTTP/1.1 200 OK\r\n\r\n") for _ in range(3)]
+    ports = sorted(listener.getsockname()[1] for listener in listeners)
+    target_info = TargetInfo(ConfigManager(), ip="127.0.0.1")
+    results = {}
+
+    def check(port):
+        results[port] = check_for_http(target_info, str(port), ["timeout=0.5"])
+
+    try:
+        threads = [threading.Thread(target=check, args=(port,)) for port in ports]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # A port found later gets its own batch
+        late = _serve(b"HTTP/1.1 200 OK\r\n\r\n")
+        listeners.append(late)
+        late_port = late.getsockname()[1]
+        assert check_for_http(target_info, str(late_port), ["timeout=0.5"])
+    finally:
+        for listener in listeners:
+            listener.close()
+
+    assert results == {port: True for port in ports}
+    assert batches == [ports, [late_port]]
+    assert target_info.get_port(ports[0]).protocol == PROTOCOL_HTTP
+    assert not check_for_http(target_info, "target", [])
+
+
+def test_checks_admitted_over_several_rounds_share_a_batch(monkeypatch):
+    """Callers arriving one admission round apart still join the open batch."""
+    from pyautoenum.core.admission import POLL_INTERVAL
+    from pyautoenum.utils import sniff
+
+    batches = []
+
+    async def fake_sniff_protocols(host, ports, *args, **kwargs):
+        batches.append(sorted(ports))
+        return {str(port): PROTOCOL_HTTP for port in ports}
+
+    monkeypatch.setattr(sniff, "sniff_protocols", fake_sniff_protocols)
+    batcher = sniff.SniffBatcher()
+    results = {}
+
+    def check(port):
+        results[port] = batcher.sniff("127.0.0.1", port)
+
+    threads = []
+    for port in range(8000, 8005):
+        thread = threading.Thread(target=check, args=(port,))
+        thread.start()
+        threads.append(thread)
+        time.sleep(POLL_INTERVAL)
+    for thread in threads:
+        thread.join()
+
+    assert batches == [list(range(8000, 8005))]
+    assert results == {port: PROTOCOL_HTTP for port in range(8000, 8005)}
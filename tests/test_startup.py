@@ -0,0 +1,57 @@
+"""
+Cold-start regression tests for PyAutoEnum.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "../src"))
+
+# Cumulative import time budget for `import pyautoenum.__main__`
+IMPORT_BUDGET_MS = float(os.environ.get("PYAUTOENUM_IMPORT_BUDGET_MS", "200"))
+
+HEAVY_MODULES = ("bs4", "curses", "nmap", "ping3", "requests", "urllib3", "yaml")
+
+
+def _run_python(*args):
+    env = dict(os.environ, PYTHONPATH=SRC)
+    return subprocess.run(
+        [sys.executable, *args], env=env, capture_output=True, text=True, check=True
+    )
+
+
+def _import_time_us(stderr, module):
+    """Get the cumulative import time of a module from -X importtime output."""
+    for line in stderr.splitlines():
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise AssertionError(f"{module} not found in importtime output")
+
+
+def test_cli_import_defers_heavy_dependencies():
+    """Importing the entry point must not load UI, HTTP, ping, YAML or nmap libraries."""
+    code = (
+        "import sys, pyautoenum.__main__; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = _run_python("-c", code)
+    assert result.stdout.strip() == ""
+
+
+def test_cli_import_time_within_budget():
+    """`python -X importtime` cold start of the entry point stays under budget."""
+    # Best of three to smooth out noisy machines
+    timings = []
+    for _ in range(3):
+        result = _run_python("-X", "importtime", "-c", "import pyautoenum.__main__")
+        timings.append(_import_time_us(result.stderr, "pyautoenum.__main__") / 1000)
+
+    if min(timings) > IMPORT_BUDGET_MS:
+        pytest.fail(
+            f"import pyautoenum.__main__ took {min(timings):.1f} ms "
+            f"(budget {IMPORT_BUDGET_MS:.0f} ms)"
+        )
@@ -0,0 +1,71 @@
+"""
+Tests for the shared, memory-mapped wordlist service.
+"""
+
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from pyautoenum.utils.wordlists import WordlistService
+
+
+def _shard_words(shard):
+    """Read a shard in a worker process."""
+    return list(shard)
+
+
+@pytest.fixture
+def wordlist(tmp_path, monkeypatch):
+    """Write a wordlist with comments, blank lines, padded words and duplicates."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    path = tmp_path / "words.txt"
+    path.write_bytes(b"# header\nadmin\nlogin\n\n  admin  \nbackup\nlogin\nd\xc3\xa9j\xc3\xa0\n" * 3 + b"last")
+    return str(path)
+
+
+def test_index_is_deduplicated_and_cached(wordlist, tmp_path):
+    """Words are unique and in file order; the index is reused from the cache, whatever the line ends."""
+    words = WordlistService(str(tmp_path / "cache")).open(wordlist)
+    assert list(words) == ["admin", "login", "backup", "déjà", "last"]
+    assert words[3] == "déjà"
+    assert bytes(words.word_bytes(4)) == b"last"
+    assert not words.index_loaded
+    assert os.path.exists(words.index_path)
+
+    # Another process (here: another service) loads the index from the cache
+    again = WordlistService(str(tmp_path / "cache")).open(wordlist)
+    assert again.index_loaded
+    assert list(again) == list(words)
+
+    crlf = tmp_path / "crlf.txt"
+    crlf.write_bytes(open(wordlist, "rb").read().replace(b"\n", b"\r\n"))
+    assert list(WordlistService(str(tmp_path / "cache")).open(str(crlf))) == list(words)
+
+
+def test_service_shares_and_remaps_changed_files(wordlist, tmp_path):
+    """A file is mapped once per service, and again after it changed."""
+    service = WordlistService(str(tmp_path / "cache"))
+    first = service.open(wordlist)
+    assert service.open(wordlist) is first
+
+    with open(wordlist, "ab") as f:
+        f.write(b"\nnew\n")
+    changed = service.open(wordlist)
+    assert changed is not first
+    assert list(changed)[-1] == "new"
+
+
+def test_shards_cover_every_word_in_threads_and_processes(wordlist, tmp_path):
+    """Shards split the words without overlap and are read the same in other processes."""
+    words = WordlistService(str(tmp_path / "cache")).open(wordlist)
+    shards = words.shards(3)
+    assert [len(shard) for shard in shards] == [1, 2, 2]
+    assert [word for shard in shards for word in shard] == list(words)
+
+    # Pickled shards carry the range, not the words
+    assert len(pickle.dumps(shards[1])) < 200
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        results = list(executor.map(_shard_words, shards))
+    assert results == [list(shard) for shard in shards]